@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Replay Pentarchy proposals under alternative governance settings.
+
+Reports how outcomes would shift if THRESHOLDS, AUTO_APPROVE_LIMIT or
+HUMAN_REVIEW_LIMIT were changed. Proposals come from a JSON / JSONL export
+of the votes router's proposals, or are generated synthetically.
+
+Examples:
+    python scripts/governance_replay.py --synthetic 1000000 --threshold high=2.0
+    python scripts/governance_replay.py --history proposals.jsonl --auto-approve-limit 75
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.governance import RiskLevel
+from src.core.governance_sim import (
+    GovernancePolicy,
+    proposals_to_arrays,
+    replay,
+    synthetic_history,
+)
+
+
+def load_history(path: str) -> list:
+    """Load proposals from a JSON array or a JSON-lines file."""
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def parse_threshold(value: str) -> tuple:
+    """Parse a RISK=SCORE threshold override such as high=2.0."""
+    try:
+        level, score = value.split("=", 1)
+        return RiskLevel(level.strip().lower()), float(score)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"expected RISK=SCORE with RISK in {[r.value for r in RiskLevel]}, got {value!r}") from e
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--history", help="JSON or JSONL file of proposals")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Generate N random proposals")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for synthetic proposals")
+    parser.add_argument("--threshold", type=parse_threshold, action="append", default=[],
+                        metavar="RISK=SCORE", help="Override a risk level's threshold")
+    parser.add_argument("--auto-approve-limit", type=float)
+    parser.add_argument("--human-review-limit", type=float)
+    parser.add_argument("--critical-limit", type=float)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.history:
+        votes, costs = proposals_to_arrays(load_history(args.history))
+    else:
+        votes, costs = synthetic_history(args.synthetic, seed=args.seed)
+    loaded = time.perf_counter()
+
+    candidate = GovernancePolicy()
+    candidate.thresholds.update(dict(args.threshold))
+    if args.auto_approve_limit is not None:
+        candidate.auto_approve_limit = args.auto_approve_limit
+    if args.human_review_limit is not None:
+        candidate.human_review_limit = args.human_review_limit
+    if args.critical_limit is not None:
+        candidate.critical_limit = args.critical_limit
+
+    report = replay(votes, costs, candidate)
+    elapsed = time.perf_counter() - loaded
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return
+
+    print(f"Proposals: {report.total:,} ({votes.size:,} votes), "
+          f"loaded in {loaded - start:.2f}s, replayed in {elapsed:.2f}s")
+    print(f"{'outcome':<22}{'baseline':>12}{'candidate':>12}{'delta':>10}")
+    for outcome in sorted(set(report.baseline) | set(report.candidate)):
+        before = report.baseline.get(outcome, 0)
+        after = report.candidate.get(outcome, 0)
+        print(f"{outcome:<22}{before:>12,}{after:>12,}{after - before:>+10,}")
+    print(f"\nChanged outcomes: {report.changed:,} ({report.changed / max(report.total, 1):.2%})")
+    for (before, after), count in sorted(report.transitions.items(), key=lambda t: -t[1]):
+        print(f"  {before} -> {after}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
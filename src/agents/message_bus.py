@@ -1,11 +1,14 @@
 """
 Agent Message Bus
-Inter-agent communication using Redis Streams or NATS.
+Inter-agent communication using Redis Streams, NATS or an in-process bus.
 """
 import asyncio
+import itertools
 import json
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Callable, Coroutine
 from uuid import uuid4
@@ -44,6 +47,7 @@ class AgentMessage(BaseModel):
     subject: str
     payload: dict[str, Any] = Field(default_factory=dict)
     correlation_id: str | None = None  # For request/response tracking
+    reply_to: str | None = None  # Backend address for responses to a request
     priority: MessagePriority = MessagePriority.NORMAL
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     ttl_seconds: int = 300  # Time-to-live
@@ -86,13 +90,168 @@ class MessageHandler:
         return message.subject == self.subject_pattern
 
 
+_TYPE_BITS = {message_type: 1 << i for i, message_type in enumerate(MessageType)}
+
+
+class _HandlerIndex:
+    """
+    Subject routing index over registered handlers.
+
+    Built at registration time so dispatch does not test every handler:
+    exact patterns live in a dict, ``prefix.*`` patterns in dicts bucketed by
+    prefix length (one slice and lookup per distinct length) and ``*`` in a
+    plain list. Each entry carries a bitmask of its handler's message types.
+    Matches keep registration order and agree with MessageHandler.matches.
+    """
+
+    def __init__(self):
+        self._exact: dict[str, list[tuple[int, int, MessageHandler]]] = {}
+        self._prefixes: dict[int, dict[str, list[tuple[int, int, MessageHandler]]]] = {}
+        self._prefix_lengths: list[int] = []
+        self._wildcard: list[tuple[int, int, MessageHandler]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, handler: MessageHandler) -> None:
+        mask = 0
+        for message_type in handler.message_types:
+            mask |= _TYPE_BITS[message_type]
+        entry = (self._count, mask, handler)
+        self._count += 1
+
+        pattern = handler.subject_pattern
+        if pattern == "*":
+            self._wildcard.append(entry)
+        elif pattern.endswith(".*"):
+            prefix = pattern[:-2]
+            bucket = self._prefixes.setdefault(len(prefix), {})
+            bucket.setdefault(prefix, []).append(entry)
+            self._prefix_lengths = sorted(self._prefixes)
+        else:
+            self._exact.setdefault(pattern, []).append(entry)
+
+    def match(self, subject: str, message_type: MessageType) -> list[MessageHandler]:
+        """Handlers for a subject and message type, in registration order."""
+        bit = _TYPE_BITS[message_type]
+        found = [entry for entry in self._exact.get(subject, ()) if entry[1] & bit]
+        for length in self._prefix_lengths:
+            if length > len(subject):
+                break
+            entries = self._prefixes[length].get(subject[:length])
+            if entries:
+                found.extend(entry for entry in entries if entry[1] & bit)
+        found.extend(entry for entry in self._wildcard if entry[1] & bit)
+
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+        return [entry[2] for entry in found]
+
+
+class _PublishCoalescer:
+    """
+    Collects messages published within a short window and sends them with a
+    single publish_many call.
+
+    Each publish still waits until its batch has been sent, so errors reach
+    the caller; the gain comes from concurrent publishers sharing one round
+    trip.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[AgentMessage]], Coroutine[Any, Any, None]],
+        interval: float,
+        max_batch: int,
+    ):
+        self._flush_batch = flush
+        self.interval = interval
+        self.max_batch = max_batch
+        self._batch: list[tuple[AgentMessage, asyncio.Future]] = []
+        self._timer: asyncio.Task | None = None
+
+    async def submit(self, message: AgentMessage) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((message, future))
+        if len(self._batch) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send everything collected so far."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        # The batch belongs to every publisher in it, so cancelling the task
+        # that happens to flush it must not abandon the others' futures
+        await asyncio.shield(asyncio.create_task(self._send(batch)))
+
+    async def _send(self, batch: list[tuple[AgentMessage, asyncio.Future]]) -> None:
+        try:
+            await self._flush_batch([message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+
+def _message_codec():
+    """Import the wire codec module lazily, since it imports this one."""
+    from src.agents import message_codec
+    return message_codec
+
+
+# Wire formats a bus can publish with. Consumers always accept both.
+MESSAGE_CODECS = ("json", "compact")
+
+
 class BaseMessageBus(ABC):
     """Abstract base class for message bus implementations."""
 
-    def __init__(self, agent_id: str):
+    def __init__(
+        self,
+        agent_id: str,
+        coalesce_ms: float = 0.0,
+        coalesce_max_batch: int = 256,
+        codec: str = "json",
+    ):
+        if codec not in MESSAGE_CODECS:
+            raise ValueError(f"Unknown message codec: {codec}")
         self.agent_id = agent_id
+        # Publish format; "compact" needs every consumer to run a version
+        # that understands it
+        self.codec = codec
+        self._codec = _message_codec()
         self._handlers: list[MessageHandler] = []
+        self._handler_index = _HandlerIndex()
         self._running = False
+        # Outstanding request() calls, keyed by request message id
+        self._reply_futures: dict[str, asyncio.Future] = {}
+        # With coalesce_ms set, publish() batches concurrent publishes
+        # through publish_many() instead of sending each one immediately
+        self._coalescer = (
+            _PublishCoalescer(self.publish_many, coalesce_ms / 1000.0, coalesce_max_batch)
+            if coalesce_ms > 0 else None
+        )
 
     @abstractmethod
     async def connect(self) -> None:
@@ -109,6 +268,71 @@ class BaseMessageBus(ABC):
         """Publish a message to the bus."""
         pass
 
+    async def publish_many(self, messages: list[AgentMessage]) -> None:
+        """
+        Publish several messages.
+
+        Backends override this to send the batch in as few round trips as
+        possible; the default publishes one message at a time.
+        """
+        for message in messages:
+            await self.publish(message)
+
+    async def request(self, message: AgentMessage, timeout: float = 30.0) -> AgentMessage:
+        """
+        Send a request to another agent and wait for its response.
+
+        The target's handler return value is delivered back to this bus
+        instance and matched to the request by correlation_id.
+
+        Raises:
+            ValueError: If the message has no target
+            asyncio.TimeoutError: If no response arrives within the timeout
+        """
+        if not message.target:
+            raise ValueError("Requests need a target agent")
+
+        message.type = MessageType.REQUEST
+        message.reply_to = await self._reply_address()
+        future = asyncio.get_running_loop().create_future()
+        self._reply_futures[message.id] = future
+        try:
+            await self.publish(message)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._reply_futures.pop(message.id, None)
+
+    async def _reply_address(self) -> str | None:
+        """Backend address responses to this instance's requests are sent to."""
+        return None
+
+    async def _publish_reply(self, response: AgentMessage, reply_to: str | None) -> None:
+        """Send a handler's response to the requester."""
+        await self.publish(response)
+
+    def _wants(self, header) -> bool:
+        """Whether a message (or its peeked header) has anyone to deliver to."""
+        return (
+            header.correlation_id in self._reply_futures
+            or bool(self._handler_index.match(header.subject, header.type))
+        )
+
+    def _resolve_reply(self, message: AgentMessage) -> bool:
+        """Complete a pending request() with its response, if it is one."""
+        if not message.correlation_id or not self._reply_futures:
+            return False
+        future = self._reply_futures.get(message.correlation_id)
+        if future is None:
+            return False
+        if not future.done():
+            future.set_result(message)
+        return True
+
+    async def _flush_coalesced(self) -> None:
+        """Send any publishes still waiting in the coalescing window."""
+        if self._coalescer is not None:
+            await self._coalescer.flush()
+
     @abstractmethod
     async def subscribe(self, subject: str) -> None:
         """Subscribe to a subject pattern."""
@@ -121,40 +345,217 @@ class BaseMessageBus(ABC):
         message_types: list[MessageType] | None = None,
     ) -> None:
         """Register a message handler."""
-        self._handlers.append(
-            MessageHandler(subject_pattern, handler, message_types)
-        )
+        message_handler = MessageHandler(subject_pattern, handler, message_types)
+        self._handlers.append(message_handler)
+        self._handler_index.add(message_handler)
         logger.info(f"Registered handler for {subject_pattern}")
 
+    @staticmethod
+    def _is_expired(message) -> bool:
+        """Whether a message (or its peeked header) outlived its ttl_seconds."""
+        if message.ttl_seconds <= 0:
+            return False
+        timestamp = message.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return (datetime.utcnow() - timestamp).total_seconds() > message.ttl_seconds
+
+    def _drop_expired(self, message) -> None:
+        """Count and log a message dropped for exceeding its TTL."""
+        from src.api.metrics import record_message_expired
+
+        record_message_expired(priority_lane(message.priority))
+        logger.debug(f"Dropped expired message {message.id} ({message.subject})")
+
     async def _dispatch_message(self, message: AgentMessage) -> None:
-        """Dispatch message to matching handlers."""
-        for handler in self._handlers:
-            if handler.matches(message):
-                try:
-                    response = await handler.handler(message)
-                    if response and message.type == MessageType.REQUEST:
-                        response.correlation_id = message.id
-                        response.target = message.source
-                        await self.publish(response)
-                except Exception as e:
-                    logger.error(f"Handler error: {e}")
+        """Dispatch message to matching handlers, running them concurrently."""
+        if self._is_expired(message):
+            self._drop_expired(message)
+            return
+        if self._resolve_reply(message):
+            return
+        handlers = self._handler_index.match(message.subject, message.type)
+        if len(handlers) == 1:
+            await self._run_handler(handlers[0], message)
+        elif handlers:
+            await asyncio.gather(*(self._run_handler(h, message) for h in handlers))
+
+    async def _run_handler(self, handler: MessageHandler, message: AgentMessage) -> None:
+        """Run one handler and publish its response to a request."""
+        try:
+            response = await handler.handler(message)
+            if response and message.type == MessageType.REQUEST:
+                response.correlation_id = message.id
+                response.target = message.source
+                await self._publish_reply(response, message.reply_to)
+        except Exception as e:
+            logger.error(f"Handler error: {e}")
+
+
+def subject_partition(subject: str) -> str:
+    """Partition key for a subject: its first dot-separated segment."""
+    return subject.split(".", 1)[0]
+
+
+# Priority lanes, most urgent first. CRITICAL is always consumed first; the
+# other lanes share consumption by weight so LOW traffic is never starved.
+PRIORITY_LANES = ("critical", "high", "normal", "low")
+DEFAULT_LANE_WEIGHTS = {"high": 4, "normal": 2, "low": 1}
+
+
+def priority_lane(priority: int) -> str:
+    """Lane a message priority is delivered on."""
+    if priority >= MessagePriority.CRITICAL:
+        return "critical"
+    if priority >= MessagePriority.HIGH:
+        return "high"
+    if priority >= MessagePriority.NORMAL:
+        return "normal"
+    return "low"
+
+
+class _WeightedLanes:
+    """Smooth weighted round-robin over the non-critical priority lanes."""
+
+    def __init__(self, weights: dict[str, int]):
+        self.weights = {lane: w for lane, w in weights.items() if w > 0}
+        self._total = sum(self.weights.values())
+        self._current = {lane: 0 for lane in self.weights}
+        self._by_weight = sorted(self.weights, key=lambda lane: -self.weights[lane])
+
+    def order(self) -> list[str]:
+        """Lanes to try this round: the scheduled lane, then the rest by weight."""
+        for lane, weight in self.weights.items():
+            self._current[lane] += weight
+        chosen = max(self._current, key=self._current.get)
+        self._current[chosen] -= self._total
+        return [chosen] + [lane for lane in self._by_weight if lane != chosen]
 
 
 class RedisMessageBus(BaseMessageBus):
-    """Redis Streams based message bus implementation."""
+    """
+    Redis Streams based message bus implementation.
+
+    Messages are partitioned across streams so each agent only reads traffic
+    it can handle:
+
+    - ``{prefix}agent:{agent_id}``: messages with a target
+    - ``{prefix}broadcast``: untargeted BROADCAST messages
+    - ``{prefix}subject:{partition}``: other untargeted messages, partitioned
+      by the first segment of the subject (see subject_partition)
+
+    Every agent reads its own stream and the broadcast stream, plus the
+    subject partitions it subscribes to. Each agent has its own consumer
+    group, so replicas of the same agent share work while different agents
+    each see every message on shared streams.
+
+    Messages are dispatched concurrently, with at most ``max_in_flight``
+    being handled at once. With ``ordered_by_correlation``, messages sharing
+    a correlation_id are still handled one at a time in stream order.
+    Completed entries are acknowledged in batches, and the XREADGROUP batch
+    size grows while reads come back full (the group is lagging) and
+    shrinks when they do not.
+
+    Each stream is split into priority lanes (see PRIORITY_LANES): NORMAL
+    messages use the stream itself and other priorities a ``:{lane}``
+    suffixed stream. The consumer drains the critical lane first and
+    otherwise picks lanes by weighted round-robin (``lane_weights``).
+    Messages past their ttl_seconds are dropped before dispatch.
+
+    A background sweeper reclaims entries left unacknowledged for longer
+    than ``claim_idle_ms`` (e.g. by a consumer that crashed) with XCLAIM,
+    and moves entries delivered ``max_deliveries`` times to the dead-letter
+    stream. Entries this consumer is still handling or has yet to
+    acknowledge are left alone however long they run. It also exports
+    pending-list size and age metrics.
+    """
 
     def __init__(
         self,
         agent_id: str,
         redis_url: str = "redis://localhost:6379",
         stream_prefix: str = "kosmos:agents:",
+        stream_maxlen: int = 10000,
+        coalesce_ms: float = 0.0,
+        codec: str = "json",
+        max_in_flight: int = 32,
+        ordered_by_correlation: bool = False,
+        min_read_batch: int = 10,
+        max_read_batch: int = 500,
+        ack_batch_size: int = 100,
+        ack_interval: float = 0.05,
+        claim_idle_ms: int = 60000,
+        max_deliveries: int = 5,
+        sweep_interval: float = 15.0,
+        sweep_batch: int = 100,
+        priority_lanes: bool = True,
+        lane_weights: dict[str, int] | None = None,
     ):
-        super().__init__(agent_id)
+        super().__init__(agent_id, coalesce_ms=coalesce_ms, codec=codec)
         self.redis_url = redis_url
         self.stream_prefix = stream_prefix
+        self.stream_maxlen = stream_maxlen
+        self.max_in_flight = max_in_flight
+        self.ordered_by_correlation = ordered_by_correlation
+        self.min_read_batch = min_read_batch
+        self.max_read_batch = max_read_batch
+        self.ack_batch_size = ack_batch_size
+        self.ack_interval = ack_interval
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self.dead_letter_stream = f"{stream_prefix}dead-letter"
+        self.priority_lanes = priority_lanes
+        self._lane_schedule = _WeightedLanes(lane_weights or DEFAULT_LANE_WEIGHTS)
         self._redis = None
-        self._consumer_group = f"kosmos-agents"
-        self._consumer_name = agent_id
+        self._consumer_group = f"agent:{agent_id}"
+        self._consumer_name = f"{agent_id}:{uuid4().hex[:8]}"
+        # Private stream for responses to this instance's request() calls
+        self.reply_stream = f"{stream_prefix}reply:{self._consumer_name}"
+        # Streams this agent reads (every lane), mapped to the last id requested
+        self._streams: dict[str, str] = {}
+        self._lane_streams: dict[str, dict[str, str]] = {lane: {} for lane in PRIORITY_LANES}
+        self._consumer_task: asyncio.Task | None = None
+        self._ack_task: asyncio.Task | None = None
+        self._sweeper_task: asyncio.Task | None = None
+        self._read_batch = min_read_batch
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight: set[asyncio.Task] = set()
+        # Last queued task per correlation id, for ordered dispatch
+        self._ordering_tails: dict[str, asyncio.Task] = {}
+        # Entry ids handled but not yet acknowledged, per stream
+        self._pending_acks: dict[str, list] = {}
+        self._pending_ack_count = 0
+        self._ack_wakeup = asyncio.Event()
+        # (stream, entry id) of entries dispatched here and not yet acknowledged
+        self._active_entries: set[tuple[str, str]] = set()
+
+    @property
+    def broadcast_stream(self) -> str:
+        return f"{self.stream_prefix}broadcast"
+
+    def agent_stream(self, agent_id: str) -> str:
+        return f"{self.stream_prefix}agent:{agent_id}"
+
+    def subject_stream(self, subject: str) -> str:
+        return f"{self.stream_prefix}subject:{subject_partition(subject)}"
+
+    def stream_for(self, message: AgentMessage) -> str:
+        """The stream a message is routed to, before priority lanes."""
+        if message.target:
+            return self.agent_stream(message.target)
+        if message.type == MessageType.BROADCAST:
+            return self.broadcast_stream
+        return self.subject_stream(message.subject)
+
+    def lane_stream(self, stream_name: str, lane: str) -> str:
+        """Name of one priority lane of a stream."""
+        return stream_name if lane == "normal" else f"{stream_name}:{lane}"
+
+    def _publish_stream(self, message: AgentMessage) -> str:
+        lane = priority_lane(message.priority) if self.priority_lanes else "normal"
+        return self.lane_stream(self.stream_for(message), lane)
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -163,120 +564,497 @@ class RedisMessageBus(BaseMessageBus):
         self._redis = await aioredis.from_url(self.redis_url)
         self._running = True
 
-        # Create consumer group if it doesn't exist
-        stream_name = f"{self.stream_prefix}messages"
-        try:
-            await self._redis.xgroup_create(
-                stream_name,
-                self._consumer_group,
-                id="0",
-                mkstream=True,
-            )
-        except Exception:
-            pass  # Group already exists
-
-        # Start message consumer
-        asyncio.create_task(self._consume_messages())
+        # The agent's own stream is an inbox: deliver anything sent before
+        # the group existed. Shared streams start from new messages only.
+        await self._add_stream(self.agent_stream(self.agent_id), start_id="0")
+        await self._add_stream(self.broadcast_stream)
+        # Replies are written straight to the reply stream, without lanes
+        await self._add_stream(self.reply_stream, lanes=("normal",))
+
+        # Start message consumer and batched acknowledgements
+        self._consumer_task = asyncio.create_task(self._consume_messages())
+        self._ack_task = asyncio.create_task(self._ack_loop())
+        self._sweeper_task = asyncio.create_task(self._sweep_loop())
         logger.info(f"Redis message bus connected for agent {self.agent_id}")
 
-    async def disconnect(self) -> None:
-        """Disconnect from Redis."""
+    async def disconnect(self, drain_timeout: float = 5.0) -> None:
+        """Disconnect from Redis, letting in-flight messages finish first."""
+        await self._flush_coalesced()
         self._running = False
+        for task in (self._consumer_task, self._ack_task, self._sweeper_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._consumer_task = self._ack_task = self._sweeper_task = None
+
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight), timeout=drain_timeout)
         if self._redis:
+            await self._flush_acks()
+            await self._redis.delete(self.reply_stream)
             await self._redis.close()
         logger.info(
             f"Redis message bus disconnected for agent {self.agent_id}")
 
+    async def _add_stream(
+        self,
+        stream_name: str,
+        start_id: str = "$",
+        lanes: tuple[str, ...] | None = None,
+    ) -> None:
+        """Create this agent's consumer group on a stream's lanes and start reading them."""
+        if lanes is None:
+            lanes = PRIORITY_LANES if self.priority_lanes else ("normal",)
+        for lane in lanes:
+            lane_stream = self.lane_stream(stream_name, lane)
+            if lane_stream in self._streams:
+                continue
+            try:
+                await self._redis.xgroup_create(
+                    lane_stream,
+                    self._consumer_group,
+                    id=start_id,
+                    mkstream=True,
+                )
+            except Exception:
+                pass  # Group already exists
+            self._streams[lane_stream] = ">"
+            self._lane_streams[lane][lane_stream] = ">"
+
+    def _entry_fields(self, message: AgentMessage) -> dict:
+        """Stream entry fields for a message."""
+        if self.codec == "compact":
+            # Routing fields live in the binary header, so nothing is duplicated
+            return {"message": self._codec.encode_message(message)}
+        return {
+            "message": message.to_json(),
+            "source": message.source,
+            "target": message.target or "*",
+            "subject": message.subject,
+            "priority": str(message.priority.value),
+        }
+
+    async def _reply_address(self) -> str:
+        return self.reply_stream
+
+    async def _publish_reply(self, response: AgentMessage, reply_to: str | None) -> None:
+        """Send a response straight to the requesting instance's reply stream."""
+        if not reply_to or not reply_to.startswith(f"{self.stream_prefix}reply:"):
+            await self.publish(response)
+            return
+        await self._redis.xadd(
+            reply_to,
+            self._entry_fields(response),
+            maxlen=self.stream_maxlen,
+            approximate=True,
+        )
+
     @traced(name="redis_bus_publish")
     async def publish(self, message: AgentMessage) -> None:
-        """Publish message to Redis Stream."""
+        """Publish message to its Redis Stream partition."""
         if not self._redis:
             raise RuntimeError("Not connected to Redis")
+        if self._coalescer is not None:
+            await self._coalescer.submit(message)
+            return
 
-        stream_name = f"{self.stream_prefix}messages"
+        stream_name = self._publish_stream(message)
 
         await self._redis.xadd(
             stream_name,
-            {
-                "message": message.to_json(),
-                "source": message.source,
-                "target": message.target or "*",
-                "subject": message.subject,
-                "priority": str(message.priority.value),
-            },
-            maxlen=10000,  # Limit stream size
+            self._entry_fields(message),
+            maxlen=self.stream_maxlen,  # Limit stream size
+            approximate=True,
         )
 
-        add_span_attributes({
+        add_span_attributes(**{
             "message.id": message.id,
             "message.type": message.type.value,
             "message.subject": message.subject,
+            "message.stream": stream_name,
         })
 
-        logger.debug(f"Published message {message.id} to {message.subject}")
+        logger.debug(f"Published message {message.id} to {stream_name}")
+
+    @traced(name="redis_bus_publish_many")
+    async def publish_many(self, messages: list[AgentMessage]) -> None:
+        """Publish messages with one pipelined round trip."""
+        if not self._redis:
+            raise RuntimeError("Not connected to Redis")
+        if not messages:
+            return
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.xadd(
+                    self._publish_stream(message),
+                    self._entry_fields(message),
+                    maxlen=self.stream_maxlen,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+        add_span_attributes(**{"message.count": len(messages)})
+        logger.debug(f"Published {len(messages)} messages")
 
     async def subscribe(self, subject: str) -> None:
-        """Subscribe to a subject pattern (handled by handlers)."""
-        # Redis Streams don't have native subject filtering
-        # Filtering is done in _consume_messages
-        logger.info(f"Subscribed to {subject}")
+        """
+        Subscribe to the subject partition holding a subject pattern.
 
-    async def _consume_messages(self) -> None:
-        """Consume messages from Redis Stream."""
-        stream_name = f"{self.stream_prefix}messages"
+        Handlers still filter by the full pattern; the partition only limits
+        which streams are read. Direct and broadcast messages are always
+        received.
+        """
+        if not self._redis:
+            raise RuntimeError("Not connected to Redis")
+        if subject == "*":
+            logger.warning(
+                "Redis message bus cannot subscribe to every subject partition; "
+                "subscribe to subject prefixes instead")
+            return
+
+        stream_name = self.subject_stream(subject)
+        await self._add_stream(stream_name)
+        logger.info(f"Subscribed to {subject} via {stream_name}")
 
+    async def _consume_messages(self) -> None:
+        """Read entries from this agent's partitions and dispatch them concurrently."""
         while self._running:
             try:
-                messages = await self._redis.xreadgroup(
-                    self._consumer_group,
-                    self._consumer_name,
-                    {stream_name: ">"},
-                    count=10,
-                    block=1000,
-                )
+                # Never hold more unprocessed entries than free dispatch slots
+                count = max(1, min(self._read_batch, self.max_in_flight - len(self._in_flight)))
+
+                # Critical lane first, then the weighted lanes without blocking;
+                # only when every lane is empty block on all of them at once
+                received = await self._read(self._lane_streams["critical"], count)
+                if not received:
+                    for lane in self._lane_schedule.order():
+                        received = await self._read(self._lane_streams[lane], count)
+                        if received:
+                            break
+                if not received:
+                    received = await self._read(self._streams, count, block=1000)
+
+                self._adapt_read_batch(received, count)
 
-                for stream, entries in messages:
-                    for entry_id, data in entries:
-                        try:
-                            message = AgentMessage.from_json(data[b"message"])
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Consumer error: {e}")
+                await asyncio.sleep(1)
 
-                            # Check if message is for us
-                            if message.target and message.target != self.agent_id:
-                                continue
+    async def _read(self, streams: dict[str, str], count: int, block: int | None = None) -> int:
+        """Read and dispatch one batch, returning the most entries read from a stream."""
+        if not streams:
+            return 0
+        messages = await self._redis.xreadgroup(
+            self._consumer_group,
+            self._consumer_name,
+            dict(streams),
+            count=count,
+            block=block,
+        )
 
-                            await self._dispatch_message(message)
+        received = 0
+        for stream, entries in messages or []:
+            stream = stream.decode() if isinstance(stream, bytes) else stream
+            received = max(received, len(entries))
+            for entry_id, data in entries:
+                await self._slots.acquire()
+                self._start_dispatch(stream, entry_id, data)
+        return received
+
+    def _adapt_read_batch(self, received: int, requested: int) -> None:
+        """Grow the read batch while reads come back full, shrink it when sparse."""
+        if received >= requested:
+            self._read_batch = min(self._read_batch * 2, self.max_read_batch)
+        elif received < requested // 2:
+            self._read_batch = max(self._read_batch // 2, self.min_read_batch)
+
+    @staticmethod
+    def _entry_key(stream: str, entry_id) -> tuple[str, str]:
+        return stream, entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    def _start_dispatch(self, stream: str, entry_id, data: dict) -> None:
+        """Decode an entry and schedule its dispatch (a dispatch slot is held)."""
+        self._active_entries.add(self._entry_key(stream, entry_id))
+        try:
+            raw = data[b"message"]
+            if self._codec.is_compact(raw):
+                header = self._codec.peek_header(raw)
+                expired = self._is_expired(header)
+                if expired or not self._wants(header):
+                    # Decided from the header alone; skip decoding the payload
+                    if expired:
+                        self._drop_expired(header)
+                    self._queue_ack(stream, entry_id)
+                    self._slots.release()
+                    return
+            message = self._codec.decode_message(raw)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            # Left pending, to be redelivered and eventually dead-lettered
+            self._active_entries.discard(self._entry_key(stream, entry_id))
+            self._slots.release()
+            return
+
+        key = message.correlation_id if self.ordered_by_correlation else None
+        previous = self._ordering_tails.get(key) if key else None
+        task = asyncio.create_task(self._process_entry(stream, entry_id, message, previous))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+        if key:
+            self._ordering_tails[key] = task
+            task.add_done_callback(
+                lambda t: self._ordering_tails.pop(key) if self._ordering_tails.get(key) is t else None)
+
+    async def _process_entry(
+        self,
+        stream: str,
+        entry_id,
+        message: AgentMessage,
+        previous: asyncio.Task | None,
+    ) -> None:
+        """Dispatch one entry, after any earlier entry in its ordering chain."""
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            await self._dispatch_message(message)
+            self._queue_ack(stream, entry_id)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            self._active_entries.discard(self._entry_key(stream, entry_id))
+        finally:
+            self._slots.release()
+
+    def _queue_ack(self, stream: str, entry_id) -> None:
+        self._pending_acks.setdefault(stream, []).append(entry_id)
+        self._pending_ack_count += 1
+        if self._pending_ack_count >= self.ack_batch_size:
+            self._ack_wakeup.set()
+
+    async def _flush_acks(self) -> None:
+        """Acknowledge all handled entries with one XACK per stream."""
+        if not self._pending_ack_count:
+            return
+        pending, self._pending_acks = self._pending_acks, {}
+        self._pending_ack_count = 0
+        for stream, entry_ids in pending.items():
+            try:
+                await self._redis.xack(stream, self._consumer_group, *entry_ids)
+            except Exception as e:
+                logger.error(f"Error acknowledging messages on {stream}: {e}")
+                # Keep the ids so the next flush retries them
+                self._pending_acks.setdefault(stream, []).extend(entry_ids)
+                self._pending_ack_count += len(entry_ids)
+                continue
+            for entry_id in entry_ids:
+                self._active_entries.discard(self._entry_key(stream, entry_id))
 
-                            # Acknowledge message
-                            await self._redis.xack(
-                                stream_name,
-                                self._consumer_group,
-                                entry_id,
-                            )
-                        except Exception as e:
-                            logger.error(f"Error processing message: {e}")
+    async def _ack_loop(self) -> None:
+        """Flush acknowledgements when a batch fills up or every ack_interval."""
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._ack_wakeup.wait(), timeout=self.ack_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._ack_wakeup.clear()
+                await self._flush_acks()
+            except asyncio.CancelledError:
+                break
 
+    async def _sweep_loop(self) -> None:
+        """Periodically recover stuck entries and report consumer lag."""
+        while self._running:
+            try:
+                await asyncio.sleep(self.sweep_interval)
+                await self.sweep_pending()
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Consumer error: {e}")
-                await asyncio.sleep(1)
+                logger.error(f"Pending sweep error: {e}")
+
+    async def sweep_pending(self) -> dict[str, int]:
+        """
+        Recover entries stuck in this agent's consumer groups.
+
+        Entries delivered max_deliveries times are moved to the dead-letter
+        stream; other entries idle for claim_idle_ms are claimed by this
+        consumer and dispatched again.
+
+        Returns:
+            Counts of reclaimed and dead-lettered entries
+        """
+        from src.api.metrics import record_message_bus_recovery
+
+        totals = {"reclaimed": 0, "dead_lettered": 0}
+        for stream in list(self._streams):
+            dead_lettered = await self._dead_letter_poison(stream)
+            reclaimed = await self._reclaim_idle(stream)
+            await self._record_pending(stream)
+            record_message_bus_recovery(stream, reclaimed=reclaimed, dead_lettered=dead_lettered)
+            totals["reclaimed"] += reclaimed
+            totals["dead_lettered"] += dead_lettered
+        return totals
+
+    async def _idle_entries(self, stream: str) -> list[dict]:
+        """Pending entries idle for claim_idle_ms, except those still being handled here."""
+        pending = await self._redis.xpending_range(
+            stream, self._consumer_group, min="-", max="+",
+            count=self.sweep_batch, idle=self.claim_idle_ms,
+        )
+        return [p for p in pending
+                if self._entry_key(stream, p["message_id"]) not in self._active_entries]
+
+    async def _dead_letter_poison(self, stream: str) -> int:
+        """Move idle entries that exhausted their deliveries to the dead-letter stream."""
+        pending = await self._idle_entries(stream)
+        poison = [p for p in pending if p["times_delivered"] >= self.max_deliveries]
+        for entry in poison:
+            entry_id = entry["message_id"]
+            rows = await self._redis.xrange(stream, min=entry_id, max=entry_id)
+            fields = dict(rows[0][1]) if rows else {}
+            fields.update({
+                "dead_letter_stream": stream,
+                "dead_letter_id": entry_id,
+                "dead_letter_group": self._consumer_group,
+                "deliveries": str(entry["times_delivered"]),
+            })
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.xadd(self.dead_letter_stream, fields, maxlen=self.stream_maxlen, approximate=True)
+                pipe.xack(stream, self._consumer_group, entry_id)
+                await pipe.execute()
+            logger.warning(
+                f"Dead-lettered message {entry_id} from {stream} after "
+                f"{entry['times_delivered']} deliveries")
+        return len(poison)
+
+    async def _reclaim_idle(self, stream: str) -> int:
+        """Claim idle entries (e.g. of dead consumers) and dispatch them."""
+        entry_ids = [p["message_id"] for p in await self._idle_entries(stream)]
+        if not entry_ids:
+            return 0
+        # XCLAIM re-checks the idle time, so entries acked or claimed since are skipped
+        claimed = await self._redis.xclaim(
+            stream, self._consumer_group, self._consumer_name,
+            min_idle_time=self.claim_idle_ms, message_ids=entry_ids,
+        )
+        for entry_id, data in claimed:
+            if not data:
+                # Entry was trimmed from the stream; nothing left to process
+                await self._redis.xack(stream, self._consumer_group, entry_id)
+                continue
+            await self._slots.acquire()
+            self._start_dispatch(stream, entry_id, data)
+        if claimed:
+            logger.info(f"Reclaimed {len(claimed)} idle messages on {stream}")
+        return len(claimed)
+
+    async def _record_pending(self, stream: str) -> None:
+        """Export the pending-list size and oldest pending age for a stream."""
+        from src.api.metrics import record_message_bus_pending
+
+        summary = await self._redis.xpending(stream, self._consumer_group)
+        oldest_age = 0.0
+        if summary["pending"] and summary["min"]:
+            oldest_id = summary["min"]
+            oldest_id = oldest_id.decode() if isinstance(oldest_id, bytes) else oldest_id
+            oldest_ms = int(oldest_id.split("-", 1)[0])
+            oldest_age = max(0.0, time.time() - oldest_ms / 1000)
+        record_message_bus_pending(stream, self._consumer_group, summary["pending"], oldest_age)
+
+
+def nats_subject_filter(pattern: str) -> str:
+    """
+    NATS subject filter for a bus subject pattern.
+
+    Bus patterns ending in ``.*`` match any deeper subject, which NATS spells
+    ``>``; a bare ``*`` matches everything.
+    """
+    if pattern == "*":
+        return ">"
+    if pattern.endswith(".*"):
+        return f"{pattern[:-2]}.>"
+    return pattern
+
+
+def consolidate_subject_filters(filters: list[str]) -> list[str]:
+    """Drop filters already covered by a broader ``>`` wildcard in the list."""
+    wildcards = {f[:-1] for f in filters if f == ">" or f.endswith(".>")}
+    kept = []
+    for subject in sorted(set(filters)):
+        covered = any(
+            prefix != subject[:-1] and subject.startswith(prefix)
+            for prefix in wildcards
+        )
+        if not covered:
+            kept.append(subject)
+    return kept
 
 
 class NATSMessageBus(BaseMessageBus):
-    """NATS based message bus implementation."""
+    """
+    NATS JetStream based message bus implementation.
+
+    By default each agent reads through a single durable pull consumer whose
+    filter subjects cover everything it subscribed to. A fetch loop pulls up
+    to fetch_batch messages at a time (never more than free dispatch slots),
+    dispatches them concurrently up to max_in_flight, highest priority first
+    within a batch, and acknowledges handled messages in batches. The server
+    stops delivering once max_ack_pending messages are unacknowledged.
+
+    With pull_consumer=False every subscribe() creates its own push consumer
+    with a callback, acknowledging each message as it is handled.
+    """
+
+    STREAM_NAME = "KOSMOS_AGENTS"
 
     def __init__(
         self,
         agent_id: str,
         nats_url: str = "nats://localhost:4222",
         subject_prefix: str = "kosmos.agents.",
+        coalesce_ms: float = 0.0,
+        codec: str = "json",
+        max_pending_acks: int = 256,
+        pull_consumer: bool = True,
+        fetch_batch: int = 64,
+        fetch_timeout: float = 1.0,
+        max_ack_pending: int = 1000,
+        max_in_flight: int = 64,
+        ack_batch_size: int = 64,
+        ack_interval: float = 0.05,
     ):
-        super().__init__(agent_id)
+        super().__init__(agent_id, coalesce_ms=coalesce_ms, codec=codec)
         self.nats_url = nats_url
+        self.max_pending_acks = max_pending_acks
         self.subject_prefix = subject_prefix
+        self.pull_consumer = pull_consumer
+        self.fetch_batch = fetch_batch
+        self.fetch_timeout = fetch_timeout
+        self.max_ack_pending = max_ack_pending
+        self.max_in_flight = max_in_flight
+        self.ack_batch_size = ack_batch_size
+        self.ack_interval = ack_interval
         self._nc = None
         self._js = None  # JetStream context
         self._subscriptions = []
+        self._reply_inbox: str | None = None
+
+        # Pull consumer state
+        self._durable = f"agent-{agent_id}".replace(".", "-")
+        self._filter_subjects: list[str] = []
+        self._pull_sub = None
+        self._fetch_task: asyncio.Task | None = None
+        self._ack_task: asyncio.Task | None = None
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight: set[asyncio.Task] = set()
+        self._pending_acks: list = []
+        self._ack_wakeup = asyncio.Event()
 
     async def connect(self) -> None:
         """Connect to NATS."""
@@ -289,8 +1067,8 @@ class NATSMessageBus(BaseMessageBus):
         # Create stream if it doesn't exist
         try:
             await self._js.add_stream(
-                name="KOSMOS_AGENTS",
-                subjects=[f"{self.subject_prefix}*"],
+                name=self.STREAM_NAME,
+                subjects=[f"{self.subject_prefix}>"],
                 max_msgs=100000,
                 max_age=3600,  # 1 hour retention
             )
@@ -299,10 +1077,24 @@ class NATSMessageBus(BaseMessageBus):
 
         logger.info(f"NATS message bus connected for agent {self.agent_id}")
 
-    async def disconnect(self) -> None:
-        """Disconnect from NATS."""
+    async def disconnect(self, drain_timeout: float = 5.0) -> None:
+        """Disconnect from NATS, letting in-flight messages finish first."""
+        await self._flush_coalesced()
         self._running = False
 
+        for task in (self._fetch_task, self._ack_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._fetch_task = self._ack_task = None
+
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight), timeout=drain_timeout)
+        await self._flush_acks()
+
         for sub in self._subscriptions:
             await sub.unsubscribe()
 
@@ -311,25 +1103,59 @@ class NATSMessageBus(BaseMessageBus):
 
         logger.info(f"NATS message bus disconnected for agent {self.agent_id}")
 
-    @traced(name="nats_bus_publish")
-    async def publish(self, message: AgentMessage) -> None:
-        """Publish message to NATS."""
-        if not self._nc:
-            raise RuntimeError("Not connected to NATS")
-
-        subject = f"{self.subject_prefix}{message.subject}"
+    async def _reply_address(self) -> str:
+        """Core NATS inbox for responses to this instance's requests."""
+        if self._reply_inbox is None:
+            inbox = self._nc.new_inbox()
 
-        await self._js.publish(
-            subject,
-            message.to_json().encode(),
-            headers={
+            async def reply_handler(msg):
+                try:
+                    self._resolve_reply(self._codec.decode_message(msg.data))
+                except Exception as e:
+                    logger.error(f"Error processing NATS reply: {e}")
+
+            self._subscriptions.append(await self._nc.subscribe(inbox, cb=reply_handler))
+            self._reply_inbox = inbox
+        return self._reply_inbox
+
+    async def _publish_reply(self, response: AgentMessage, reply_to: str | None) -> None:
+        """Send a response over core NATS, bypassing JetStream persistence."""
+        if not reply_to or not reply_to.startswith("_INBOX."):
+            await self.publish(response)
+            return
+        _, body, headers = self._publish_args(response)
+        await self._nc.publish(reply_to, body, headers=headers)
+
+    def _encode(self, message: AgentMessage) -> bytes:
+        if self.codec == "compact":
+            return self._codec.encode_message(message)
+        return message.to_json().encode()
+
+    def _publish_args(self, message: AgentMessage) -> tuple[str, bytes, dict]:
+        """Subject, body and headers for a message."""
+        return (
+            f"{self.subject_prefix}{message.subject}",
+            self._encode(message),
+            {
                 "source": message.source,
                 "target": message.target or "*",
                 "priority": str(message.priority.value),
             },
         )
 
-        add_span_attributes({
+    @traced(name="nats_bus_publish")
+    async def publish(self, message: AgentMessage) -> None:
+        """Publish message to NATS."""
+        if not self._nc:
+            raise RuntimeError("Not connected to NATS")
+        if self._coalescer is not None:
+            await self._coalescer.submit(message)
+            return
+
+        subject, body, headers = self._publish_args(message)
+        await self._js.publish(subject, body, headers=headers)
+
+        add_span_attributes(**{
             "message.id": message.id,
             "message.type": message.type.value,
             "message.subject": message.subject,
@@ -337,17 +1163,169 @@ class NATSMessageBus(BaseMessageBus):
 
         logger.debug(f"Published message {message.id} to {subject}")
 
+    @traced(name="nats_bus_publish_many")
+    async def publish_many(self, messages: list[AgentMessage]) -> None:
+        """
+        Publish messages without waiting for each JetStream ack in turn.
+
+        Publishes are written back to back and their acks collected together,
+        with at most max_pending_acks outstanding at once. The first failure
+        is raised once its chunk completes; other messages may have been
+        published.
+        """
+        if not self._nc:
+            raise RuntimeError("Not connected to NATS")
+
+        for start in range(0, len(messages), self.max_pending_acks):
+            chunk = messages[start:start + self.max_pending_acks]
+            results = await asyncio.gather(
+                *(self._js.publish(subject, body, headers=headers)
+                  for subject, body, headers in map(self._publish_args, chunk)),
+                return_exceptions=True,
+            )
+            errors = [r for r in results if isinstance(r, Exception)]
+            if errors:
+                raise errors[0]
+
+        add_span_attributes(**{"message.count": len(messages)})
+        logger.debug(f"Published {len(messages)} messages")
+
     async def subscribe(self, subject: str) -> None:
         """Subscribe to a NATS subject."""
+        if not self.pull_consumer:
+            await self._push_subscribe(subject)
+            return
+
+        full_subject = f"{self.subject_prefix}{nats_subject_filter(subject)}"
+        filters = consolidate_subject_filters([*self._filter_subjects, full_subject])
+        if filters == self._filter_subjects:
+            return
+        await self._update_consumer(filters)
+        logger.info(f"Subscribed to {full_subject}")
+
+    async def _update_consumer(self, filters: list[str]) -> None:
+        """Create or update this agent's durable pull consumer and start fetching."""
+        from nats.js.api import AckPolicy, ConsumerConfig
+
+        # Adding a consumer under an existing durable name updates its filters
+        await self._js.add_consumer(
+            self.STREAM_NAME,
+            ConsumerConfig(
+                durable_name=self._durable,
+                ack_policy=AckPolicy.EXPLICIT,
+                max_ack_pending=self.max_ack_pending,
+                filter_subjects=filters,
+            ),
+        )
+        self._filter_subjects = filters
+
+        if self._pull_sub is None:
+            self._pull_sub = await self._js.pull_subscribe_bind(self._durable, stream=self.STREAM_NAME)
+            self._subscriptions.append(self._pull_sub)
+            self._fetch_task = asyncio.create_task(self._fetch_messages())
+            self._ack_task = asyncio.create_task(self._ack_loop())
+
+    async def _fetch_messages(self) -> None:
+        """Pull batches from the consumer and dispatch them concurrently."""
+        while self._running:
+            try:
+                # Never hold more unprocessed messages than free dispatch slots
+                batch = max(1, min(self.fetch_batch, self.max_in_flight - len(self._in_flight)))
+                msgs = await self._pull_sub.fetch(batch, timeout=self.fetch_timeout)
+            except asyncio.CancelledError:
+                break
+            except asyncio.TimeoutError:
+                continue  # Nothing to fetch
+            except Exception as e:
+                logger.error(f"NATS fetch error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            # Highest priority first; sort is stable so arrival order holds within a priority
+            msgs.sort(key=self._msg_priority, reverse=True)
+            for msg in msgs:
+                await self._slots.acquire()
+                task = asyncio.create_task(self._process_msg(msg))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+    @staticmethod
+    def _msg_priority(msg) -> int:
+        try:
+            return int(msg.headers.get("priority", MessagePriority.NORMAL))
+        except (AttributeError, ValueError):
+            return MessagePriority.NORMAL
+
+    def _for_us(self, msg) -> bool:
+        target = msg.headers.get("target", "*") if msg.headers else "*"
+        return target == "*" or target == self.agent_id
+
+    async def _process_msg(self, msg) -> None:
+        """Dispatch one fetched message and queue its ack."""
+        try:
+            if self._for_us(msg):
+                if self._codec.is_compact(msg.data):
+                    header = self._codec.peek_header(msg.data)
+                    if self._is_expired(header):
+                        self._drop_expired(header)
+                        self._queue_ack(msg)
+                        return
+                    if not self._wants(header):
+                        self._queue_ack(msg)
+                        return
+                await self._dispatch_message(self._codec.decode_message(msg.data))
+            self._queue_ack(msg)
+        except Exception as e:
+            # Left unacknowledged, so the server redelivers it after ack_wait
+            logger.error(f"Error processing NATS message: {e}")
+        finally:
+            self._slots.release()
+
+    def _queue_ack(self, msg) -> None:
+        self._pending_acks.append(msg)
+        if len(self._pending_acks) >= self.ack_batch_size:
+            self._ack_wakeup.set()
+
+    async def _flush_acks(self) -> None:
+        """Send all queued acks together, flushing the connection once."""
+        if not self._pending_acks:
+            return
+        pending, self._pending_acks = self._pending_acks, []
+        results = await asyncio.gather(*(msg.ack() for msg in pending), return_exceptions=True)
+        failed = sum(isinstance(result, Exception) for result in results)
+        if failed:
+            logger.warning(f"Failed to ack {failed} NATS messages; they will be redelivered")
+        if self._nc is not None:
+            try:
+                await self._nc.flush()
+            except Exception as e:
+                logger.warning(f"NATS flush after acks failed: {e}")
+
+    async def _ack_loop(self) -> None:
+        """Flush queued acks every ack_interval, or sooner once a batch fills."""
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._ack_wakeup.wait(), timeout=self.ack_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._ack_wakeup.clear()
+                await self._flush_acks()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"NATS ack error: {e}")
+
+    async def _push_subscribe(self, subject: str) -> None:
+        """Subscribe with a push consumer of its own, acking message by message."""
         full_subject = f"{self.subject_prefix}{subject}"
 
         async def message_handler(msg):
             try:
-                message = AgentMessage.from_json(msg.data.decode())
+                message = self._codec.decode_message(msg.data)
 
                 # Check if message is for us
-                target = msg.headers.get("target", "*") if msg.headers else "*"
-                if target != "*" and target != self.agent_id:
+                if not self._for_us(msg):
                     return
 
                 await self._dispatch_message(message)
@@ -365,37 +1343,167 @@ class NATSMessageBus(BaseMessageBus):
 
 
 class InMemoryMessageBus(BaseMessageBus):
-    """In-memory message bus for testing."""
+    """
+    In-process message bus for tests and single-node deployments.
+
+    Every agent has a bounded inbox drained by its own consumer task, so
+    publish() returns once a message is queued rather than after every
+    handler has run. A full inbox makes publishers wait for room. Inboxes
+    are priority ordered (FIFO within a priority), and responses to this
+    bus's own request() calls are resolved on delivery instead of queued, so
+    a handler awaiting a request never waits behind itself.
+
+    Published messages are only kept in the shared log when retention is
+    configured with configure_retention().
+    """
 
-    _instance = None
-    _messages: list[AgentMessage] = []
     _agents: dict[str, "InMemoryMessageBus"] = {}
+    _messages: deque[tuple[float, AgentMessage]] = deque()
+    retention_size: int = 0
+    retention_seconds: float = 0.0
 
-    def __init__(self, agent_id: str):
-        super().__init__(agent_id)
+    def __init__(
+        self,
+        agent_id: str,
+        coalesce_ms: float = 0.0,
+        inbox_size: int = 1000,
+        max_in_flight: int = 64,
+    ):
+        super().__init__(agent_id, coalesce_ms=coalesce_ms)
+        self.inbox_size = inbox_size
+        self.max_in_flight = max_in_flight
+        # Entries are (-priority, sequence, message)
+        self._inbox: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=inbox_size)
+        self._sequence = itertools.count()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight: set[asyncio.Task] = set()
+        self._consumer_task: asyncio.Task | None = None
         InMemoryMessageBus._agents[agent_id] = self
 
+    @classmethod
+    def configure_retention(cls, max_messages: int = 0, max_age_seconds: float = 0.0) -> None:
+        """
+        Keep published messages in the shared log.
+
+        Args:
+            max_messages: Most messages to keep (0 for no count limit)
+            max_age_seconds: Drop messages older than this (0 for no age limit)
+
+        With both limits at 0 nothing is kept.
+        """
+        cls.retention_size = max_messages
+        cls.retention_seconds = max_age_seconds
+        cls._messages = deque(cls._messages, maxlen=max_messages or None)
+        cls._trim_retained(time.monotonic())
+
+    @classmethod
+    def recent_messages(cls) -> list[AgentMessage]:
+        """Messages still held by the retention log, oldest first."""
+        cls._trim_retained(time.monotonic())
+        return [message for _, message in cls._messages]
+
+    @classmethod
+    def _retain(cls, message: AgentMessage) -> None:
+        if not (cls.retention_size or cls.retention_seconds):
+            return
+        now = time.monotonic()
+        cls._messages.append((now, message))
+        cls._trim_retained(now)
+
+    @classmethod
+    def _trim_retained(cls, now: float) -> None:
+        if not (cls.retention_size or cls.retention_seconds):
+            cls._messages.clear()
+            return
+        if cls.retention_seconds:
+            cutoff = now - cls.retention_seconds
+            while cls._messages and cls._messages[0][0] < cutoff:
+                cls._messages.popleft()
+
+    @property
+    def backlog(self) -> int:
+        """Messages queued for this agent and not yet dispatched."""
+        return self._inbox.qsize()
+
     async def connect(self) -> None:
-        """No-op for in-memory bus."""
+        """Start consuming this agent's inbox."""
         self._running = True
+        self._start_consumer()
         logger.info(
             f"In-memory message bus connected for agent {self.agent_id}")
 
-    async def disconnect(self) -> None:
-        """No-op for in-memory bus."""
-        self._running = False
-        if self.agent_id in InMemoryMessageBus._agents:
+    async def disconnect(self, drain_timeout: float = 5.0) -> None:
+        """Stop receiving, letting queued and in-flight messages finish first."""
+        await self._flush_coalesced()
+        if InMemoryMessageBus._agents.get(self.agent_id) is self:
             del InMemoryMessageBus._agents[self.agent_id]
 
-    async def publish(self, message: AgentMessage) -> None:
-        """Publish to all in-memory agents."""
-        InMemoryMessageBus._messages.append(message)
+        if self._consumer_task:
+            try:
+                await asyncio.wait_for(self._inbox.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dropping {self._inbox.qsize()} queued messages for agent {self.agent_id}")
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
+            self._consumer_task = None
+
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight), timeout=drain_timeout)
+        self._running = False
 
-        for agent_id, bus in InMemoryMessageBus._agents.items():
+    async def publish(self, message: AgentMessage) -> None:
+        """Queue a message for every in-memory agent it is addressed to."""
+        if self._coalescer is not None:
+            await self._coalescer.submit(message)
+            return
+        await self._deliver(message)
+
+    async def publish_many(self, messages: list[AgentMessage]) -> None:
+        """Queue several messages in order."""
+        for message in messages:
+            await self._deliver(message)
+
+    async def _deliver(self, message: AgentMessage) -> None:
+        InMemoryMessageBus._retain(message)
+        for agent_id, bus in list(InMemoryMessageBus._agents.items()):
             if message.target and message.target != agent_id:
                 continue
             if agent_id != message.source:  # Don't send to self
-                await bus._dispatch_message(message)
+                await bus._enqueue(message)
+
+    async def _enqueue(self, message: AgentMessage) -> None:
+        """Put a message in this agent's inbox, waiting while it is full."""
+        if self._resolve_reply(message):
+            return
+        self._start_consumer()
+        await self._inbox.put((-message.priority, next(self._sequence), message))
+
+    def _start_consumer(self) -> None:
+        # Started lazily as well, so buses that never call connect() still receive
+        if self._consumer_task is None or self._consumer_task.done():
+            self._consumer_task = asyncio.create_task(self._consume_messages())
+
+    async def _consume_messages(self) -> None:
+        """Dispatch queued messages, up to max_in_flight at a time."""
+        while True:
+            _, _, message = await self._inbox.get()
+            await self._slots.acquire()
+            task = asyncio.create_task(self._process_message(message))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _process_message(self, message: AgentMessage) -> None:
+        try:
+            await self._dispatch_message(message)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+        finally:
+            self._slots.release()
+            self._inbox.task_done()
 
     async def subscribe(self, subject: str) -> None:
         """No-op for in-memory bus - all messages are delivered."""
@@ -414,7 +1522,7 @@ async def create_message_bus(
     elif bus_type == "nats":
         bus = NATSMessageBus(agent_id, **kwargs)
     elif bus_type == "memory":
-        bus = InMemoryMessageBus(agent_id)
+        bus = InMemoryMessageBus(agent_id, **kwargs)
     else:
         raise ValueError(f"Unknown bus type: {bus_type}")
 
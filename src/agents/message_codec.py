@@ -0,0 +1,145 @@
+"""
+Compact binary wire format for AgentMessage.
+
+Layout (all integers big-endian):
+
+    version      B    CODEC_VERSION; JSON messages start with "{" instead
+    type         B    index into MESSAGE_TYPES
+    priority     B    MessagePriority value
+    flags        B    reserved
+    ttl_seconds  I
+    timestamp    q    microseconds since the Unix epoch (UTC)
+    lengths      6H   byte lengths of the strings below; 0xFFFF means None
+    id, source, target, subject, correlation_id, reply_to
+                      UTF-8, back to back
+    payload      JSON (orjson when installed) up to the end of the frame
+
+Everything a router needs sits in the header, so peek_header() can route or
+filter a message without touching the payload. decode_message() accepts
+both this format and the JSON produced by AgentMessage.to_json(), so agents
+can switch encoders one at a time.
+"""
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from src.agents.message_bus import AgentMessage, MessagePriority, MessageType
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+CODEC_VERSION = 1
+
+MESSAGE_TYPES = tuple(MessageType)
+_TYPE_CODES = {message_type: i for i, message_type in enumerate(MESSAGE_TYPES)}
+_PRIORITIES = {priority.value: priority for priority in MessagePriority}
+
+_STRING_FIELDS = ("id", "source", "target", "subject", "correlation_id", "reply_to")
+_FIXED = struct.Struct(f"!BBBBIq{len(_STRING_FIELDS)}H")
+_NONE_LENGTH = 0xFFFF
+_JSON_START = ord("{")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class MessageHeader(NamedTuple):
+    """Routing fields of an encoded message, readable without the payload."""
+    version: int
+    type: MessageType
+    priority: MessagePriority
+    ttl_seconds: int
+    timestamp: datetime
+    id: str
+    source: str
+    target: str | None
+    subject: str
+    correlation_id: str | None
+    reply_to: str | None
+
+
+def _dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+def _loads(data: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _to_micros(timestamp: datetime) -> int:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def encode_message(message: AgentMessage) -> bytes:
+    """Encode a message in the compact binary format."""
+    strings = [
+        None if value is None else value.encode()
+        for value in (message.id, message.source, message.target, message.subject,
+                      message.correlation_id, message.reply_to)
+    ]
+    header = _FIXED.pack(
+        CODEC_VERSION,
+        _TYPE_CODES[message.type],
+        int(message.priority),
+        0,
+        message.ttl_seconds,
+        _to_micros(message.timestamp),
+        *(_NONE_LENGTH if value is None else len(value) for value in strings),
+    )
+    return b"".join((header, *(value for value in strings if value), _dumps(message.payload)))
+
+
+def _read_header(data: bytes) -> tuple[MessageHeader, int]:
+    """Parse the header, returning it with the payload's offset."""
+    version, type_code, priority, _flags, ttl, micros, *lengths = _FIXED.unpack_from(data)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported message codec version: {version}")
+
+    offset = _FIXED.size
+    strings = []
+    for length in lengths:
+        if length == _NONE_LENGTH:
+            strings.append(None)
+        else:
+            strings.append(data[offset:offset + length].decode())
+            offset += length
+
+    header = MessageHeader(
+        version,
+        MESSAGE_TYPES[type_code],
+        _PRIORITIES[priority],
+        ttl,
+        _EPOCH + micros * _MICROSECOND,
+        *strings,
+    )
+    return header, offset
+
+
+def is_compact(data: bytes | str) -> bool:
+    """Whether data is in the binary format rather than JSON."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and len(data) > 0 and data[0] != _JSON_START
+
+
+def peek_header(data: bytes) -> MessageHeader:
+    """Read a compact message's routing fields without decoding its payload."""
+    return _read_header(data)[0]
+
+
+def decode_message(data: bytes | str) -> AgentMessage:
+    """Decode a message in either the compact binary format or JSON."""
+    if not is_compact(data):
+        return AgentMessage.from_json(data)
+
+    header, offset = _read_header(data)
+    fields = header._asdict()
+    del fields["version"]
+    fields["payload"] = _loads(data[offset:])
+    return AgentMessage.model_validate(fields)
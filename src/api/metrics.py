@@ -105,6 +105,55 @@ VOTE_LATENCY = Histogram(
     buckets=[1.0, 2.5, 5.0, 10.0, 30.0],
 )
 
+# Job queue metrics
+JOB_QUEUE_DEPTH = Gauge(
+    "kosmos_job_queue_depth",
+    "Jobs in the background job queue",
+    ["state"],  # ready, delayed, in_flight, dead
+)
+
+JOB_QUEUE_OLDEST_AGE = Gauge(
+    "kosmos_job_queue_oldest_job_age_seconds",
+    "Age of the oldest unfinished job in the background job queue",
+)
+
+JOB_RESULTS = Counter(
+    "kosmos_jobs_total",
+    "Background jobs processed",
+    ["job", "outcome"],  # succeeded, retried, dead
+)
+
+# Agent message bus metrics
+MESSAGE_BUS_PENDING = Gauge(
+    "kosmos_message_bus_pending_entries",
+    "Delivered but unacknowledged entries in a message bus consumer group",
+    ["stream", "group"],
+)
+
+MESSAGE_BUS_OLDEST_PENDING_AGE = Gauge(
+    "kosmos_message_bus_oldest_pending_age_seconds",
+    "Age of the oldest unacknowledged entry in a message bus consumer group",
+    ["stream", "group"],
+)
+
+MESSAGE_BUS_RECLAIMED = Counter(
+    "kosmos_message_bus_reclaimed_total",
+    "Stuck message bus entries reclaimed from idle consumers",
+    ["stream"],
+)
+
+MESSAGE_BUS_DEAD_LETTERS = Counter(
+    "kosmos_message_bus_dead_letters_total",
+    "Message bus entries moved to the dead-letter stream",
+    ["stream"],
+)
+
+MESSAGE_BUS_EXPIRED = Counter(
+    "kosmos_message_bus_expired_total",
+    "Messages dropped because their TTL elapsed before dispatch",
+    ["lane"],
+)
+
 # Database metrics
 DB_CONNECTIONS = Gauge(
     "kosmos_db_connections_active",
@@ -120,8 +169,68 @@ DB_QUERIES = Counter(
 # Redis metrics
 REDIS_OPERATIONS = Counter(
     "kosmos_redis_operations_total",
-    "Total Redis operations",
-    ["operation"],  # get, set, delete
+    "Total cache service Redis operations, per key",
+    ["operation", "namespace", "result"],  # result: hit, miss, ok, error
+)
+
+CACHE_OPERATION_LATENCY = Histogram(
+    "kosmos_cache_operation_duration_seconds",
+    "Cache service operation latency in seconds",
+    ["operation", "namespace"],
+    buckets=[0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0],
+)
+
+CACHE_VALUE_SIZE = Histogram(
+    "kosmos_cache_value_bytes",
+    "Encoded size of cache values read and written",
+    ["namespace", "direction"],  # read, write
+    buckets=[64, 256, 1024, 4096, 16384, 65536, 262144, 1048576],
+)
+
+CACHE_WRITE_TTL = Histogram(
+    "kosmos_cache_write_ttl_seconds",
+    "TTL of cache values written",
+    ["namespace"],
+    buckets=[60, 300, 900, 3600, 14400, 86400, 604800],
+)
+
+CACHE_HIT_RATIO = Gauge(
+    "kosmos_cache_hit_ratio",
+    "Cache hit ratio since startup",
+    ["namespace"],
+)
+
+REDIS_UP = Gauge(
+    "kosmos_redis_up",
+    "Whether the cache service's Redis connection is healthy",
+)
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "kosmos_redis_pool_connections",
+    "Cache service Redis pool connections",
+    ["state"],  # in_use, idle, max
+)
+
+REDIS_RECONNECTS = Counter(
+    "kosmos_redis_reconnect_attempts_total",
+    "Cache service Redis reconnect attempts",
+    ["outcome"],  # success, failure
+)
+
+NEAR_CACHE_LOOKUPS = Counter(
+    "kosmos_cache_near_lookups_total",
+    "Cache near-cache lookups",
+    ["result"],  # hit, miss
+)
+
+NEAR_CACHE_INVALIDATIONS = Counter(
+    "kosmos_cache_near_invalidated_entries_total",
+    "Near-cache entries dropped on Redis invalidation",
+)
+
+NEAR_CACHE_ENTRIES = Gauge(
+    "kosmos_cache_near_entries",
+    "Entries held in the cache near-cache",
 )
 
 # WebSocket metrics
@@ -276,12 +385,100 @@ def record_llm_request(provider: str, model: str, prompt_tokens: int, completion
         LLM_CACHE_HITS.labels(provider=provider).inc()
 
 
+def record_llm_cache_hit(provider: str):
+    """Record an LLM response served from the cache."""
+    LLM_CACHE_HITS.labels(provider=provider).inc()
+
+
 def record_vote(outcome: str, duration: float):
     """Record Pentarchy vote metrics."""
     VOTE_REQUESTS.labels(outcome=outcome).inc()
     VOTE_LATENCY.observe(duration)
 
 
+def record_job(job: str, outcome: str):
+    """Record a background job outcome."""
+    JOB_RESULTS.labels(job=job, outcome=outcome).inc()
+
+
+def record_job_queue_stats(stats: dict):
+    """Record job queue depth and age from JobQueue.stats()."""
+    for state in ("ready", "delayed", "in_flight", "dead"):
+        JOB_QUEUE_DEPTH.labels(state=state).set(stats.get(state, 0))
+    JOB_QUEUE_OLDEST_AGE.set(stats.get("oldest_job_age_seconds", 0.0))
+
+
+def record_message_bus_pending(stream: str, group: str, pending: int, oldest_age_seconds: float):
+    """Record consumer group lag for a message bus stream."""
+    MESSAGE_BUS_PENDING.labels(stream=stream, group=group).set(pending)
+    MESSAGE_BUS_OLDEST_PENDING_AGE.labels(stream=stream, group=group).set(oldest_age_seconds)
+
+
+def record_message_bus_recovery(stream: str, reclaimed: int = 0, dead_lettered: int = 0):
+    """Record stuck entries reclaimed or dead-lettered by the pending sweeper."""
+    if reclaimed:
+        MESSAGE_BUS_RECLAIMED.labels(stream=stream).inc(reclaimed)
+    if dead_lettered:
+        MESSAGE_BUS_DEAD_LETTERS.labels(stream=stream).inc(dead_lettered)
+
+
+def record_message_expired(lane: str):
+    """Record a message dropped for exceeding its TTL."""
+    MESSAGE_BUS_EXPIRED.labels(lane=lane).inc()
+
+
+def record_redis_pool(in_use: int, idle: int, max_connections: int, up: bool):
+    """Record cache Redis pool utilization and health."""
+    REDIS_POOL_CONNECTIONS.labels(state="in_use").set(in_use)
+    REDIS_POOL_CONNECTIONS.labels(state="idle").set(idle)
+    REDIS_POOL_CONNECTIONS.labels(state="max").set(max_connections)
+    REDIS_UP.set(1 if up else 0)
+
+
+def record_redis_reconnect(outcome: str):
+    """Record a cache Redis reconnect attempt."""
+    REDIS_RECONNECTS.labels(outcome=outcome).inc()
+
+
+def record_cache_operation(
+    operation: str,
+    namespace: str,
+    results: dict,
+    duration: float,
+    read_sizes: list = (),
+    write_sizes: list = (),
+    ttls: list = (),
+):
+    """Record one cache service call: per-key result counts, latency and value sizes."""
+    for result, count in results.items():
+        if count:
+            REDIS_OPERATIONS.labels(operation=operation, namespace=namespace, result=result).inc(count)
+    CACHE_OPERATION_LATENCY.labels(operation=operation, namespace=namespace).observe(duration)
+    for size in read_sizes:
+        CACHE_VALUE_SIZE.labels(namespace=namespace, direction="read").observe(size)
+    for size in write_sizes:
+        CACHE_VALUE_SIZE.labels(namespace=namespace, direction="write").observe(size)
+    for ttl in ttls:
+        CACHE_WRITE_TTL.labels(namespace=namespace).observe(ttl)
+
+
+def record_cache_hit_ratio(namespace: str, ratio: float):
+    """Record a cache namespace's hit ratio."""
+    CACHE_HIT_RATIO.labels(namespace=namespace).set(ratio)
+
+
+def record_near_cache_lookup(hit: bool):
+    """Record a near-cache lookup."""
+    NEAR_CACHE_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+
+
+def record_near_cache_invalidations(dropped: int, entries: int):
+    """Record near-cache entries dropped by an invalidation."""
+    if dropped:
+        NEAR_CACHE_INVALIDATIONS.inc(dropped)
+    NEAR_CACHE_ENTRIES.set(entries)
+
+
 # Create metrics router
 metrics_router = APIRouter(tags=["metrics"])
 
@@ -290,3 +487,12 @@ metrics_router = APIRouter(tags=["metrics"])
 async def metrics():
     """Prometheus metrics endpoint."""
     return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+@metrics_router.get("/metrics/cache", include_in_schema=False)
+async def cache_metrics():
+    """Per-namespace cache summary: hit rate, latency, value sizes and TTLs."""
+    from src.services.cache_service import cache_stats
+
+    return cache_stats()
+
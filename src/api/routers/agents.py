@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from src.api.auth_deps import get_current_user, get_optional_user, require_permission
+from src.core.agent_registry import get_agent_instance
 from src.services.auth_service import Permission
 
 logger = logging.getLogger(__name__)
@@ -211,36 +212,10 @@ async def query_agent(agent_id: str, request: AgentQueryRequest, current_user: O
     start_time = time.time()
 
     try:
-        # Try to import and use the actual agent
+        # Use the shared agent instance
         agent_module = None
         try:
-            if agent_id == "zeus":
-                from src.agents.zeus.main import ZeusAgent
-                agent_module = ZeusAgent()
-            elif agent_id == "athena":
-                from src.agents.athena.main import AthenaAgent
-                agent_module = AthenaAgent()
-            elif agent_id == "hephaestus":
-                from src.agents.hephaestus.main import HephaestusAgent
-                agent_module = HephaestusAgent()
-            elif agent_id == "aegis":
-                from src.agents.aegis.main import AegisAgent
-                agent_module = AegisAgent()
-            elif agent_id == "chronos":
-                from src.agents.chronos.main import ChronosAgent
-                agent_module = ChronosAgent()
-            elif agent_id == "memorix":
-                from src.agents.memorix.main import MemorixAgent
-                agent_module = MemorixAgent()
-            elif agent_id == "iris":
-                from src.agents.iris.main import IrisAgent
-                agent_module = IrisAgent()
-            elif agent_id == "hestia":
-                from src.agents.hestia.main import HestiaAgent
-                agent_module = HestiaAgent()
-            elif agent_id == "morpheus":
-                from src.agents.morpheus.main import MorpheusAgent
-                agent_module = MorpheusAgent()
+            agent_module = get_agent_instance(agent_id)
         except ImportError as e:
             logger.warning(f"Could not import agent {agent_id}: {e}")
 
@@ -2,19 +2,31 @@
 Votes API Router - Pentarchy governance and voting.
 """
 import os
+import re
+import json
+import hashlib
 import uuid
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
+from itertools import islice
 from typing import Optional, List, Dict, Any
 
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.api.auth_deps import get_optional_user, require_permission
 from src.services.auth_service import Permission
+from src.core.agent_registry import get_agent_instance
+from src.api.routers.websocket import proposal_topic, vote_events, ALL_PROPOSALS_TOPIC
+from src.services.job_queue import get_worker_pool
 from src.core.governance import (
     THRESHOLDS, 
     PENTARCHY_AGENTS, 
+    AUTO_APPROVE_LIMIT,
+    HUMAN_REVIEW_LIMIT,
     RiskLevel, 
     get_risk_level, 
     calculate_vote_outcome
@@ -63,6 +75,13 @@ class ProposalResponse(BaseModel):
     resolved_at: Optional[datetime]
 
 
+class AgentProposalRequest(BaseModel):
+    """Proposal payload passed to an agent's evaluate_proposal."""
+    proposal_id: str
+    cost: float
+    description: str
+
+
 class ProposalSummary(BaseModel):
     """Summary of a proposal."""
     proposal_id: str
@@ -73,9 +92,87 @@ class ProposalSummary(BaseModel):
     created_at: datetime
 
 
+# Interval between SSE keep-alive comments on idle event streams
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Job name for background vote collection on the job queue
+VOTE_COLLECTION_JOB = "collect_votes"
+
+# How long a resolved auto-generated proposal absorbs repeats of the same
+# request. Repeats of a proposal still being voted on are always absorbed;
+# 0 disables deduplication.
+AUTO_PROPOSAL_DEDUP_WINDOW_SECONDS = float(os.getenv("AUTO_PROPOSAL_DEDUP_WINDOW_SECONDS", "300"))
+
 # In-memory storage (replace with DB)
 _proposals: Dict[str, dict] = {}
 
+# Running aggregates maintained alongside _proposals so that the stats and
+# pending endpoints never need to scan every proposal.
+PROPOSAL_STATUSES = ("pending", "approved", "rejected", "escalated")
+
+_stats: Dict[str, Any] = {
+    "by_status": {status: 0 for status in PROPOSAL_STATUSES},
+    "score_sum": 0.0,
+    "total_votes": 0,
+}
+
+# Pending proposals keyed by id. Proposals are inserted in creation order, so
+# dict insertion order doubles as created_at order.
+_pending: Dict[str, dict] = {}
+
+
+def _track_new_proposal(proposal: dict) -> None:
+    """Register a freshly created proposal with the running aggregates."""
+    _stats["by_status"][proposal["status"]] += 1
+    _stats["total_votes"] += len(proposal["votes"])
+    if proposal["status"] == "pending":
+        _pending[proposal["id"]] = proposal
+
+
+async def _add_vote(proposal: dict, vote: dict) -> None:
+    """Record a vote, replacing any earlier vote from the same agent."""
+    previous = len(proposal["votes"])
+    proposal["votes"] = [v for v in proposal["votes"] if v["agent"] != vote["agent"]]
+    proposal["votes"].append(vote)
+    _stats["total_votes"] += len(proposal["votes"]) - previous
+
+    await _publish_event("vote_cast", proposal, {
+        "agent": vote["agent"],
+        "vote": vote["vote"],
+        "score": vote["score"],
+        "votes_collected": len(proposal["votes"]),
+        "votes_needed": len(PENTARCHY_AGENTS),
+    })
+
+
+def _set_outcome(proposal: dict, status: str, final_score: Optional[float]) -> None:
+    """Update a proposal's status and score, keeping aggregates in sync."""
+    _stats["by_status"][proposal["status"]] -= 1
+    _stats["by_status"][status] += 1
+    _stats["score_sum"] += (final_score or 0) - (proposal["final_score"] or 0)
+
+    proposal["status"] = status
+    proposal["final_score"] = final_score
+
+    if status == "pending":
+        _pending[proposal["id"]] = proposal
+    else:
+        _pending.pop(proposal["id"], None)
+
+
+async def _publish_event(event_type: str, proposal: dict, fields: Dict[str, Any]) -> None:
+    """Push a voting progress event to live subscribers."""
+    try:
+        await vote_events.publish({
+            "type": event_type,
+            "proposal_id": proposal["id"],
+            "status": proposal["status"],
+            "timestamp": datetime.utcnow().isoformat(),
+            **fields,
+        })
+    except Exception as e:
+        logger.warning(f"Failed to publish {event_type} event: {e}")
+
 
 @router.post("/proposals", response_model=ProposalResponse)
 async def create_proposal(
@@ -117,9 +214,26 @@ async def create_proposal(
     }
 
     _proposals[proposal_id] = proposal
+    _track_new_proposal(proposal)
+    await _publish_event("proposal_created", proposal, {
+        "title": proposal["title"],
+        "cost": proposal["cost"],
+        "risk_level": proposal["risk_level"],
+    })
 
-    # Trigger async voting
-    background_tasks.add_task(_collect_votes, proposal_id)
+    # Trigger async voting on the job queue when workers are running
+    pool = get_worker_pool()
+    queued = False
+    if pool.running:
+        tenant = (current_user or {}).get("tenant_id") or initiator
+        try:
+            await pool.submit(VOTE_COLLECTION_JOB, {"proposal_id": proposal_id}, tenant=tenant)
+            queued = True
+        except Exception as e:
+            # The proposal is already stored; collect its votes in-process
+            logger.warning(f"Could not queue vote collection for {proposal_id}, collecting in background: {e}")
+    if not queued:
+        background_tasks.add_task(_collect_votes, proposal_id)
 
     return _format_proposal_response(proposal)
 
@@ -179,11 +293,8 @@ async def manual_vote(proposal_id: str, agent: str, vote: str, score: float, rea
 
     proposal = _proposals[proposal_id]
 
-    # Remove existing vote from this agent
-    proposal["votes"] = [v for v in proposal["votes"] if v["agent"] != agent]
-
-    # Add new vote
-    proposal["votes"].append({
+    # Replace any existing vote from this agent
+    await _add_vote(proposal, {
         "agent": agent,
         "vote": vote,
         "score": score,
@@ -193,7 +304,7 @@ async def manual_vote(proposal_id: str, agent: str, vote: str, score: float, rea
 
     # Check if voting is complete
     if len(proposal["votes"]) >= len(PENTARCHY_AGENTS):
-        _resolve_proposal(proposal_id)
+        await _resolve_proposal(proposal_id)
 
     return {"status": "voted", "proposal_id": proposal_id, "agent": agent, "vote": vote}
 
@@ -209,7 +320,7 @@ async def resolve_proposal(proposal_id: str):
         raise HTTPException(
             status_code=400, detail="Proposal already resolved")
 
-    _resolve_proposal(proposal_id)
+    await _resolve_proposal(proposal_id)
     return _format_proposal_response(_proposals[proposal_id])
 
 
@@ -224,21 +335,57 @@ async def get_thresholds():
     }
 
 
+@router.get("/events")
+async def stream_vote_events(
+    proposal_id: Optional[str] = Query(None, description="Only events for this proposal"),
+):
+    """
+    Server-Sent Events stream of live voting progress.
+
+    Pushes proposal_created, vote_cast and proposal_resolved events as they
+    happen, so clients no longer need to poll proposals or /pending.
+    """
+    topic = proposal_topic(proposal_id) if proposal_id else ALL_PROPOSALS_TOPIC
+
+    async def event_stream():
+        queue = vote_events.subscribe(topic)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            vote_events.unsubscribe(topic, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/queue")
+async def get_vote_queue_stats():
+    """Get vote collection queue depth, job age and worker utilization."""
+    pool = get_worker_pool()
+    if pool.queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **await pool.stats()}
+
+
 @router.get("/stats")
 async def get_voting_stats():
-    """Get voting statistics."""
-    proposals = list(_proposals.values())
+    """Get voting statistics (served from running aggregates)."""
+    total = len(_proposals)
 
     return {
-        "total_proposals": len(proposals),
-        "by_status": {
-            "pending": len([p for p in proposals if p["status"] == "pending"]),
-            "approved": len([p for p in proposals if p["status"] == "approved"]),
-            "rejected": len([p for p in proposals if p["status"] == "rejected"]),
-            "escalated": len([p for p in proposals if p["status"] == "escalated"]),
-        },
-        "average_score": sum(p["final_score"] or 0 for p in proposals) / len(proposals) if proposals else 0,
-        "total_votes": sum(len(p["votes"]) for p in proposals),
+        "total_proposals": total,
+        "by_status": dict(_stats["by_status"]),
+        "average_score": _stats["score_sum"] / total if total else 0,
+        "total_votes": _stats["total_votes"],
     }
 
 
@@ -257,97 +404,98 @@ class AnalyzeActionRequest(BaseModel):
     context: Optional[Dict[str, Any]] = None
 
 
-@router.post("/analyze-action", response_model=ActionAnalysis)
-async def analyze_action(request: AnalyzeActionRequest):
-    """
-    Analyze a user message to determine if it requires Pentarchy voting.
-    
-    This endpoint checks if the action described in the message:
-    - Has an estimated cost >= $50 (triggers voting)
-    - Has an estimated cost >= $100 (requires human review)
-    - Involves sensitive operations (security, legal, financial)
-    """
-    import re
-    
-    message = request.message
-    
-    # Keywords that suggest costly or sensitive operations
-    cost_keywords = {
-        "purchase": 75.0,
-        "buy": 75.0,
-        "subscribe": 60.0,
-        "deploy": 80.0,
-        "provision": 100.0,
-        "scale": 70.0,
-        "upgrade": 85.0,
-        "migrate": 150.0,
-        "delete": 50.0,
-        "remove": 40.0,
-        "transfer": 90.0,
-        "payment": 100.0,
-        "invoice": 50.0,
-        "hire": 200.0,
-        "contract": 150.0,
-    }
-    
-    security_keywords = ["security", "access", "permission", "credential", "secret", "key", "password"]
-    legal_keywords = ["legal", "compliance", "gdpr", "contract", "agreement", "terms"]
-    
+class AnalyzeActionBatchRequest(BaseModel):
+    """Request body for the batch analyze-action endpoint."""
+    messages: List[str] = Field(..., max_length=10000, description="User messages to analyze")
+
+
+# Keywords that suggest costly or sensitive operations. Cost keywords are
+# checked in order: the first listed keyword found in a message wins.
+COST_KEYWORDS = {
+    "purchase": 75.0,
+    "buy": 75.0,
+    "subscribe": 60.0,
+    "deploy": 80.0,
+    "provision": 100.0,
+    "scale": 70.0,
+    "upgrade": 85.0,
+    "migrate": 150.0,
+    "delete": 50.0,
+    "remove": 40.0,
+    "transfer": 90.0,
+    "payment": 100.0,
+    "invoice": 50.0,
+    "hire": 200.0,
+    "contract": 150.0,
+}
+SECURITY_KEYWORDS = ["security", "access", "permission", "credential", "secret", "key", "password"]
+LEGAL_KEYWORDS = ["legal", "compliance", "gdpr", "contract", "agreement", "terms"]
+
+_NUMBER = r"\d+(?:,\d{3})*(?:\.\d{2})?"
+
+# Explicit cost mentions (e.g., "$75", "100 dollars", "costs about 80")
+_COST_PATTERNS = (
+    re.compile(rf"\$({_NUMBER})"),
+    re.compile(rf"({_NUMBER})\s*(?:dollars?|usd)"),
+    re.compile(r"cost(?:s|ing)?\s*(?:about|around|approximately)?\s*\$?(\d+)"),
+)
+# Every cost pattern needs a digit, so messages without one skip them entirely
+_DIGIT = re.compile(r"\d")
+
+_COST_KEYWORD_ITEMS = tuple(COST_KEYWORDS.items())
+_SECURITY_KEYWORDS = tuple(SECURITY_KEYWORDS)
+_LEGAL_KEYWORDS = tuple(LEGAL_KEYWORDS)
+
+
+def _contains_any(text: str, keywords: tuple) -> bool:
+    for keyword in keywords:
+        if keyword in text:
+            return True
+    return False
+
+
+def classify_action(message: str) -> ActionAnalysis:
+    """Classify a message's cost and risk using precompiled patterns."""
     message_lower = message.lower()
-    
-    # Detect explicit cost mentions (e.g., "$75", "100 dollars")
-    cost_patterns = [
-        r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:dollars?|usd)',
-        r'cost(?:s|ing)?\s*(?:about|around|approximately)?\s*\$?(\d+)',
-    ]
-    
+
     detected_cost = 0.0
-    for pattern in cost_patterns:
-        matches = re.findall(pattern, message_lower)
-        for match in matches:
-            try:
-                cost = float(match.replace(",", ""))
-                detected_cost = max(detected_cost, cost)
-            except ValueError:
-                pass
-    
+    if _DIGIT.search(message_lower):
+        for pattern in _COST_PATTERNS:
+            for match in pattern.findall(message_lower):
+                detected_cost = max(detected_cost, float(match.replace(",", "")))
+
     # Check for action keywords
     action_type = "general"
     estimated_cost = detected_cost
-    
-    for keyword, default_cost in cost_keywords.items():
+
+    for keyword, default_cost in _COST_KEYWORD_ITEMS:
         if keyword in message_lower:
             action_type = keyword
             if estimated_cost == 0:
                 estimated_cost = default_cost
             break
-    
+
+    is_security = _contains_any(message_lower, _SECURITY_KEYWORDS)
+    is_legal = not is_security and _contains_any(message_lower, _LEGAL_KEYWORDS)
+
     # Check for security/legal sensitivity
-    is_security = any(kw in message_lower for kw in security_keywords)
-    is_legal = any(kw in message_lower for kw in legal_keywords)
-    
     if is_security:
         action_type = "security"
         estimated_cost = max(estimated_cost, 100.0)  # Always requires human review
     elif is_legal:
         action_type = "legal"
         estimated_cost = max(estimated_cost, 100.0)
-    
+
     # Determine risk level based on cost
-    from src.core.governance import AUTO_APPROVE_LIMIT, HUMAN_REVIEW_LIMIT
-    
     if estimated_cost >= HUMAN_REVIEW_LIMIT:
         risk_level = "high"
     elif estimated_cost >= AUTO_APPROVE_LIMIT:
         risk_level = "medium"
     else:
         risk_level = "low"
-    
-    requires_voting = estimated_cost >= AUTO_APPROVE_LIMIT
-    
+
     return ActionAnalysis(
-        requires_voting=requires_voting,
+        requires_voting=estimated_cost >= AUTO_APPROVE_LIMIT,
         estimated_cost=estimated_cost,
         risk_level=risk_level,
         action_type=action_type,
@@ -355,12 +503,91 @@ async def analyze_action(request: AnalyzeActionRequest):
     )
 
 
+@router.post("/analyze-action", response_model=ActionAnalysis)
+async def analyze_action(request: AnalyzeActionRequest):
+    """
+    Analyze a user message to determine if it requires Pentarchy voting.
+    
+    This endpoint checks if the action described in the message:
+    - Has an estimated cost >= $50 (triggers voting)
+    - Has an estimated cost >= $100 (requires human review)
+    - Involves sensitive operations (security, legal, financial)
+    """
+    return classify_action(request.message)
+
+
+@router.post("/analyze-action/batch", response_model=List[ActionAnalysis])
+async def analyze_action_batch(request: AnalyzeActionBatchRequest):
+    """Analyze many messages in one request; results are in input order."""
+    return [classify_action(message) for message in request.messages]
+
+
 class AutoProposalRequest(BaseModel):
     """Request body for auto-proposal endpoint."""
     message: str
     conversation_id: Optional[str] = None
 
 
+# Auto-generated proposals keyed by request fingerprint, oldest first
+_auto_proposals: Dict[str, str] = {}
+# Per-fingerprint locks, with how many requests hold or await each
+_auto_proposal_locks: Dict[str, list] = {}
+
+
+def _auto_proposal_key(message: str, conversation_id: Optional[str]) -> str:
+    """
+    Fingerprint an auto-proposal by normalized text and conversation.
+
+    The cost (and so the risk band) is derived from the text, so it adds
+    nothing to the fingerprint.
+    """
+    normalized = " ".join(message.lower().split()).strip(" .!?")
+    raw = f"{conversation_id or ''}\x1f{normalized}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@asynccontextmanager
+async def _auto_proposal_guard(key: str):
+    """Serialize auto-proposal requests sharing a fingerprint, and only those."""
+    entry = _auto_proposal_locks.get(key)
+    if entry is None:
+        entry = _auto_proposal_locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _auto_proposal_locks[key]
+
+
+def _is_dedup_live(proposal: Optional[dict], now: datetime) -> bool:
+    """Whether a proposal still absorbs duplicate auto-proposal requests."""
+    if proposal is None:
+        return False
+    if proposal["status"] == "pending":
+        return True
+    resolved_at = proposal["resolved_at"]
+    return resolved_at is not None and (
+        (now - resolved_at).total_seconds() <= AUTO_PROPOSAL_DEDUP_WINDOW_SECONDS)
+
+
+def _find_auto_proposal(key: str) -> Optional[dict]:
+    """Return the live proposal for a fingerprint, pruning expired entries."""
+    now = datetime.utcnow()
+    # Drop expired fingerprints from the front; stop at the first live one
+    while _auto_proposals:
+        oldest = next(iter(_auto_proposals))
+        if _is_dedup_live(_proposals.get(_auto_proposals[oldest]), now):
+            break
+        del _auto_proposals[oldest]
+
+    proposal_id = _auto_proposals.get(key)
+    proposal = _proposals.get(proposal_id) if proposal_id else None
+    return proposal if _is_dedup_live(proposal, now) else None
+
+
 @router.post("/auto-proposal")
 async def create_auto_proposal(
     request: AutoProposalRequest,
@@ -376,8 +603,7 @@ async def create_auto_proposal(
     conversation_id = request.conversation_id
     
     # First analyze the action
-    analysis_request = AnalyzeActionRequest(message=message)
-    analysis = await analyze_action(analysis_request)
+    analysis = classify_action(message)
     
     if not analysis.requires_voting:
         return {
@@ -386,7 +612,39 @@ async def create_auto_proposal(
             "analysis": analysis.model_dump()
         }
     
-    # Create proposal
+    if AUTO_PROPOSAL_DEDUP_WINDOW_SECONDS <= 0:
+        return await _create_auto_proposal(
+            message, conversation_id, analysis, background_tasks, current_user)
+
+    key = _auto_proposal_key(message, conversation_id)
+    async with _auto_proposal_guard(key):
+        existing = _find_auto_proposal(key)
+        if existing is None:
+            result = await _create_auto_proposal(
+                message, conversation_id, analysis, background_tasks, current_user)
+            _auto_proposals[key] = result["proposal_id"]
+            return result
+
+    # Attach the repeat to the existing proposal instead of starting a new vote
+    existing["context"]["duplicate_requests"] = existing["context"].get("duplicate_requests", 0) + 1
+    logger.info(f"Auto-proposal deduplicated onto {existing['id']}")
+    return {
+        "proposal_created": False,
+        "duplicate_of": existing["id"],
+        "proposal_id": existing["id"],
+        "analysis": analysis.model_dump(),
+        "status": existing["status"]
+    }
+
+
+async def _create_auto_proposal(
+    message: str,
+    conversation_id: Optional[str],
+    analysis: ActionAnalysis,
+    background_tasks: BackgroundTasks,
+    current_user: Optional[dict],
+) -> dict:
+    """Create the proposal for an auto-proposal request."""
     proposal_request = ProposalRequest(
         title=f"Auto-generated: {analysis.action_type.title()} Action",
         description=message,
@@ -407,11 +665,14 @@ async def create_auto_proposal(
 
 
 @router.get("/pending")
-async def get_pending_proposals():
-    """Get all pending proposals that are awaiting votes."""
-    pending = [p for p in _proposals.values() if p["status"] == "pending"]
-    pending.sort(key=lambda x: x["created_at"], reverse=True)
-    
+async def get_pending_proposals(
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+):
+    """Get pending proposals that are awaiting votes, newest first."""
+    stop = offset + limit if limit is not None else None
+    pending = islice(reversed(_pending.values()), offset, stop)
+
     return [
         {
             "proposal_id": p["id"],
@@ -463,7 +724,7 @@ async def _collect_votes(proposal_id: str):
     for agent_name in PENTARCHY_AGENTS:
         try:
             vote_result = await _get_agent_vote(agent_name, proposal)
-            proposal["votes"].append({
+            await _add_vote(proposal, {
                 "agent": agent_name,
                 "vote": vote_result["vote"],
                 "score": vote_result["score"],
@@ -473,7 +734,7 @@ async def _collect_votes(proposal_id: str):
         except Exception as e:
             logger.error(f"Failed to get vote from {agent_name}: {e}")
             # Add abstain on error
-            proposal["votes"].append({
+            await _add_vote(proposal, {
                 "agent": agent_name,
                 "vote": "ABSTAIN",
                 "score": 1.5,
@@ -482,39 +743,17 @@ async def _collect_votes(proposal_id: str):
             })
 
     # Resolve after all votes
-    _resolve_proposal(proposal_id)
+    await _resolve_proposal(proposal_id)
 
 
 async def _get_agent_vote(agent_name: str, proposal: dict) -> dict:
     """Get vote from a specific agent."""
     try:
-        # Try to use actual agent
-        agent = None
-        if agent_name == "athena":
-            from src.agents.athena.main import AthenaAgent
-            agent = AthenaAgent()
-        elif agent_name == "hephaestus":
-            from src.agents.hephaestus.main import HephaestusAgent
-            agent = HephaestusAgent()
-        elif agent_name == "hermes":
-            from src.agents.hermes.main import HermesAgent
-            agent = HermesAgent()
-        elif agent_name == "prometheus":
-            from src.agents.nur_prometheus.main import PrometheusAgent
-            agent = PrometheusAgent()
-        elif agent_name == "aegis":
-            from src.agents.aegis.main import AegisAgent
-            agent = AegisAgent()
+        # Use the shared agent instance
+        agent = get_agent_instance(agent_name)
 
         if agent and hasattr(agent, "evaluate_proposal"):
-            from pydantic import BaseModel
-
-            class ProposalRequest(BaseModel):
-                proposal_id: str
-                cost: float
-                description: str
-
-            request = ProposalRequest(
+            request = AgentProposalRequest(
                 proposal_id=proposal["id"],
                 cost=proposal["cost"],
                 description=proposal["description"],
@@ -541,7 +780,36 @@ async def _get_agent_vote(agent_name: str, proposal: dict) -> dict:
     }
 
 
-def _resolve_proposal(proposal_id: str):
+async def _collect_votes_job(proposal_id: str):
+    """
+    Job queue entry point for vote collection.
+
+    Proposals only live in the process that created them, and each instance
+    drains its own Redis queue (see instance_key_prefix). A job redelivered
+    after a restart finds its proposal gone and fails, to be retried and
+    then dead-lettered rather than acked.
+    """
+    if proposal_id not in _proposals:
+        raise LookupError(f"Proposal {proposal_id} is not held by this process")
+    await _collect_votes(proposal_id)
+
+
+async def _escalate_dead_vote_job(job) -> None:
+    """Escalate a proposal whose vote collection job was dead-lettered."""
+    proposal = _proposals.get(job.payload.get("proposal_id"))
+    if proposal is None or proposal["status"] != "pending":
+        return
+    proposal["context"]["vote_collection_error"] = job.last_error
+    _set_outcome(proposal, "escalated", proposal["final_score"])
+    proposal["resolved_at"] = datetime.utcnow()
+    logger.warning(f"Vote collection for {proposal['id']} failed permanently; escalated")
+    await _publish_resolved(proposal)
+
+
+get_worker_pool().register(VOTE_COLLECTION_JOB, _collect_votes_job, on_dead_letter=_escalate_dead_vote_job)
+
+
+async def _resolve_proposal(proposal_id: str):
     """Resolve a proposal based on collected votes."""
     if proposal_id not in _proposals:
         return
@@ -549,21 +817,20 @@ def _resolve_proposal(proposal_id: str):
     proposal = _proposals[proposal_id]
 
     if not proposal["votes"]:
-        proposal["status"] = "escalated"
+        _set_outcome(proposal, "escalated", proposal["final_score"])
         proposal["resolved_at"] = datetime.utcnow()
+        await _publish_resolved(proposal)
         return
 
     # Calculate weighted average score
     total_score = sum(v["score"] for v in proposal["votes"])
     avg_score = total_score / len(proposal["votes"])
 
-    proposal["final_score"] = round(avg_score, 2)
-
     # Determine outcome
     if avg_score >= proposal["threshold"]:
-        proposal["status"] = "approved"
+        status = "approved"
     elif avg_score < 1.0:
-        proposal["status"] = "rejected"
+        status = "rejected"
     else:
         # Check for consensus issues
         approves = len([v for v in proposal["votes"]
@@ -571,12 +838,23 @@ def _resolve_proposal(proposal_id: str):
         rejects = len([v for v in proposal["votes"] if v["vote"] == "REJECT"])
 
         if rejects > approves:
-            proposal["status"] = "rejected"
+            status = "rejected"
         elif approves >= 3:
-            proposal["status"] = "approved"
+            status = "approved"
         else:
-            proposal["status"] = "escalated"
+            status = "escalated"
 
+    _set_outcome(proposal, status, round(avg_score, 2))
     proposal["resolved_at"] = datetime.utcnow()
     logger.info(
         f"Proposal {proposal_id} resolved: {proposal['status']} (score: {avg_score:.2f})")
+    await _publish_resolved(proposal)
+
+
+async def _publish_resolved(proposal: dict) -> None:
+    """Publish the outcome of a resolved proposal."""
+    await _publish_event("proposal_resolved", proposal, {
+        "final_score": proposal["final_score"],
+        "votes_collected": len(proposal["votes"]),
+        "resolved_at": proposal["resolved_at"].isoformat(),
+    })
@@ -4,8 +4,9 @@ WebSocket endpoint for real-time chat streaming.
 import asyncio
 import json
 import logging
+import os
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Set
 from uuid import uuid4
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
@@ -102,7 +103,7 @@ class ConnectionManager:
         if conversation_id not in self.active_connections:
             return
 
-        for conn_id, websocket in self.active_connections[conversation_id].items():
+        for conn_id, websocket in list(self.active_connections[conversation_id].items()):
             if conn_id != exclude_connection:
                 try:
                     await websocket.send_json(message)
@@ -143,6 +144,110 @@ class ConnectionManager:
 
 
 manager = ConnectionManager()
+# Vote subscribers are tracked apart from chat conversations so that a chat
+# client can neither join a vote topic nor send frames to its subscribers.
+vote_manager = ConnectionManager()
+
+
+# Redis pub/sub channel used to fan governance events out to every API replica
+VOTE_EVENTS_CHANNEL = "kosmos:votes:events"
+# Topic for subscribers interested in every proposal
+ALL_PROPOSALS_TOPIC = "votes:*"
+
+
+def proposal_topic(proposal_id: str) -> str:
+    """Topic name for subscribers of a single proposal."""
+    return f"votes:{proposal_id}"
+
+
+class VoteEventHub:
+    """
+    Pushes Pentarchy voting events to WebSocket and SSE subscribers.
+
+    Events are published to Redis pub/sub so that subscribers connected to
+    any replica receive them. Without Redis, events are delivered locally.
+    """
+
+    def __init__(self, connection_manager: ConnectionManager, redis_url: Optional[str] = None):
+        self.manager = connection_manager
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self._queues: Dict[str, Set[asyncio.Queue]] = {}
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Connect to Redis and start relaying events from other replicas."""
+        import redis.asyncio as aioredis
+
+        try:
+            client = aioredis.from_url(self.redis_url, decode_responses=True)
+            pubsub = client.pubsub()
+            await pubsub.subscribe(VOTE_EVENTS_CHANNEL)
+        except Exception as e:
+            logger.warning(f"Vote events using local delivery only: {e}")
+            return
+
+        self._redis = client
+        self._listener = asyncio.create_task(self._listen(pubsub))
+        logger.info("Vote events relayed through Redis pub/sub")
+
+    async def stop(self) -> None:
+        """Stop relaying events and close the Redis connection."""
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, event: Dict[str, Any]) -> None:
+        """Publish an event for a proposal to subscribers on all replicas."""
+        if self._redis:
+            try:
+                await self._redis.publish(VOTE_EVENTS_CHANNEL, json.dumps(event, default=str))
+                return
+            except Exception as e:
+                logger.warning(f"Vote event publish failed, delivering locally: {e}")
+        await self._deliver(event)
+
+    def subscribe(self, topic: str, maxsize: int = 100) -> asyncio.Queue:
+        """Subscribe a local (SSE) consumer to a topic."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._queues.setdefault(topic, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue) -> None:
+        """Remove a local consumer from a topic."""
+        queues = self._queues.get(topic)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[topic]
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    await self._deliver(json.loads(message["data"]))
+                except Exception as e:
+                    logger.error(f"Failed to deliver vote event: {e}")
+        finally:
+            await pubsub.aclose()
+
+    async def _deliver(self, event: Dict[str, Any]) -> None:
+        for topic in (proposal_topic(event["proposal_id"]), ALL_PROPOSALS_TOPIC):
+            await self.manager.broadcast_to_conversation(event, topic)
+            for queue in list(self._queues.get(topic, ())):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    logger.warning(f"Dropping vote event for slow subscriber on {topic}")
+
+
+vote_events = VoteEventHub(vote_manager)
 
 
 async def mock_agent_response(query: str):
@@ -251,6 +356,44 @@ async def websocket_chat(websocket: WebSocket, conversation_id: str):
         manager.disconnect(connection_id, conversation_id)
 
 
+@router.websocket("/votes")
+@router.websocket("/votes/{proposal_id}")
+async def websocket_votes(websocket: WebSocket, proposal_id: Optional[str] = None):
+    """
+    WebSocket endpoint for live Pentarchy voting progress.
+
+    Subscribes to one proposal, or to every proposal when no id is given.
+
+    Message Types (Server -> Client):
+    - {"type": "proposal_created", "proposal_id": "...", "title": "...", ...}
+    - {"type": "vote_cast", "proposal_id": "...", "agent": "...", "vote": "...", ...}
+    - {"type": "proposal_resolved", "proposal_id": "...", "status": "...", ...}
+    - {"type": "pong"}
+    """
+    topic = proposal_topic(proposal_id) if proposal_id else ALL_PROPOSALS_TOPIC
+    connection_id = await vote_manager.connect(websocket, topic)
+
+    try:
+        await vote_manager.send_personal_message({
+            "type": "connected",
+            "connection_id": connection_id,
+            "topic": topic,
+            "timestamp": datetime.utcnow().isoformat(),
+        }, websocket)
+
+        while True:
+            data = await websocket.receive_json()
+            websocket_messages_total.labels(direction="inbound").inc()
+            if data.get("type") == "ping":
+                await vote_manager.send_personal_message({"type": "pong"}, websocket)
+
+    except WebSocketDisconnect:
+        vote_manager.disconnect(connection_id, topic)
+    except Exception as e:
+        logger.exception(f"WebSocket error: {e}")
+        vote_manager.disconnect(connection_id, topic)
+
+
 @router.get("/connections")
 async def get_connection_stats():
     """Get WebSocket connection statistics."""
@@ -263,4 +406,8 @@ async def get_connection_stats():
             conv_id: len(conns)
             for conv_id, conns in manager.active_connections.items()
         },
+        "vote_subscriptions": {
+            topic: len(conns)
+            for topic, conns in vote_manager.active_connections.items()
+        },
     }
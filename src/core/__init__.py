@@ -2,11 +2,20 @@
 KOSMOS Core Module - Agent Registry and MCP Client.
 """
 
-from .agent_registry import AGENT_REGISTRY, get_agent_path
+from .agent_registry import (
+    AGENT_REGISTRY,
+    get_agent_path,
+    get_agent_instance,
+    warm_up_agents,
+    shutdown_agents,
+)
 from .mcp_client import AgentClient
 
 __all__ = [
     "AGENT_REGISTRY",
     "get_agent_path",
+    "get_agent_instance",
+    "warm_up_agents",
+    "shutdown_agents",
     "AgentClient",
 ]
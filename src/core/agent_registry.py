@@ -1,4 +1,11 @@
+import asyncio
+import importlib
+import logging
 import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
 
 # Map agent names to their entry point scripts relative to the project root
 AGENT_REGISTRY = {
@@ -14,11 +21,107 @@ AGENT_REGISTRY = {
     "morpheus": "src/agents/morpheus/main.py"
 }
 
+# Map agent names to the in-process classes implementing them ("module:Class")
+AGENT_CLASSES = {
+    "zeus": "src.agents.zeus.main:ZeusAgent",
+    "hermes": "src.agents.hermes.main:HermesAgent",
+    "chronos": "src.agents.chronos.main:ChronosAgent",
+    "aegis": "src.agents.aegis.main:AegisAgent",
+    "memorix": "src.agents.memorix.main:MemorixAgent",
+    "athena": "src.agents.athena.main:AthenaAgent",
+    "hephaestus": "src.agents.hephaestus.main:HephaestusAgent",
+    "nur_prometheus": "src.agents.nur_prometheus.main:NurPrometheusAgent",
+    "iris": "src.agents.iris.main:IrisAgent",
+    "hestia": "src.agents.hestia.main:HestiaAgent",
+    "morpheus": "src.agents.morpheus.main:MorpheusAgent",
+}
+
+# Alternate names used by the API routers
+AGENT_ALIASES = {
+    "prometheus": "nur_prometheus",
+}
+
+# Process-wide agent instances, built lazily on first use
+_agent_instances: Dict[str, Any] = {}
+_agent_instances_lock = threading.Lock()
+
+
 def get_agent_path(agent_name: str) -> str:
     """Get the absolute path to an agent's main.py"""
     if agent_name not in AGENT_REGISTRY:
         raise ValueError(f"Agent {agent_name} not found in registry")
-    
+
     # Assuming this code runs from project root or we can resolve it
     # For now, let's assume CWD is project root
     return os.path.abspath(AGENT_REGISTRY[agent_name])
+
+
+def resolve_agent_name(agent_name: str) -> str:
+    """Resolve an agent alias to its canonical registry name."""
+    return AGENT_ALIASES.get(agent_name, agent_name)
+
+
+def get_agent_instance(agent_name: str) -> Any:
+    """
+    Get the shared in-process instance of an agent, building it on first use.
+
+    Agent construction sets up an MCP server, registers tools and initializes
+    LLM clients, so instances are reused across requests.
+
+    Raises:
+        ValueError: If the agent is unknown
+        ImportError: If the agent module cannot be imported
+    """
+    name = resolve_agent_name(agent_name)
+    instance = _agent_instances.get(name)
+    if instance is not None:
+        return instance
+
+    if name not in AGENT_CLASSES:
+        raise ValueError(f"Agent {agent_name} not found in registry")
+
+    with _agent_instances_lock:
+        instance = _agent_instances.get(name)
+        if instance is None:
+            module_path, class_name = AGENT_CLASSES[name].split(":")
+            agent_class = getattr(importlib.import_module(module_path), class_name)
+            instance = agent_class()
+            _agent_instances[name] = instance
+            logger.info(f"Agent instance created: {name}")
+    return instance
+
+
+def warm_up_agents(agent_names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+    """
+    Build agent instances ahead of the first request.
+
+    Returns:
+        Mapping of agent name to whether it was built successfully
+    """
+    results = {}
+    for agent_name in agent_names or AGENT_CLASSES:
+        try:
+            get_agent_instance(agent_name)
+            results[agent_name] = True
+        except Exception as e:
+            logger.warning(f"Agent warm-up failed for {agent_name}: {e}")
+            results[agent_name] = False
+    return results
+
+
+async def shutdown_agents() -> None:
+    """Shut down and forget all shared agent instances."""
+    with _agent_instances_lock:
+        instances = list(_agent_instances.items())
+        _agent_instances.clear()
+
+    for name, instance in instances:
+        shutdown = getattr(instance, "shutdown", None)
+        if shutdown is None:
+            continue
+        try:
+            result = shutdown()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"Error shutting down agent {name}: {e}")
@@ -0,0 +1,245 @@
+"""
+Vectorized Pentarchy governance engine.
+
+Evaluates many proposals at once with NumPy, using the same rules as
+calculate_vote_outcome, and replays proposal history under alternative
+thresholds and cost limits for policy tuning.
+
+Votes are an int8 matrix of shape (proposals, agents) holding +1 (APPROVE),
+-1 (REJECT) or 0 (ABSTAIN / missing). Risk levels are int8 codes indexing
+RISK_LEVELS.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.governance import (
+    THRESHOLDS,
+    AUTO_APPROVE_LIMIT,
+    HUMAN_REVIEW_LIMIT,
+    PENTARCHY_AGENTS,
+    RiskLevel,
+    VoteType,
+)
+
+# Risk level order used for int8 risk codes
+RISK_LEVELS: Tuple[RiskLevel, ...] = (
+    RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL,
+)
+
+# Outcome order used for int8 outcome codes. AUTO_APPROVED only appears in
+# replays, for proposals whose cost falls below the auto-approve limit.
+OUTCOMES: Tuple[str, ...] = ("REJECTED", "APPROVED_WITH_REVIEW", "APPROVED", "AUTO_APPROVED")
+REJECTED, APPROVED_WITH_REVIEW, APPROVED, AUTO_APPROVED = range(len(OUTCOMES))
+
+VOTE_VALUES = {
+    VoteType.APPROVE.value: 1,
+    VoteType.REJECT.value: -1,
+    VoteType.ABSTAIN.value: 0,
+}
+
+# Cost at which get_risk_level switches from HIGH to CRITICAL
+CRITICAL_COST_LIMIT = 1000.0
+
+
+@dataclass
+class GovernancePolicy:
+    """Thresholds and cost limits a batch of proposals is evaluated under."""
+    thresholds: Dict[RiskLevel, float] = field(default_factory=lambda: dict(THRESHOLDS))
+    auto_approve_limit: float = AUTO_APPROVE_LIMIT
+    human_review_limit: float = HUMAN_REVIEW_LIMIT
+    critical_limit: float = CRITICAL_COST_LIMIT
+    review_margin: float = 0.5
+
+    def threshold_array(self) -> np.ndarray:
+        """Thresholds indexed by risk code."""
+        default = self.thresholds.get(RiskLevel.MEDIUM, THRESHOLDS[RiskLevel.MEDIUM])
+        return np.array([self.thresholds.get(r, default) for r in RISK_LEVELS], dtype=np.float64)
+
+
+@dataclass
+class BatchOutcome:
+    """Per-proposal results of a vectorized evaluation."""
+    scores: np.ndarray
+    thresholds: np.ndarray
+    margins: np.ndarray
+    outcomes: np.ndarray
+
+    def outcome_names(self) -> List[str]:
+        """Outcome strings, matching calculate_vote_outcome's return values."""
+        return [OUTCOMES[code] for code in self.outcomes.tolist()]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of proposals per outcome."""
+        return _count_outcomes(self.outcomes)
+
+
+@dataclass
+class ReplayReport:
+    """How outcomes shift between a baseline and a candidate policy."""
+    total: int
+    baseline: Dict[str, int]
+    candidate: Dict[str, int]
+    transitions: Dict[Tuple[str, str], int]
+    changed: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "changed": self.changed,
+            "baseline": self.baseline,
+            "candidate": self.candidate,
+            "transitions": [
+                {"from": before, "to": after, "count": count}
+                for (before, after), count in self.transitions.items()
+            ],
+        }
+
+
+def _count_outcomes(outcomes: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(outcomes, minlength=len(OUTCOMES))
+    return {name: int(count) for name, count in zip(OUTCOMES, counts) if count}
+
+
+def encode_votes(
+    votes: Iterable[Mapping[str, str]],
+    agents: Sequence[str] = PENTARCHY_AGENTS,
+) -> np.ndarray:
+    """
+    Encode per-proposal vote dicts (agent -> vote) as a vote matrix.
+
+    Agents missing from a proposal count as abstentions, as do agents not
+    listed in `agents`.
+    """
+    columns = {agent: i for i, agent in enumerate(agents)}
+    rows = []
+    for proposal_votes in votes:
+        row = [0] * len(agents)
+        for agent, vote in proposal_votes.items():
+            column = columns.get(agent)
+            if column is not None:
+                row[column] = VOTE_VALUES.get(vote, 0)
+        rows.append(row)
+    return np.array(rows, dtype=np.int8).reshape(len(rows), len(agents))
+
+
+def encode_risk_levels(risk_levels: Iterable[str]) -> np.ndarray:
+    """Encode risk level names as risk codes, defaulting unknown names to MEDIUM."""
+    codes = {level.value: i for i, level in enumerate(RISK_LEVELS)}
+    medium = codes[RiskLevel.MEDIUM.value]
+    return np.array([codes.get(str(level), medium) for level in risk_levels], dtype=np.int8)
+
+
+def risk_levels_for_costs(costs: np.ndarray, policy: Optional[GovernancePolicy] = None) -> np.ndarray:
+    """Vectorized get_risk_level under the policy's cost limits."""
+    policy = policy or GovernancePolicy()
+    bounds = np.array([policy.auto_approve_limit, policy.human_review_limit, policy.critical_limit])
+    return np.searchsorted(bounds, np.asarray(costs, dtype=np.float64), side="right").astype(np.int8)
+
+
+def evaluate(
+    votes: np.ndarray,
+    risk_levels: np.ndarray,
+    policy: Optional[GovernancePolicy] = None,
+) -> BatchOutcome:
+    """
+    Vectorized calculate_vote_outcome.
+
+    Args:
+        votes: int8 vote matrix of shape (proposals, agents)
+        risk_levels: Risk codes of shape (proposals,)
+        policy: Thresholds to apply, defaulting to the live governance settings
+
+    Returns:
+        Scores, thresholds, margins (score - threshold) and outcome codes
+    """
+    policy = policy or GovernancePolicy()
+    scores = votes.sum(axis=1, dtype=np.int32).astype(np.float64)
+    thresholds = policy.threshold_array()[risk_levels]
+    margins = scores - thresholds
+
+    outcomes = np.full(scores.shape, REJECTED, dtype=np.int8)
+    outcomes[(margins >= -policy.review_margin) & (scores > 0)] = APPROVED_WITH_REVIEW
+    outcomes[margins >= 0] = APPROVED
+    return BatchOutcome(scores=scores, thresholds=thresholds, margins=margins, outcomes=outcomes)
+
+
+def policy_outcomes(votes: np.ndarray, costs: np.ndarray, policy: GovernancePolicy) -> np.ndarray:
+    """Outcome codes for proposals whose risk level is derived from cost."""
+    costs = np.asarray(costs, dtype=np.float64)
+    outcomes = evaluate(votes, risk_levels_for_costs(costs, policy), policy).outcomes
+    outcomes[costs < policy.auto_approve_limit] = AUTO_APPROVED
+    return outcomes
+
+
+def replay(
+    votes: np.ndarray,
+    costs: np.ndarray,
+    candidate: GovernancePolicy,
+    baseline: Optional[GovernancePolicy] = None,
+) -> ReplayReport:
+    """
+    Re-run proposals under a candidate policy and compare with a baseline.
+
+    Risk levels are re-derived from cost under each policy, so changes to the
+    cost limits move proposals between thresholds and in or out of
+    auto-approval.
+    """
+    baseline = baseline or GovernancePolicy()
+    before = policy_outcomes(votes, costs, baseline)
+    after = policy_outcomes(votes, costs, candidate)
+
+    n = len(OUTCOMES)
+    matrix = np.bincount(before.astype(np.intp) * n + after, minlength=n * n).reshape(n, n)
+    transitions = {
+        (OUTCOMES[i], OUTCOMES[j]): int(matrix[i, j])
+        for i, j in zip(*np.nonzero(matrix))
+        if i != j
+    }
+    return ReplayReport(
+        total=int(len(before)),
+        baseline=_count_outcomes(before),
+        candidate=_count_outcomes(after),
+        transitions=transitions,
+        changed=int(sum(transitions.values())),
+    )
+
+
+def proposals_to_arrays(
+    proposals: Iterable[Mapping[str, Any]],
+    agents: Sequence[str] = PENTARCHY_AGENTS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert stored proposals to (votes, costs) arrays.
+
+    Accepts the votes router's proposal shape, where "votes" is a list of
+    {"agent", "vote"} dicts, as well as a plain agent -> vote mapping.
+    """
+    vote_dicts = []
+    costs = []
+    for proposal in proposals:
+        proposal_votes = proposal.get("votes") or {}
+        if not isinstance(proposal_votes, Mapping):
+            proposal_votes = {v["agent"]: v["vote"] for v in proposal_votes}
+        vote_dicts.append(proposal_votes)
+        costs.append(float(proposal.get("cost", 0.0)))
+    return encode_votes(vote_dicts, agents), np.array(costs, dtype=np.float64)
+
+
+def synthetic_history(
+    proposals: int,
+    agents: int = len(PENTARCHY_AGENTS),
+    approve_rate: float = 0.6,
+    reject_rate: float = 0.25,
+    seed: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate random (votes, costs) arrays for load testing and tuning."""
+    rng = np.random.default_rng(seed)
+    draws = rng.random((proposals, agents))
+    votes = np.zeros((proposals, agents), dtype=np.int8)
+    votes[draws < approve_rate] = 1
+    votes[(draws >= approve_rate) & (draws < approve_rate + reject_rate)] = -1
+    # Log-normal costs centred around the Pentarchy range ($50-$100)
+    costs = np.round(rng.lognormal(mean=4.2, sigma=1.0, size=proposals), 2)
+    return votes, costs
@@ -29,8 +29,27 @@ logger = logging.getLogger("kosmos-api")
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     logger.info("Starting KOSMOS API...")
+    if os.getenv("AGENT_WARMUP_ON_STARTUP", "false").lower() == "true":
+        from src.core.agent_registry import warm_up_agents
+        # Agent construction is synchronous; keep it off the event loop
+        results = await asyncio.to_thread(warm_up_agents)
+        logger.info(f"Agent warm-up: {sum(results.values())}/{len(results)} ready")
+    try:
+        from src.api.routers.websocket import vote_events
+        await vote_events.start()
+    except ImportError:
+        vote_events = None
+    if int(os.getenv("JOB_WORKER_CONCURRENCY", "4")) > 0:
+        from src.services.job_queue import start_worker_pool
+        await start_worker_pool()
     yield
     logger.info("Shutting down KOSMOS API...")
+    from src.services.job_queue import stop_worker_pool
+    await stop_worker_pool()
+    if vote_events:
+        await vote_events.stop()
+    from src.core.agent_registry import shutdown_agents
+    await shutdown_agents()
 
 
 app = FastAPI(
@@ -0,0 +1,186 @@
+"""
+Value codecs for CacheService.
+
+Encoded values start with one header byte, compression << 2 | serializer:
+
+    serializer   1 JSON (orjson when installed), 2 msgpack
+    compression  0 none, 1 zlib, 2 zstd, 3 lz4
+
+Every header is below 0x20. Entries written before the header existed are
+plain JSON text from json.dumps, whose first byte is always printable (0x20
+or above), so they still decode. Values are
+only compressed from compress_min_bytes up, and only when that makes them
+smaller. msgpack, zstandard and lz4 are optional; a codec configured with a
+missing one falls back to JSON or zlib, while decoding an entry that needs a
+missing library raises.
+"""
+import json
+import logging
+import os
+import zlib
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+SERIALIZERS = {"json": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+_COMPRESSION_NAMES = {code: name for name, code in COMPRESSIONS.items()}
+_LEGACY_MIN_BYTE = 0x20
+
+
+def _import(name: str):
+    """Import an optional codec library, or return None."""
+    try:
+        if name == "msgpack":
+            import msgpack
+            return msgpack
+        if name == "zstd":
+            import zstandard
+            return zstandard
+        if name == "lz4":
+            import lz4.frame
+            return lz4.frame
+    except ImportError:
+        return None
+    return None
+
+
+def available_compressions() -> list[str]:
+    """Compression names usable in this environment."""
+    return [name for name in COMPRESSIONS if name in ("none", "zlib") or _import(name) is not None]
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib handles them
+    return json.dumps(value).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CacheCodec:
+    """Serializes and optionally compresses cache values."""
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compression: str = "auto",
+        compress_min_bytes: int = 1024,
+    ):
+        """
+        Args:
+            serializer: "json" or "msgpack"
+            compression: "none", "zlib", "zstd", "lz4", or "auto" for the
+                fastest one installed
+            compress_min_bytes: Smallest serialized size worth compressing
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression != "auto" and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        if serializer == "msgpack" and _import("msgpack") is None:
+            logger.warning("msgpack not installed - caching values as JSON")
+            serializer = "json"
+        if compression == "auto":
+            compression = next(
+                (name for name in ("zstd", "lz4") if _import(name) is not None), "zlib")
+        elif compression in ("zstd", "lz4") and _import(compression) is None:
+            logger.warning(f"{compression} not installed - compressing cache values with zlib")
+            compression = "zlib"
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self._serializer_code = SERIALIZERS[serializer]
+        self._compression_code = COMPRESSIONS[compression]
+        self._msgpack = _import("msgpack") if serializer == "msgpack" else None
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+    def __repr__(self) -> str:
+        return (f"CacheCodec(serializer={self.serializer!r}, compression={self.compression!r}, "
+                f"compress_min_bytes={self.compress_min_bytes})")
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value with its header byte."""
+        if self._msgpack is not None:
+            payload = self._msgpack.packb(value, use_bin_type=True)
+        else:
+            payload = _json_dumps(value)
+
+        compression = 0
+        if self._compression_code and len(payload) >= self.compress_min_bytes:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self._compression_code
+
+        return bytes((compression << 2 | self._serializer_code,)) + payload
+
+    def decode(self, data: bytes | str) -> Any:
+        """Decode a value written by encode(), or a legacy JSON text entry."""
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data or data[0] >= _LEGACY_MIN_BYTE:
+            return _json_loads(data)
+
+        header = data[0]
+        serializer, compression = header & 0x03, header >> 2
+        payload = memoryview(data)[1:]
+        if compression:
+            payload = self._decompress(compression, payload)
+
+        if serializer == SERIALIZERS["json"]:
+            return _json_loads(bytes(payload))
+        if serializer == SERIALIZERS["msgpack"]:
+            msgpack = _import("msgpack")
+            if msgpack is None:
+                raise ValueError("Cache entry needs msgpack, which is not installed")
+            return msgpack.unpackb(payload, raw=False)
+        raise ValueError(f"Unknown cache value header: {header:#04x}")
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == "zstd":
+            if self._zstd_compressor is None:
+                self._zstd_compressor = _import("zstd").ZstdCompressor(level=3)
+            return self._zstd_compressor.compress(payload)
+        if self.compression == "lz4":
+            return _import("lz4").compress(payload)
+        return zlib.compress(payload, 6)
+
+    def _decompress(self, compression: int, payload) -> bytes:
+        name = _COMPRESSION_NAMES.get(compression)
+        if name == "zlib":
+            return zlib.decompress(payload)
+        if name in ("zstd", "lz4"):
+            module = _import(name)
+            if module is None:
+                raise ValueError(f"Cache entry needs {name}, which is not installed")
+            if name == "lz4":
+                return module.decompress(payload)
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = module.ZstdDecompressor()
+            return self._zstd_decompressor.decompress(payload)
+        raise ValueError(f"Unknown cache compression code: {compression}")
+
+
+def codec_from_env(prefix: str = "CACHE") -> CacheCodec:
+    """Codec configured by {prefix}_SERIALIZER, {prefix}_COMPRESSION and {prefix}_COMPRESS_MIN_BYTES."""
+    return CacheCodec(
+        serializer=os.getenv(f"{prefix}_SERIALIZER", "json"),
+        compression=os.getenv(f"{prefix}_COMPRESSION", "auto"),
+        compress_min_bytes=int(os.getenv(f"{prefix}_COMPRESS_MIN_BYTES", "1024")),
+    )
+
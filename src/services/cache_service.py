@@ -4,59 +4,467 @@ Provides caching for LLM responses and expensive computations.
 """
 import os
 import json
+import math
+import time
+import random
+import asyncio
 import hashlib
+import inspect
 import logging
-from typing import Optional, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Any, Union
 from datetime import timedelta
+from uuid import uuid4
 
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from src.services.cache_codec import CacheCodec, codec_from_env
+from src.services.near_cache import NearCache
 
 logger = logging.getLogger(__name__)
 
+# Delete a lock only while it still holds our token
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Read the live members of tag sets (scored by expiry) and drop the sets in
+# one step, so keys tagged meanwhile land in a fresh set instead of being lost
+_POP_TAGGED = """
+local members = {}
+for _, tag_key in ipairs(KEYS) do
+    for _, member in ipairs(redis.call('ZRANGEBYSCORE', tag_key, ARGV[1], '+inf')) do
+        members[#members + 1] = member
+    end
+end
+redis.call('DEL', unpack(KEYS))
+return members
+"""
+
+
+class CachePipeline:
+    """
+    Cache operations queued and sent to Redis in one round trip.
+
+    Values are encoded and decoded the same way as CacheService.get/set.
+    Results are available from execute(), or from ``results`` once the
+    ``async with cache.pipeline()`` block exits, in the order the operations
+    were queued: the value (or None) for get, True/False for set and delete.
+    """
+
+    def __init__(self, cache: "CacheService"):
+        self._cache = cache
+        self._ops: List[tuple] = []
+        self.results: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def get(self, key: str) -> "CachePipeline":
+        self._ops.append(("get", key))
+        return self
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> "CachePipeline":
+        self._ops.append(("set", key, self._cache.codec.encode(value), ttl or self._cache.default_ttl))
+        return self
+
+    def delete(self, key: str) -> "CachePipeline":
+        self._ops.append(("delete", key))
+        return self
+
+    async def execute(self) -> List[Any]:
+        """Send the queued operations and return their results."""
+        ops, self._ops = self._ops, []
+        if not ops:
+            self.results = []
+            return self.results
+        written = [op[1] for op in ops if op[0] != "get"]
+
+        client = self._cache._client
+        if not self._cache.available:
+            self.results = [None if op[0] == "get" else False for op in ops]
+            return self.results
+
+        started = time.perf_counter()
+        try:
+            pipe = client.pipeline(transaction=False)
+            for op in ops:
+                if op[0] == "get":
+                    pipe.get(op[1])
+                elif op[0] == "set":
+                    pipe.setex(op[1], timedelta(seconds=op[3]), op[2])
+                else:
+                    pipe.delete(op[1])
+            replies = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache pipeline error: {e}")
+            self._cache._on_error(e)
+            self._cache._record("pipeline", started, [(op[1], "error", None) for op in ops])
+            self.results = [None if op[0] == "get" else False for op in ops]
+            return self.results
+        finally:
+            if written:
+                self._cache._near_invalidate(written)
+
+        results = []
+        outcomes = []
+        for op, reply in zip(ops, replies):
+            if op[0] == "get":
+                results.append(self._cache.codec.decode(reply) if reply else None)
+                outcomes.append((op[1], "hit", len(reply)) if reply else (op[1], "miss", None))
+            else:
+                results.append(True)
+                outcomes.append((op[1], "ok", len(op[2]) if op[0] == "set" else None))
+        self._cache._record("pipeline", started, outcomes, {op[1]: op[3] for op in ops if op[0] == "set"})
+        self.results = results
+        logger.debug(f"Cache PIPELINE: {len(ops)} operations")
+        return results
+
+
+class _NamespaceStats:
+    """Running totals for one key namespace."""
+
+    __slots__ = ("hits", "misses", "errors", "operations", "latency",
+                 "reads", "read_bytes", "writes", "write_bytes", "ttl_total")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def summary(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "avg_latency_ms": round(self.latency / self.operations * 1000, 3) if self.operations else None,
+            "avg_read_bytes": round(self.read_bytes / self.reads) if self.reads else None,
+            "avg_write_bytes": round(self.write_bytes / self.writes) if self.writes else None,
+            "avg_ttl_seconds": round(self.ttl_total / self.writes) if self.writes else None,
+        }
+
 
 class CacheService:
-    """Redis-based caching service."""
+    """
+    Redis-based caching service.
+
+    Values are stored through a CacheCodec (see cache_codec.py), configured
+    from CACHE_SERIALIZER, CACHE_COMPRESSION and CACHE_COMPRESS_MIN_BYTES
+    unless one is passed in.
+
+    Invalidation without scanning the keyspace:
+    - Namespaces: keys built with namespaced_key() embed the namespace's
+      generation counter, so invalidate_namespace() drops every entry at
+      once by bumping it; the orphaned entries age out through their TTL.
+      Generations are reused locally for CACHE_GENERATION_TTL seconds
+      (default 1, 0 to always read Redis) so lookups skip that round trip;
+      another process's bump is seen once the local copy expires.
+    - Tags: entries set with tags=[...] are recorded in one Redis sorted set
+      per tag, scored by when they expire so writes prune expired members,
+      and invalidate_tags() deletes exactly the live entries.
 
-    def __init__(self, redis_url: Optional[str] = None):
+    The connection heals itself: a monitor task pings Redis every
+    REDIS_HEALTH_CHECK_INTERVAL seconds and, after a failed connect or a
+    connection error, reconnects with exponential backoff (capped at
+    REDIS_RECONNECT_MAX_DELAY). While Redis is unavailable every operation
+    degrades to a miss instead of waiting on timeouts.
+
+    Opt-in near-cache: keys under the prefixes in near_cache_prefixes (or
+    CACHE_NEAR_PREFIXES, comma-separated) are also kept in a bounded
+    in-process LRU of CACHE_NEAR_MAX_ENTRIES, so repeated reads skip the
+    round trip. Redis client tracking reports every write to those keys,
+    from any process, and drops them locally (see near_cache.py); while
+    tracking is down reads go to Redis as usual.
+
+    Every call is counted per key namespace, the part of the key before the
+    first ":" (LLM responses are "llm"): hits, misses, errors, latency,
+    encoded value sizes and write TTLs go to Prometheus, and stats() (served
+    at /metrics/cache) summarizes them for tuning TTLs. Set
+    CACHE_METRICS_ENABLED=false to turn this off; namespaces beyond
+    CACHE_METRICS_MAX_NAMESPACES are reported as "other".
+    """
+
+    GENERATION_KEY = "cache:gen:{}"
+    TAG_KEY = "cache:tag:{}"
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        codec: Optional[CacheCodec] = None,
+        near_cache_prefixes: Optional[List[str]] = None,
+    ):
+        self.codec = codec or codec_from_env()
         self.redis_url = redis_url or os.getenv(
             "REDIS_URL", "redis://localhost:6379")
         self._client: Optional[redis.Redis] = None
         self.default_ttl = int(
             os.getenv("CACHE_TTL_SECONDS", 3600))  # 1 hour default
+        self.max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+        self.socket_timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT", 2.0))
+        self.socket_connect_timeout = float(os.getenv("REDIS_CONNECT_TIMEOUT", 2.0))
+        self.health_check_interval = float(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 15))
+        self.reconnect_min_delay = 1.0
+        self.reconnect_max_delay = float(os.getenv("REDIS_RECONNECT_MAX_DELAY", 30))
+        # get_or_compute state: computations this process is waiting on,
+        # and background refreshes it is running
+        self._computing: Dict[str, asyncio.Future] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        # Namespace generations read recently: namespace -> (generation, expires at)
+        self.generation_ttl = float(os.getenv("CACHE_GENERATION_TTL", 1.0))
+        self._generations: Dict[str, tuple] = {}
+        # Connection health
+        self._healthy = True
+        self._last_error: Optional[str] = None
+        self._reconnects = 0
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._monitor_wakeup = asyncio.Event()
+        # Instrumentation
+        self.instrument = os.getenv("CACHE_METRICS_ENABLED", "true").lower() == "true"
+        self.max_namespaces = int(os.getenv("CACHE_METRICS_MAX_NAMESPACES", 50))
+        self._namespace_stats: Dict[str, _NamespaceStats] = {}
+        if near_cache_prefixes is None:
+            near_cache_prefixes = [
+                p.strip() for p in os.getenv("CACHE_NEAR_PREFIXES", "").split(",") if p.strip()]
+        self.near_cache: Optional[NearCache] = None
+        if near_cache_prefixes:
+            self.near_cache = NearCache(
+                self.redis_url,
+                near_cache_prefixes,
+                max_entries=int(os.getenv("CACHE_NEAR_MAX_ENTRIES", 1024)),
+                reconnect_max_delay=self.reconnect_max_delay,
+            )
+
+    @property
+    def available(self) -> bool:
+        """Whether Redis is connected and healthy."""
+        return self._client is not None and self._healthy
+
+    def health(self) -> Dict[str, Any]:
+        """Connection state for health checks."""
+        if self.available:
+            status = "connected"
+        elif self._monitor_task is not None and not self._monitor_task.done():
+            status = "reconnecting"
+        else:
+            status = "disconnected"
+        return {
+            "status": status,
+            "url": self.redis_url,
+            "last_error": self._last_error,
+            "reconnects": self._reconnects,
+            "pool": self.pool_stats(),
+            "near_cache": self.near_cache.stats() if self.near_cache is not None else None,
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit rate, latency, value sizes and TTLs per key namespace since startup."""
+        return {ns: stats.summary() for ns, stats in sorted(self._namespace_stats.items())}
+
+    def _namespace(self, key: str) -> str:
+        namespace = key.split(":", 1)[0] if ":" in key else "default"
+        if namespace not in self._namespace_stats and len(self._namespace_stats) >= self.max_namespaces:
+            return "other"  # keep label cardinality bounded
+        return namespace
+
+    def _record(
+        self,
+        operation: str,
+        started: float,
+        outcomes: Iterable[tuple],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+    ) -> None:
+        """
+        Account one call.
+
+        Args:
+            operation: Method name, used as the metric label
+            started: time.perf_counter() when the call began
+            outcomes: (key, result, encoded size or None) per key; result is
+                hit or miss for reads, ok for writes, or error
+            ttl: TTL of the values written, or TTLs by key
+        """
+        if not self.instrument:
+            return
+        from src.api.metrics import record_cache_hit_ratio, record_cache_operation
+
+        duration = time.perf_counter() - started
+        grouped: Dict[str, List[tuple]] = {}
+        for key, result, size in outcomes:
+            grouped.setdefault(self._namespace(key), []).append((key, result, size))
+
+        for namespace, items in grouped.items():
+            stats = self._namespace_stats.get(namespace)
+            if stats is None:
+                stats = self._namespace_stats[namespace] = _NamespaceStats()
+            results: Dict[str, int] = {}
+            read_sizes, write_sizes, ttls = [], [], []
+            for key, result, size in items:
+                results[result] = results.get(result, 0) + 1
+                if size is None:
+                    continue
+                if result == "hit":
+                    read_sizes.append(size)
+                else:
+                    write_sizes.append(size)
+                    key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                    ttls.append(key_ttl or self.default_ttl)
+
+            stats.hits += results.get("hit", 0)
+            stats.misses += results.get("miss", 0)
+            stats.errors += results.get("error", 0)
+            stats.operations += 1
+            stats.latency += duration
+            stats.reads += len(read_sizes)
+            stats.read_bytes += sum(read_sizes)
+            stats.writes += len(write_sizes)
+            stats.write_bytes += sum(write_sizes)
+            stats.ttl_total += sum(ttls)
+
+            record_cache_operation(operation, namespace, results, duration, read_sizes, write_sizes, ttls)
+            lookups = stats.hits + stats.misses
+            if lookups and ("hit" in results or "miss" in results):
+                record_cache_hit_ratio(namespace, stats.hits / lookups)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connections in use and idle in the client's pool."""
+        pool = getattr(self._client, "connection_pool", None)
+        if pool is None:
+            return {"in_use": 0, "idle": 0, "max": self.max_connections}
+        return {
+            "in_use": len(getattr(pool, "_in_use_connections", ())),
+            "idle": len(getattr(pool, "_available_connections", ())),
+            "max": pool.max_connections or self.max_connections,
+        }
 
     async def connect(self) -> None:
-        """Establish Redis connection with retry logic."""
+        """
+        Connect to Redis and start the connection monitor.
+
+        A failed first attempt does not raise: the service degrades to
+        cache misses and keeps reconnecting in the background.
+        """
         if self._client is None:
-            max_retries = 3
-            retry_delay = 1.0
+            try:
+                await self._open()
+                logger.info(f"Connected to Redis at {self.redis_url}")
+            except Exception as e:
+                logger.error(f"Failed to connect to Redis at {self.redis_url}: {e}. Retrying in background")
+                self._mark_unhealthy(e)
+        self._start_monitor()
+        if self.near_cache is not None:
+            self.near_cache.start()
+
+    async def _open(self) -> None:
+        """Create a client with the configured pool and check it answers."""
+        # Raw bytes: encoded values are binary
+        client = redis.from_url(
+            self.redis_url,
+            max_connections=self.max_connections,
+            socket_timeout=self.socket_timeout,
+            socket_connect_timeout=self.socket_connect_timeout,
+            health_check_interval=self.health_check_interval,
+            retry_on_timeout=True,
+        )
+        try:
+            await client.ping()
+        except Exception:
+            await client.close()
+            raise
+        self._client = client
+        self._healthy = True
+
+    def _start_monitor(self) -> None:
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor())
+
+    def _mark_unhealthy(self, error: Exception) -> None:
+        if self._healthy:
+            logger.warning(f"Redis connection lost: {error}")
+        self._healthy = False
+        self._last_error = str(error)
+        self._monitor_wakeup.set()
+        self._record_pool()
+
+    def _on_error(self, error: Exception) -> None:
+        """Start reconnecting if an operation failed because Redis is unreachable."""
+        if isinstance(error, (RedisConnectionError, RedisTimeoutError, OSError)):
+            self._mark_unhealthy(error)
+
+    def _record_pool(self) -> None:
+        try:
+            from src.api.metrics import record_redis_pool
+        except ImportError:
+            return
+        stats = self.pool_stats()
+        record_redis_pool(stats["in_use"], stats["idle"], stats["max"], self.available)
+
+    async def _monitor(self) -> None:
+        """Ping Redis periodically and reconnect with backoff when it is down."""
+        from src.api.metrics import record_redis_reconnect
+
+        delay = self.reconnect_min_delay
+        while True:
+            try:
+                if self.available:
+                    self._monitor_wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._monitor_wakeup.wait(), timeout=self.health_check_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    if not self.available:
+                        continue
+                    try:
+                        await self._client.ping()
+                    except Exception as e:
+                        self._mark_unhealthy(e)
+                        continue
+                    self._record_pool()
+                    continue
 
-            for attempt in range(max_retries):
                 try:
-                    self._client = redis.from_url(
-                        self.redis_url,
-                        encoding="utf-8",
-                        decode_responses=True
-                    )
-                    await self._client.ping()
-                    logger.info(f"Connected to Redis at {self.redis_url}")
-                    return
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"Redis connection attempt {attempt + 1}/{max_retries} failed: {e}. "
-                            f"Retrying in {retry_delay}s..."
-                        )
-                        import asyncio
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 2
+                    if self._client is None:
+                        await self._open()
                     else:
-                        logger.error(
-                            f"Failed to connect to Redis after {max_retries} attempts: {e}")
-                        self._client = None
-                        # Don't raise - allow graceful degradation
+                        await self._client.ping()
+                except Exception as e:
+                    self._last_error = str(e)
+                    record_redis_reconnect("failure")
+                    # Full jitter keeps replicas from reconnecting in lockstep
+                    await asyncio.sleep(random.uniform(delay / 2, delay))
+                    delay = min(delay * 2, self.reconnect_max_delay)
+                    continue
+
+                self._healthy = True
+                self._reconnects += 1
+                delay = self.reconnect_min_delay
+                record_redis_reconnect("success")
+                self._record_pool()
+                logger.info(f"Reconnected to Redis at {self.redis_url}")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Redis monitor error: {e}")
+                await asyncio.sleep(1)
 
     async def disconnect(self) -> None:
         """Close Redis connection."""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        if self.near_cache is not None:
+            await self.near_cache.stop()
         if self._client:
             await self._client.close()
             self._client = None
@@ -69,56 +477,449 @@ class CacheService:
         key_hash = hashlib.sha256(key_data.encode()).hexdigest()[:16]
         return f"{prefix}:{key_hash}"
 
+    def _near(self, key: str) -> Optional[NearCache]:
+        """The near-cache, if it is tracking and covers this key."""
+        near = self.near_cache
+        if near is not None and near.active and near.matches(key):
+            return near
+        return None
+
+    def _near_invalidate(self, keys: Iterable[str]) -> None:
+        """Drop keys this process wrote without waiting for Redis to report them."""
+        if self.near_cache is not None and self.near_cache.active:
+            self.near_cache.invalidate(keys)
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        """GET a raw value, answering from the near-cache when it holds the key."""
+        near = self._near(key)
+        if near is None:
+            return await self._client.get(key)
+        hit, raw = near.get(key)
+        if not hit:
+            sequence = near.sequence
+            raw = await self._client.get(key)
+            near.put(key, raw, sequence)
+        return raw
+
     async def get(self, key: str) -> Optional[Any]:
         """Get a value from cache."""
-        if not self._client:
+        if not self.available:
             return None
 
+        started = time.perf_counter()
         try:
-            value = await self._client.get(key)
+            value = await self._read(key)
             if value:
                 logger.debug(f"Cache HIT: {key}")
-                return json.loads(value)
+                decoded = self.codec.decode(value)
+                self._record("get", started, [(key, "hit", len(value))])
+                return decoded
             logger.debug(f"Cache MISS: {key}")
+            self._record("get", started, [(key, "miss", None)])
             return None
         except Exception as e:
             logger.warning(f"Cache get error: {e}")
+            self._on_error(e)
+            self._record("get", started, [(key, "error", None)])
             return None
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Set a value in cache with optional TTL."""
-        if not self._client:
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Set a value in cache with optional TTL and invalidation tags."""
+        if not self.available:
             return False
 
+        started = time.perf_counter()
         try:
             ttl = ttl or self.default_ttl
-            await self._client.setex(
-                key,
-                timedelta(seconds=ttl),
-                json.dumps(value)
-            )
+            data = self.codec.encode(value)
+            if tags:
+                pipe = self._client.pipeline(transaction=False)
+                pipe.setex(key, timedelta(seconds=ttl), data)
+                self._tag_key(pipe, key, tags, ttl)
+                await pipe.execute()
+            else:
+                await self._client.setex(
+                    key,
+                    timedelta(seconds=ttl),
+                    data
+                )
             logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
+            self._record("set", started, [(key, "ok", len(data))], ttl)
             return True
         except Exception as e:
             logger.warning(f"Cache set error: {e}")
+            self._on_error(e)
+            self._record("set", started, [(key, "error", None)])
             return False
+        finally:
+            self._near_invalidate([key])
+
+    def _tag_key(self, pipe, key: str, tags: Iterable[str], ttl: int) -> None:
+        """Queue recording a key under its tags, keeping each tag set alive as long as its longest entry."""
+        now = time.time()
+        for tag in tags:
+            tag_key = self.TAG_KEY.format(tag)
+            pipe.zadd(tag_key, {key: now + ttl})
+            pipe.zremrangebyscore(tag_key, "-inf", now)
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
 
     async def delete(self, key: str) -> bool:
         """Delete a value from cache."""
-        if not self._client:
+        if not self.available:
             return False
 
+        started = time.perf_counter()
         try:
             await self._client.delete(key)
             logger.debug(f"Cache DELETE: {key}")
+            self._record("delete", started, [(key, "ok", None)])
             return True
         except Exception as e:
             logger.warning(f"Cache delete error: {e}")
+            self._on_error(e)
+            self._record("delete", started, [(key, "error", None)])
             return False
+        finally:
+            self._near_invalidate([key])
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values with one MGET; missing keys are left out of the result."""
+        keys = list(keys)
+        if not self.available or not keys:
+            return {}
+
+        started = time.perf_counter()
+        try:
+            near = self.near_cache if self.near_cache is not None and self.near_cache.active else None
+            raw: Dict[str, Optional[bytes]] = {}
+            remote = keys
+            if near is not None:
+                remote = []
+                for key in keys:
+                    hit = False
+                    if near.matches(key):
+                        hit, raw[key] = near.get(key)
+                    if not hit:
+                        remote.append(key)
+            if remote:
+                sequence = near.sequence if near is not None else 0
+                values = await self._client.mget(remote)
+                for key, value in zip(remote, values):
+                    raw[key] = value
+                    if near is not None and near.matches(key):
+                        near.put(key, value, sequence)
+            found = {key: self.codec.decode(raw[key]) for key in keys if raw.get(key)}
+            logger.debug(f"Cache MGET: {len(found)}/{len(keys)} hits")
+            self._record("get_many", started, [
+                (key, "hit", len(raw[key])) if key in found else (key, "miss", None) for key in keys])
+            return found
+        except Exception as e:
+            logger.warning(f"Cache get_many error: {e}")
+            self._on_error(e)
+            self._record("get_many", started, [(key, "error", None) for key in keys])
+            return {}
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+    ) -> bool:
+        """
+        Set several values in one pipelined round trip.
+
+        Args:
+            items: Values by key
+            ttl: One TTL for every key, or TTLs by key (keys left out use
+                the default TTL)
+        """
+        if not self.available or not items:
+            return False
+
+        started = time.perf_counter()
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            sizes = {}
+            for key, value in items.items():
+                key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                data = self.codec.encode(value)
+                sizes[key] = len(data)
+                pipe.setex(key, timedelta(seconds=key_ttl or self.default_ttl), data)
+            await pipe.execute()
+            logger.debug(f"Cache SET: {len(items)} keys")
+            self._record("set_many", started, [(key, "ok", size) for key, size in sizes.items()], ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set_many error: {e}")
+            self._on_error(e)
+            self._record("set_many", started, [(key, "error", None) for key in items])
+            return False
+        finally:
+            self._near_invalidate(items)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys with one DEL, returning how many existed."""
+        keys = list(keys)
+        if not self.available or not keys:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            deleted = await self._client.delete(*keys)
+            logger.debug(f"Cache DELETE: {deleted}/{len(keys)} keys")
+            self._record("delete_many", started, [(key, "ok", None) for key in keys])
+            return deleted
+        except Exception as e:
+            logger.warning(f"Cache delete_many error: {e}")
+            self._on_error(e)
+            self._record("delete_many", started, [(key, "error", None) for key in keys])
+            return 0
+        finally:
+            self._near_invalidate(keys)
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[CachePipeline]:
+        """
+        Queue get/set/delete calls and send them together on exit.
+
+        Usage:
+            async with cache.pipeline() as pipe:
+                pipe.get("a").set("b", {"x": 1}, ttl=60).delete("c")
+            value, stored, deleted = pipe.results
+
+        Nothing is sent if the block raises.
+        """
+        pipe = CachePipeline(self)
+        yield pipe
+        await pipe.execute()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], Union[Any, Awaitable[Any]]],
+        soft_ttl: Optional[int] = None,
+        hard_ttl: Optional[int] = None,
+        beta: float = 1.0,
+    ) -> Any:
+        """
+        Get a value, computing and caching it with stale-while-revalidate.
+
+        Entries are fresh until soft_ttl and kept until hard_ttl. A stale
+        entry is returned immediately while a single background refresh
+        (one per key across processes, via a short Redis lock) recomputes it.
+        Before the soft expiry, XFetch refreshes early with a probability
+        that grows as expiry nears and with how long fn took last time, so
+        reloads of hot keys spread out instead of landing together. beta
+        above 1 refreshes earlier; 0 disables early refresh.
+
+        On a miss, concurrent callers in this process share one call to fn.
+        Errors from fn propagate on a miss and are logged for background
+        refreshes.
+
+        Keys used here hold an envelope around the value; read them with
+        get_or_compute rather than get.
+
+        Args:
+            key: Cache key
+            fn: Computes the value; may be sync or async
+            soft_ttl: Seconds the value counts as fresh (default_ttl by default)
+            hard_ttl: Seconds the value is kept at all (twice soft_ttl by default)
+            beta: XFetch early-refresh aggressiveness
+        """
+        soft_ttl = soft_ttl or self.default_ttl
+        hard_ttl = max(hard_ttl or soft_ttl * 2, soft_ttl)
+
+        entry = await self._get_entry(key)
+        if entry is None:
+            return await self._compute_shared(key, fn, soft_ttl, hard_ttl)
+
+        now = time.time()
+        stale = now >= entry["soft"]
+        # XFetch: recompute once now - delta * beta * ln(rand) passes the soft expiry
+        early = (
+            not stale and beta > 0 and entry["delta"] > 0
+            and now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["soft"]
+        )
+        if stale or early:
+            self._refresh_in_background(key, fn, soft_ttl, hard_ttl)
+        return entry["value"]
+
+    async def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.available:
+            return None
+        started = time.perf_counter()
+        try:
+            raw = await self._read(key)
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+            self._on_error(e)
+            self._record("get_or_compute", started, [(key, "error", None)])
+            return None
+        self._record("get_or_compute", started, [(key, "hit", len(raw)) if raw else (key, "miss", None)])
+        if not raw:
+            return None
+        try:
+            entry = self.codec.decode(raw)
+            return {"value": entry["value"], "soft": entry["soft"], "delta": entry["delta"]}
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring cache entry without refresh metadata: {key}")
+            return None
+
+    async def _compute_and_store(self, key: str, fn, soft_ttl: int, hard_ttl: int) -> Any:
+        started = time.perf_counter()
+        value = fn()
+        if inspect.isawaitable(value):
+            value = await value
+        delta = time.perf_counter() - started
+
+        if self.available:
+            entry = {"value": value, "soft": time.time() + soft_ttl, "delta": delta}
+            started = time.perf_counter()
+            try:
+                data = self.codec.encode(entry)
+                await self._client.setex(key, timedelta(seconds=hard_ttl), data)
+                logger.debug(f"Cache COMPUTE: {key} ({delta:.3f}s, soft {soft_ttl}s, hard {hard_ttl}s)")
+                self._record("compute", started, [(key, "ok", len(data))], hard_ttl)
+            except Exception as e:
+                logger.warning(f"Cache set error: {e}")
+                self._on_error(e)
+                self._record("compute", started, [(key, "error", None)])
+            finally:
+                self._near_invalidate([key])
+        return value
+
+    async def _compute_shared(self, key: str, fn, soft_ttl: int, hard_ttl: int) -> Any:
+        """Compute a missing value once for every concurrent caller in this process."""
+        pending = self._computing.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this caller was cancelled
+                # The caller computing the value was cancelled; take over
+                return await self._compute_shared(key, fn, soft_ttl, hard_ttl)
+
+        future = asyncio.get_running_loop().create_future()
+        self._computing[key] = future
+        try:
+            value = await self._compute_and_store(key, fn, soft_ttl, hard_ttl)
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; don't warn about it being unretrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if not future.done():
+                future.cancel()  # cancelled mid-compute; waiters retry
+            del self._computing[key]
+
+    def _refresh_in_background(self, key: str, fn, soft_ttl: int, hard_ttl: int) -> None:
+        if key in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._refresh(key, fn, soft_ttl, hard_ttl))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+
+    async def _refresh(self, key: str, fn, soft_ttl: int, hard_ttl: int) -> None:
+        """Recompute a stale entry unless another process already is."""
+        lock_key = f"{key}:refresh"
+        token = uuid4().hex
+        try:
+            if not await self._client.set(lock_key, token, nx=True, ex=max(1, min(hard_ttl, 60))):
+                return
+        except Exception as e:
+            logger.warning(f"Cache refresh lock error: {e}")
+            self._on_error(e)
+            return
+
+        try:
+            await self._compute_and_store(key, fn, soft_ttl, hard_ttl)
+            logger.debug(f"Cache REFRESH: {key}")
+        except Exception as e:
+            logger.warning(f"Cache refresh of {key} failed, serving stale value: {e}")
+        finally:
+            try:
+                # A refresh that outlived the lock must not release another process's
+                await self._client.eval(_RELEASE_LOCK, 1, lock_key, token)
+            except Exception:
+                pass
+
+    async def generation(self, namespace: str) -> int:
+        """Current generation of a namespace (0 until first invalidated)."""
+        if not self.available:
+            return 0
+        cached = self._generations.get(namespace)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        try:
+            generation = int(await self._client.get(self.GENERATION_KEY.format(namespace)) or 0)
+        except Exception as e:
+            logger.warning(f"Cache generation error: {e}")
+            self._on_error(e)
+            return 0
+        self._remember_generation(namespace, generation)
+        return generation
+
+    def _remember_generation(self, namespace: str, generation: int) -> None:
+        if self.generation_ttl > 0:
+            self._generations[namespace] = (generation, time.monotonic() + self.generation_ttl)
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        """Key for an entry in a namespace, tied to its current generation."""
+        return f"{namespace}:g{await self.generation(namespace)}:{key}"
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        """Invalidate every namespaced_key() entry of a namespace in O(1), returning the new generation."""
+        if not self.available:
+            return 0
+        try:
+            generation = await self._client.incr(self.GENERATION_KEY.format(namespace))
+            self._remember_generation(namespace, generation)
+            logger.info(f"Invalidated cache namespace '{namespace}' (generation {generation})")
+            return generation
+        except Exception as e:
+            logger.warning(f"Cache invalidate error: {e}")
+            self._on_error(e)
+            return 0
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry set with any of the tags, returning how many existed."""
+        if not self.available or not tags:
+            return 0
+
+        try:
+            tag_keys = [self.TAG_KEY.format(tag) for tag in tags]
+            tagged = await self._client.eval(_POP_TAGGED, len(tag_keys), *tag_keys, time.time())
+            deleted = 0
+            keys = list(dict.fromkeys(tagged))
+            for start in range(0, len(keys), 500):
+                deleted += await self._client.delete(*keys[start:start + 500])
+                self._near_invalidate(keys[start:start + 500])
+            logger.info(f"Invalidated {deleted} cache entries tagged {', '.join(tags)}")
+            return deleted
+        except Exception as e:
+            logger.warning(f"Cache invalidate error: {e}")
+            self._on_error(e)
+            return 0
 
     async def clear_prefix(self, prefix: str) -> int:
-        """Clear all keys with a given prefix."""
-        if not self._client:
+        """
+        Clear all keys with a given prefix.
+
+        This scans the whole keyspace; prefer invalidate_namespace() or
+        invalidate_tags() for entries written with them.
+        """
+        if not self.available:
             return 0
 
         try:
@@ -129,12 +930,14 @@ class CacheService:
                 if keys:
                     await self._client.delete(*keys)
                     deleted += len(keys)
+                    self._near_invalidate(keys)
                 if cursor == 0:
                     break
             logger.info(f"Cleared {deleted} keys with prefix '{prefix}'")
             return deleted
         except Exception as e:
             logger.warning(f"Cache clear error: {e}")
+            self._on_error(e)
             return 0
 
 
@@ -142,6 +945,18 @@ class CacheService:
 _cache_service: Optional[CacheService] = None
 
 
+def cache_stats() -> Dict[str, Any]:
+    """Per-namespace summary of the global cache service, without connecting it."""
+    if _cache_service is None:
+        return {"available": False, "namespaces": {}, "near_cache": None}
+    near = _cache_service.near_cache
+    return {
+        "available": _cache_service.available,
+        "namespaces": _cache_service.stats(),
+        "near_cache": near.stats() if near is not None else None,
+    }
+
+
 async def get_cache_service() -> CacheService:
     """Get or create the global cache service."""
     global _cache_service
@@ -0,0 +1,549 @@
+"""
+Background Job Queue for KOSMOS.
+Durable job storage (Redis or in-memory) with a tenant-fair worker pool,
+retries with exponential backoff and queue depth/age visibility.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from src.services.retry import RetryConfig
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., Awaitable[Any]]
+DeadLetterHandler = Callable[["Job"], Awaitable[None]]
+
+
+@dataclass
+class Job:
+    """A unit of background work."""
+    name: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    tenant: str = "default"
+    id: str = field(default_factory=lambda: str(uuid4()))
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    available_at: float = 0.0
+    last_error: Optional[str] = None
+
+    def to_json(self) -> str:
+        """Serialize job to JSON."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "Job":
+        """Deserialize job from JSON."""
+        return cls(**json.loads(data))
+
+
+class BaseJobQueue(ABC):
+    """Abstract base class for job queue backends."""
+
+    def __init__(self, visibility_timeout: float = 300.0, poll_interval: float = 0.5):
+        # Jobs leased longer than this are assumed lost and handed out again
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+
+    async def connect(self) -> None:
+        """Connect to the backing store."""
+
+    async def disconnect(self) -> None:
+        """Disconnect from the backing store."""
+
+    @abstractmethod
+    async def enqueue(self, job: Job) -> None:
+        """Add a job to the queue."""
+
+    @abstractmethod
+    async def _try_dequeue(self) -> Optional[Job]:
+        """Lease the next job, rotating fairly between tenants."""
+
+    @abstractmethod
+    async def ack(self, job: Job) -> None:
+        """Mark a leased job as completed."""
+
+    @abstractmethod
+    async def retry(self, job: Job, delay: float) -> None:
+        """Return a leased job to the queue after a delay."""
+
+    @abstractmethod
+    async def dead_letter(self, job: Job) -> None:
+        """Move a leased job to the dead-letter list."""
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, Any]:
+        """Return queue depth and job age statistics."""
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[Job]:
+        """Wait up to timeout seconds for the next job."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self._try_dequeue()
+            if job is not None or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+
+class InMemoryJobQueue(BaseJobQueue):
+    """In-process job queue for tests and single-node development."""
+
+    def __init__(self, visibility_timeout: float = 300.0, poll_interval: float = 0.05):
+        super().__init__(visibility_timeout, poll_interval)
+        self._ready: "OrderedDict[str, deque[Job]]" = OrderedDict()
+        self._delayed: Dict[str, Job] = {}
+        self._inflight: Dict[str, tuple[Job, float]] = {}
+        self._dead: List[Job] = []
+
+    def _push_ready(self, job: Job) -> None:
+        self._ready.setdefault(job.tenant, deque()).append(job)
+
+    def _promote(self, now: float) -> None:
+        """Move due retries and expired leases back to the ready queues."""
+        for job_id, job in list(self._delayed.items()):
+            if job.available_at <= now:
+                del self._delayed[job_id]
+                self._push_ready(job)
+        for job_id, (job, lease_deadline) in list(self._inflight.items()):
+            if lease_deadline <= now:
+                del self._inflight[job_id]
+                self._push_ready(job)
+
+    async def enqueue(self, job: Job) -> None:
+        if job.available_at > time.time():
+            self._delayed[job.id] = job
+        else:
+            self._push_ready(job)
+
+    async def _try_dequeue(self) -> Optional[Job]:
+        now = time.time()
+        self._promote(now)
+
+        while self._ready:
+            tenant, jobs = next(iter(self._ready.items()))
+            if not jobs:
+                del self._ready[tenant]
+                continue
+            # Rotate the tenant to the back so the next dequeue serves another tenant
+            self._ready.move_to_end(tenant)
+            job = jobs.popleft()
+            self._inflight[job.id] = (job, now + self.visibility_timeout)
+            return job
+        return None
+
+    async def ack(self, job: Job) -> None:
+        self._inflight.pop(job.id, None)
+
+    async def retry(self, job: Job, delay: float) -> None:
+        self._inflight.pop(job.id, None)
+        job.available_at = time.time() + delay
+        await self.enqueue(job)
+
+    async def dead_letter(self, job: Job) -> None:
+        self._inflight.pop(job.id, None)
+        self._dead.append(job)
+
+    async def stats(self) -> Dict[str, Any]:
+        pending = [job for jobs in self._ready.values() for job in jobs]
+        pending += list(self._delayed.values())
+        pending += [job for job, _ in self._inflight.values()]
+        oldest = min((job.enqueued_at for job in pending), default=None)
+
+        return {
+            "ready": sum(len(jobs) for jobs in self._ready.values()),
+            "delayed": len(self._delayed),
+            "in_flight": len(self._inflight),
+            "dead": len(self._dead),
+            "by_tenant": {tenant: len(jobs) for tenant, jobs in self._ready.items() if jobs},
+            "oldest_job_age_seconds": time.time() - oldest if oldest else 0.0,
+        }
+
+
+# Lua helpers shared by the Redis scripts. Keys are derived from the prefix in
+# ARGV[1], so the queue expects a single (non-cluster) Redis node.
+_LUA_PUSH_READY = """
+local function push_ready(prefix, tenant, job_id)
+    redis.call('RPUSH', prefix .. 'ready:' .. tenant, job_id)
+    if redis.call('SADD', prefix .. 'tenant_set', tenant) == 1 then
+        redis.call('RPUSH', prefix .. 'tenants', tenant)
+    end
+end
+"""
+
+_LUA_ENQUEUE = _LUA_PUSH_READY + """
+local prefix, job_id, data, tenant = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local enqueued_at, available_at, now = tonumber(ARGV[5]), tonumber(ARGV[6]), tonumber(ARGV[7])
+redis.call('HSET', prefix .. 'data', job_id, data)
+redis.call('ZADD', prefix .. 'enqueued', enqueued_at, job_id)
+if available_at > now then
+    redis.call('ZADD', prefix .. 'delayed', available_at, job_id)
+else
+    push_ready(prefix, tenant, job_id)
+end
+return 1
+"""
+
+_LUA_DEQUEUE = _LUA_PUSH_READY + """
+local prefix, now, lease = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+
+-- Promote due retries and leases abandoned by crashed workers
+for _, source in ipairs({'delayed', 'inflight'}) do
+    local due = redis.call('ZRANGEBYSCORE', prefix .. source, '-inf', now, 'LIMIT', 0, 100)
+    for _, job_id in ipairs(due) do
+        redis.call('ZREM', prefix .. source, job_id)
+        local data = redis.call('HGET', prefix .. 'data', job_id)
+        if data then
+            push_ready(prefix, cjson.decode(data)['tenant'], job_id)
+        end
+    end
+end
+
+-- Round-robin across tenants with ready jobs
+local tenants = redis.call('LLEN', prefix .. 'tenants')
+for _ = 1, tenants do
+    local tenant = redis.call('LMOVE', prefix .. 'tenants', prefix .. 'tenants', 'LEFT', 'RIGHT')
+    if not tenant then
+        return nil
+    end
+    local job_id = redis.call('LPOP', prefix .. 'ready:' .. tenant)
+    if job_id then
+        redis.call('ZADD', prefix .. 'inflight', now + lease, job_id)
+        return redis.call('HGET', prefix .. 'data', job_id)
+    end
+    redis.call('LREM', prefix .. 'tenants', 1, tenant)
+    redis.call('SREM', prefix .. 'tenant_set', tenant)
+end
+return nil
+"""
+
+
+class RedisJobQueue(BaseJobQueue):
+    """Redis-backed job queue; jobs survive API and worker restarts."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "kosmos:jobs:",
+        visibility_timeout: float = 300.0,
+        poll_interval: float = 0.5,
+    ):
+        super().__init__(visibility_timeout, poll_interval)
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.key_prefix = key_prefix
+        self._redis = None
+        self._enqueue_script = None
+        self._dequeue_script = None
+
+    async def connect(self) -> None:
+        """Connect to Redis."""
+        import redis.asyncio as aioredis
+
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        self._enqueue_script = self._redis.register_script(_LUA_ENQUEUE)
+        self._dequeue_script = self._redis.register_script(_LUA_DEQUEUE)
+        logger.info(f"Redis job queue connected at {self.redis_url}")
+
+    async def disconnect(self) -> None:
+        """Disconnect from Redis."""
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _key(self, name: str) -> str:
+        return f"{self.key_prefix}{name}"
+
+    async def enqueue(self, job: Job) -> None:
+        await self._enqueue_script(args=[
+            self.key_prefix, job.id, job.to_json(), job.tenant,
+            job.enqueued_at, job.available_at, time.time(),
+        ])
+
+    async def _try_dequeue(self) -> Optional[Job]:
+        data = await self._dequeue_script(args=[
+            self.key_prefix, time.time(), self.visibility_timeout,
+        ])
+        return Job.from_json(data) if data else None
+
+    async def ack(self, job: Job) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key("inflight"), job.id)
+            pipe.zrem(self._key("enqueued"), job.id)
+            pipe.hdel(self._key("data"), job.id)
+            await pipe.execute()
+
+    async def retry(self, job: Job, delay: float) -> None:
+        job.available_at = time.time() + delay
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key("data"), job.id, job.to_json())
+            pipe.zrem(self._key("inflight"), job.id)
+            pipe.zadd(self._key("delayed"), {job.id: job.available_at})
+            await pipe.execute()
+
+    async def dead_letter(self, job: Job) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._key("data"), job.id, job.to_json())
+            pipe.zrem(self._key("inflight"), job.id)
+            pipe.zrem(self._key("enqueued"), job.id)
+            pipe.rpush(self._key("dead"), job.id)
+            await pipe.execute()
+
+    async def stats(self) -> Dict[str, Any]:
+        tenants = sorted(await self._redis.smembers(self._key("tenant_set")))
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tenant in tenants:
+                pipe.llen(self._key(f"ready:{tenant}"))
+            pipe.zcard(self._key("delayed"))
+            pipe.zcard(self._key("inflight"))
+            pipe.llen(self._key("dead"))
+            pipe.zrange(self._key("enqueued"), 0, 0, withscores=True)
+            results = await pipe.execute()
+
+        by_tenant = {t: n for t, n in zip(tenants, results[:len(tenants)]) if n}
+        delayed, inflight, dead, oldest = results[len(tenants):]
+
+        return {
+            "ready": sum(by_tenant.values()),
+            "delayed": delayed,
+            "in_flight": inflight,
+            "dead": dead,
+            "by_tenant": by_tenant,
+            "oldest_job_age_seconds": time.time() - oldest[0][1] if oldest else 0.0,
+        }
+
+
+async def create_job_queue(backend: str = "redis", **kwargs) -> BaseJobQueue:
+    """Create and connect a job queue instance."""
+    if backend == "redis":
+        queue = RedisJobQueue(**kwargs)
+    elif backend == "memory":
+        queue = InMemoryJobQueue(**kwargs)
+    else:
+        raise ValueError(f"Unknown job queue backend: {backend}")
+
+    await queue.connect()
+    return queue
+
+
+class JobWorkerPool:
+    """
+    Pool of async workers draining a job queue.
+
+    Failed jobs are retried with exponential backoff according to the retry
+    config and dead-lettered once max_retries is exhausted.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[BaseJobQueue] = None,
+        concurrency: int = 4,
+        retry_config: Optional[RetryConfig] = None,
+        stats_interval: float = 15.0,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.retry_config = retry_config or RetryConfig(
+            max_retries=3, initial_delay=2.0, max_delay=60.0)
+        self.stats_interval = stats_interval
+        self._handlers: Dict[str, JobHandler] = {}
+        self._dead_letter_handlers: Dict[str, DeadLetterHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._busy = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether workers are currently draining the queue."""
+        return bool(self._tasks)
+
+    def register(
+        self,
+        name: str,
+        handler: JobHandler,
+        on_dead_letter: Optional[DeadLetterHandler] = None,
+    ) -> None:
+        """
+        Register the coroutine that processes jobs with the given name.
+
+        on_dead_letter, if given, is awaited with the job once it has
+        exhausted its retries.
+        """
+        self._handlers[name] = handler
+        if on_dead_letter is not None:
+            self._dead_letter_handlers[name] = on_dead_letter
+
+    async def submit(
+        self,
+        name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        tenant: str = "default",
+    ) -> Job:
+        """Enqueue a new job."""
+        if name not in self._handlers:
+            raise ValueError(f"No handler registered for job '{name}'")
+        job = Job(name=name, payload=payload or {}, tenant=tenant)
+        await self.queue.enqueue(job)
+        return job
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        if self.running:
+            return
+        if self.queue is None:
+            raise RuntimeError("Job queue not configured")
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._report_stats()))
+        logger.info(f"Job worker pool started with {self.concurrency} workers")
+
+    async def stop(self) -> None:
+        """Stop the worker tasks. Jobs leased but unfinished are re-delivered later."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Job worker pool stopped")
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return queue statistics together with worker utilization."""
+        stats = await self.queue.stats() if self.queue else {}
+        stats["workers"] = self.concurrency if self.running else 0
+        stats["busy_workers"] = self._busy
+        return stats
+
+    def _backoff(self, attempts: int) -> float:
+        config = self.retry_config
+        return min(
+            config.initial_delay * (config.exponential_base ** (attempts - 1)),
+            config.max_delay,
+        )
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await self.queue.dequeue(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {index} dequeue error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if job is not None:
+                self._busy += 1
+                try:
+                    await self._run(job)
+                finally:
+                    self._busy -= 1
+
+    async def _run(self, job: Job) -> None:
+        from src.api.metrics import record_job
+
+        handler = self._handlers.get(job.name)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job '{job.name}'")
+            await handler(**job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.attempts += 1
+            job.last_error = str(e)
+            if job.attempts > self.retry_config.max_retries:
+                logger.error(f"Job {job.id} ({job.name}) failed permanently: {e}")
+                await self.queue.dead_letter(job)
+                record_job(job.name, "dead")
+                on_dead_letter = self._dead_letter_handlers.get(job.name)
+                if on_dead_letter is not None:
+                    try:
+                        await on_dead_letter(job)
+                    except Exception as hook_error:
+                        logger.error(f"Dead-letter handler for job {job.id} ({job.name}) failed: {hook_error}")
+            else:
+                delay = self._backoff(job.attempts)
+                logger.warning(
+                    f"Job {job.id} ({job.name}) attempt {job.attempts} failed: {e}. "
+                    f"Retrying in {delay:.1f}s..."
+                )
+                await self.queue.retry(job, delay)
+                record_job(job.name, "retried")
+            return
+
+        await self.queue.ack(job)
+        record_job(job.name, "succeeded")
+
+    async def _report_stats(self) -> None:
+        from src.api.metrics import record_job_queue_stats
+
+        while True:
+            try:
+                record_job_queue_stats(await self.queue.stats())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job queue stats error: {e}")
+            await asyncio.sleep(self.stats_interval)
+
+
+def instance_key_prefix() -> str:
+    """
+    Redis key prefix for this API instance's job queue.
+
+    Job payloads refer to state held in the enqueuing process (e.g. voting
+    proposals), so each instance drains only its own queue. Set
+    JOB_QUEUE_INSTANCE to a name that is stable across restarts; it
+    defaults to the hostname.
+    """
+    instance = os.getenv("JOB_QUEUE_INSTANCE") or socket.gethostname()
+    return f"kosmos:jobs:{instance}:"
+
+
+# Global worker pool instance
+_worker_pool: Optional[JobWorkerPool] = None
+
+
+def get_worker_pool() -> JobWorkerPool:
+    """Get or create the global worker pool (handlers register at import time)."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = JobWorkerPool(
+            concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "4")),
+            retry_config=RetryConfig(
+                max_retries=int(os.getenv("JOB_MAX_RETRIES", "3")),
+                initial_delay=float(os.getenv("JOB_RETRY_DELAY_SECONDS", "2")),
+                max_delay=60.0,
+            ),
+        )
+    return _worker_pool
+
+
+async def start_worker_pool() -> JobWorkerPool:
+    """Connect the configured job queue and start the global worker pool."""
+    pool = get_worker_pool()
+    if pool.queue is None:
+        backend = os.getenv("JOB_QUEUE_BACKEND", "memory")
+        kwargs = {"visibility_timeout": float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300"))}
+        if backend == "redis":
+            kwargs["key_prefix"] = instance_key_prefix()
+        pool.queue = await create_job_queue(backend, **kwargs)
+    await pool.start()
+    return pool
+
+
+async def stop_worker_pool() -> None:
+    """Stop the global worker pool and disconnect its queue."""
+    global _worker_pool
+    if _worker_pool:
+        await _worker_pool.stop()
+        if _worker_pool.queue:
+            await _worker_pool.queue.disconnect()
+        _worker_pool.queue = None
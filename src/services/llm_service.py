@@ -4,6 +4,7 @@ Provides unified interface for OpenAI, Anthropic, and local models.
 """
 
 import os
+import time
 import logging
 import hashlib
 import json
@@ -60,6 +61,7 @@ class LLMService:
         self.config = config or self._default_config()
         self._client = None
         self._cache = None
+        self._cache_retry_at = 0.0
         logger.info(
             f"LLM Service initialized with provider: {self.config.provider.value}")
 
@@ -109,15 +111,18 @@ class LLMService:
             )
 
     async def _get_cache(self):
-        """Get cache service instance."""
-        if self._cache is None and self.config.enable_cache:
+        """Get the cache service while it is connected, or None."""
+        if not self.config.enable_cache:
+            return None
+        if self._cache is None and time.monotonic() >= self._cache_retry_at:
             try:
                 from src.services.cache_service import get_cache_service
                 self._cache = await get_cache_service()
             except Exception as e:
                 logger.warning(f"Cache unavailable: {e}")
-                self._cache = False  # Mark as unavailable
-        return self._cache if self._cache else None
+                self._cache_retry_at = time.monotonic() + 30  # Try again later
+        # The cache service reconnects on its own; skip it while it is down
+        return self._cache if self._cache is not None and self._cache.available else None
 
     def _generate_cache_key(self, messages: List[Message], system_prompt: str, model: str) -> str:
         """Generate a cache key for the LLM request."""
@@ -128,7 +133,21 @@ class LLMService:
         }
         key_hash = hashlib.sha256(json.dumps(
             key_data, sort_keys=True).encode()).hexdigest()[:24]
-        return f"llm:chat:{key_hash}"
+        return f"chat:{key_hash}"
+
+    async def invalidate_cache(self, model: Optional[str] = None) -> int:
+        """
+        Drop cached LLM responses: those for one model, or all of them.
+
+        Returns the number of entries deleted for a model, or the new cache
+        generation when invalidating everything.
+        """
+        cache = await self._get_cache()
+        if not cache:
+            return 0
+        if model:
+            return await cache.invalidate_tags(f"llm:model:{model}")
+        return await cache.invalidate_namespace("llm")
 
     async def _get_openai_client(self):
         """Get or create OpenAI client."""
@@ -176,11 +195,14 @@ class LLMService:
         if use_cache and self.config.enable_cache and temp < 0.3:
             cache = await self._get_cache()
             if cache:
-                cache_key = self._generate_cache_key(
-                    messages, sys_prompt, self.config.model)
+                cache_key = await cache.namespaced_key("llm", self._generate_cache_key(
+                    messages, sys_prompt, self.config.model))
                 cached = await cache.get(cache_key)
                 if cached:
+                    from src.api.metrics import record_llm_cache_hit
+
                     logger.info(f"LLM cache hit: {cache_key}")
+                    record_llm_cache_hit(self.config.provider.value)
                     return LLMResponse(
                         content=cached["content"],
                         model=cached["model"],
@@ -213,7 +235,8 @@ class LLMService:
                         "usage": response.usage,
                         "finish_reason": response.finish_reason,
                     },
-                    ttl=self.config.cache_ttl
+                    ttl=self.config.cache_ttl,
+                    tags=[f"llm:model:{self.config.model}"],
                 )
                 logger.debug(f"LLM response cached: {cache_key}")
 
@@ -0,0 +1,192 @@
+"""
+Process-local near-cache for CacheService, kept coherent by Redis
+server-assisted client-side caching.
+
+A dedicated connection turns on broadcast tracking for the configured key
+prefixes (CLIENT TRACKING ON BCAST PREFIX ... REDIRECT <id>), redirecting
+invalidations to a second connection subscribed to __redis__:invalidate.
+Redis then publishes the name of every key written under those prefixes, or
+nothing at all on FLUSHDB/FLUSHALL, and the matching local entries are
+dropped. The RESP2 redirect form is used because redis.asyncio has no
+RESP3 push-message support.
+
+Entries hold the raw encoded bytes (or None for a key Redis does not have),
+so callers always get a freshly decoded copy. Whenever tracking is not
+established, including after either connection drops, the near-cache is
+cleared and bypassed: invalidations may have been missed.
+"""
+import asyncio
+import logging
+import random
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+_MISSING = object()
+
+
+class NearCache:
+    """Bounded LRU of tracked keys, invalidated by Redis."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefixes: List[str],
+        max_entries: int = 1024,
+        ping_interval: float = 5.0,
+        reconnect_max_delay: float = 30.0,
+    ):
+        if not prefixes:
+            raise ValueError("A near-cache needs at least one key prefix to track")
+        self.redis_url = redis_url
+        self.prefixes = tuple(prefixes)
+        self.max_entries = max_entries
+        self.ping_interval = ping_interval
+        self.reconnect_max_delay = reconnect_max_delay
+        self.active = False
+        # Bumped by every invalidation; a read started before a bump is not stored
+        self.sequence = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Optional[bytes]]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def matches(self, key: str) -> bool:
+        """Whether a key falls under a tracked prefix."""
+        return key.startswith(self.prefixes)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "active": self.active,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def get(self, key: str) -> Tuple[bool, Optional[bytes]]:
+        """Look a key up, returning (hit, raw value)."""
+        from src.api.metrics import record_near_cache_lookup
+
+        try:
+            raw = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            record_near_cache_lookup(hit=False)
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        record_near_cache_lookup(hit=True)
+        return True, raw
+
+    def put(self, key: str, raw: Optional[bytes], sequence: int) -> None:
+        """Store what Redis returned for a key, unless an invalidation arrived since `sequence`."""
+        if not self.active or sequence != self.sequence:
+            return
+        self._entries[key] = raw
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Optional[Iterable[Any]]) -> None:
+        """Drop keys (str or bytes), or everything when keys is None."""
+        from src.api.metrics import record_near_cache_invalidations
+
+        self.sequence += 1
+        if keys is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+        else:
+            dropped = 0
+            for key in keys:
+                if isinstance(key, bytes):
+                    key = key.decode()
+                if self._entries.pop(key, _MISSING) is not _MISSING:
+                    dropped += 1
+        record_near_cache_invalidations(dropped, len(self._entries))
+
+    def clear(self) -> None:
+        self.invalidate(None)
+
+    def start(self) -> None:
+        """Establish tracking in the background, re-establishing it whenever it breaks."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.active = False
+        self.clear()
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self._track()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.active:
+                    logger.warning(f"Near-cache tracking lost, bypassing it until restored: {e}")
+                else:
+                    logger.warning(f"Near-cache tracking unavailable: {e}")
+            self.active = False
+            self.clear()
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _track(self) -> None:
+        """Set up tracking, then apply invalidations until a connection fails."""
+        name = f"kosmos-near-{uuid4().hex[:12]}"
+        listener = redis.from_url(self.redis_url, client_name=name)
+        tracker = redis.from_url(self.redis_url, single_connection_client=True)
+        pubsub = listener.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATE_CHANNEL)
+            listener_id = next(
+                (c["id"] for c in await tracker.client_list() if c.get("name") == name), None)
+            if listener_id is None:
+                raise RuntimeError("could not find the invalidation listener connection")
+
+            args = ["CLIENT", "TRACKING", "ON", "REDIRECT", listener_id, "BCAST"]
+            for prefix in self.prefixes:
+                args += ["PREFIX", prefix]
+            await tracker.execute_command(*args)
+
+            self.clear()
+            self.active = True
+            logger.info(f"Near-cache tracking {', '.join(self.prefixes)}")
+
+            while True:
+                message = await pubsub.get_message(timeout=self.ping_interval)
+                if message is None:
+                    # Both connections must stay up for tracking to hold
+                    await tracker.ping()
+                    await pubsub.ping()
+                    continue
+                if message["type"] == "message":
+                    data = message["data"]
+                    self.invalidate(None if data is None else data if isinstance(data, list) else [data])
+        finally:
+            self.active = False
+            for closer in (pubsub.aclose, tracker.aclose, listener.aclose):
+                try:
+                    await closer()
+                except Exception:
+                    pass
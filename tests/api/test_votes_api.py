@@ -3,6 +3,7 @@ Integration tests for the Votes API router.
 Tests the Pentarchy voting system end-to-end.
 """
 import pytest
+from datetime import timedelta
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 import sys
@@ -12,6 +13,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.main import app
+from src.api.routers import votes as _votes
 
 
 @pytest.fixture
@@ -148,6 +150,16 @@ class TestVotingStats:
         assert "total_proposals" in data
         assert "by_status" in data
 
+    def test_get_queue_stats(self, client):
+        """Should report whether the vote collection queue is enabled."""
+        response = client.get("/api/v1/votes/queue")
+
+        if response.status_code == 404:
+            pytest.skip("Votes router not registered")
+
+        assert response.status_code == 200
+        assert "enabled" in response.json()
+
 
 class TestManualVoting:
     """Tests for manual vote submission."""
@@ -219,3 +231,300 @@ class TestProposalResolution:
         
         if response.status_code == 404:
             pass  # Expected
+
+
+class TestVotingAggregates:
+    """Tests for the incrementally maintained stats and pending index."""
+
+    @pytest.fixture(autouse=True)
+    def no_background_votes(self):
+        """Keep new proposals pending by skipping background vote collection."""
+        with patch("src.api.routers.votes._collect_votes", new=AsyncMock()):
+            yield
+
+    def _stats(self, client):
+        return client.get("/api/v1/votes/stats").json()
+
+    def test_stats_track_creation_votes_and_resolution(self, client, sample_proposal):
+        """Stats should follow proposals through voting and resolution."""
+        before = self._stats(client)
+
+        proposal_id = client.post(
+            "/api/v1/votes/proposals", json=sample_proposal).json()["proposal_id"]
+        created = self._stats(client)
+        assert created["total_proposals"] == before["total_proposals"] + 1
+        assert created["by_status"]["pending"] == before["by_status"]["pending"] + 1
+
+        for agent in ["athena", "athena", "hermes"]:
+            client.post(
+                f"/api/v1/votes/proposals/{proposal_id}/vote",
+                params={"agent": agent, "vote": "APPROVE", "score": 3.0},
+                json=["ok"],
+            )
+        voted = self._stats(client)
+        # A repeated vote from the same agent replaces the earlier one
+        assert voted["total_votes"] == created["total_votes"] + 2
+
+        client.post(f"/api/v1/votes/proposals/{proposal_id}/resolve")
+        resolved = self._stats(client)
+        assert resolved["by_status"]["pending"] == before["by_status"]["pending"]
+        assert resolved["by_status"]["approved"] == before["by_status"]["approved"] + 1
+
+        proposals = list(_votes._proposals.values())
+        expected_avg = sum(p["final_score"] or 0 for p in proposals) / len(proposals)
+        assert resolved["average_score"] == pytest.approx(expected_avg)
+        assert resolved["total_votes"] == sum(len(p["votes"]) for p in proposals)
+
+    def test_pending_is_newest_first_and_paginated(self, client, sample_proposal):
+        """Pending proposals should be returned newest first with paging."""
+        ids = [
+            client.post("/api/v1/votes/proposals", json=sample_proposal).json()["proposal_id"]
+            for _ in range(3)
+        ]
+
+        page = client.get("/api/v1/votes/pending", params={"limit": 2}).json()
+        assert [p["proposal_id"] for p in page] == ids[::-1][:2]
+
+        client.post(f"/api/v1/votes/proposals/{ids[-1]}/resolve")
+        pending_ids = [p["proposal_id"] for p in client.get("/api/v1/votes/pending").json()]
+        assert ids[-1] not in pending_ids
+        assert pending_ids[:2] == [ids[1], ids[0]]
+
+
+class TestVoteCollectionJobs:
+    """Tests for queuing vote collection on the job worker pool."""
+
+    async def test_unknown_proposal_job_fails(self):
+        """A job for a proposal this process does not hold must not be acked."""
+        with pytest.raises(LookupError):
+            await _votes._collect_votes_job("not-held-here")
+
+    async def test_queued_job_dead_letters_unknown_proposal(self):
+        from src.services.job_queue import InMemoryJobQueue, JobWorkerPool
+        from src.services.retry import RetryConfig
+
+        queue = InMemoryJobQueue()
+        pool = JobWorkerPool(queue, retry_config=RetryConfig(max_retries=0))
+        pool.register(_votes.VOTE_COLLECTION_JOB, _votes._collect_votes_job)
+        await pool.submit(_votes.VOTE_COLLECTION_JOB, {"proposal_id": "not-held-here"})
+        await pool._run(await queue.dequeue(timeout=0.1))
+
+        assert (await queue.stats())["dead"] == 1
+        assert "not held" in queue._dead[0].last_error
+
+    def test_dead_lettered_job_escalates_proposal(self, client, sample_proposal):
+        """A proposal whose vote job exhausted its retries must not stay pending."""
+        import asyncio
+        from src.services.job_queue import Job
+
+        with patch("src.api.routers.votes._collect_votes", new=AsyncMock()):
+            proposal_id = client.post("/api/v1/votes/proposals", json=sample_proposal).json()["proposal_id"]
+
+        job = Job(name=_votes.VOTE_COLLECTION_JOB, payload={"proposal_id": proposal_id})
+        job.last_error = "agents unreachable"
+        asyncio.run(_votes._escalate_dead_vote_job(job))
+
+        proposal = _votes._proposals[proposal_id]
+        assert proposal["status"] == "escalated"
+        assert proposal["resolved_at"] is not None
+        assert proposal["context"]["vote_collection_error"] == "agents unreachable"
+        assert proposal_id not in _votes._pending
+
+    def test_submit_failure_falls_back_to_background(self, client, sample_proposal):
+        """A failing queue must not leave an orphaned pending proposal behind a 500."""
+        pool = _votes.get_worker_pool()
+        with patch.object(type(pool), "running", new=True), \
+                patch.object(pool, "submit", AsyncMock(side_effect=ConnectionError("redis down"))), \
+                patch("src.api.routers.votes._collect_votes", new=AsyncMock()) as collect:
+            response = client.post("/api/v1/votes/proposals", json=sample_proposal)
+
+        assert response.status_code == 200
+        collect.assert_awaited_once_with(response.json()["proposal_id"])
+
+
+class TestVoteEventEndpoints:
+    """Tests for the live voting progress endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def no_background_votes(self):
+        """Keep the event stream to proposal_created by skipping vote collection."""
+        with patch("src.api.routers.votes._collect_votes", new=AsyncMock()):
+            yield
+
+    def test_websocket_receives_proposal_events(self, client, sample_proposal):
+        with client.websocket_connect("/ws/votes") as ws:
+            assert ws.receive_json()["topic"] == "votes:*"
+            proposal_id = client.post(
+                "/api/v1/votes/proposals", json=sample_proposal).json()["proposal_id"]
+
+            event = ws.receive_json()
+            assert event["type"] == "proposal_created"
+            assert event["proposal_id"] == proposal_id
+
+    def test_chat_cannot_join_vote_topic(self, client, sample_proposal):
+        """A chat conversation named like a vote topic must not see vote events."""
+        with client.websocket_connect("/ws/votes") as votes_ws, \
+                client.websocket_connect("/ws/chat/votes:*") as chat_ws:
+            votes_ws.receive_json()
+            chat_ws.receive_json()
+            client.post("/api/v1/votes/proposals", json=sample_proposal)
+            assert votes_ws.receive_json()["type"] == "proposal_created"
+
+            chat_ws.send_json({"type": "typing"})
+            chat_ws.send_json({"type": "ping"})
+            assert chat_ws.receive_json()["type"] == "pong"
+
+            votes_ws.send_json({"type": "ping"})
+            assert votes_ws.receive_json()["type"] == "pong"
+
+    async def test_sse_streams_proposal_events(self):
+        import asyncio
+        from src.api.routers.websocket import proposal_topic, vote_events
+
+        response = await _votes.stream_vote_events(proposal_id="p-sse")
+        assert response.media_type == "text/event-stream"
+
+        stream = response.body_iterator
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        await vote_events.publish({"type": "vote_cast", "proposal_id": "other"})
+        await vote_events.publish({"type": "vote_cast", "proposal_id": "p-sse", "agent": "athena"})
+
+        chunk = await asyncio.wait_for(first, timeout=1)
+        assert chunk.startswith("event: vote_cast\n")
+        assert '"agent": "athena"' in chunk
+
+        await stream.aclose()
+        assert proposal_topic("p-sse") not in vote_events._queues
+
+    async def test_sse_sends_keep_alive(self):
+        import asyncio
+
+        with patch("src.api.routers.votes.SSE_KEEPALIVE_SECONDS", 0.01):
+            response = await _votes.stream_vote_events(proposal_id=None)
+            stream = response.body_iterator
+            chunk = await asyncio.wait_for(stream.__anext__(), timeout=1)
+            await stream.aclose()
+
+        assert chunk == ": keep-alive\n\n"
+
+
+class TestActionAnalysis:
+    """Tests for action analysis endpoints."""
+
+    @pytest.mark.parametrize("message,action_type,cost,risk", [
+        ("what is the weather", "general", 0.0, "low"),
+        ("buy a new laptop", "buy", 75.0, "medium"),
+        ("deploy the service, it costs about 20", "deploy", 20.0, "low"),
+        ("purchase licenses for $1,250.00", "purchase", 1250.0, "high"),
+        ("rotate the api key", "security", 100.0, "high"),
+        ("review the gdpr terms", "legal", 100.0, "high"),
+    ])
+    def test_classify_action(self, message, action_type, cost, risk):
+        """Messages should be classified by keyword and detected cost."""
+        analysis = _votes.classify_action(message)
+        assert analysis.action_type == action_type
+        assert analysis.estimated_cost == cost
+        assert analysis.risk_level == risk
+        assert analysis.requires_voting == (cost >= 50)
+
+    def test_batch_matches_single(self, client):
+        """Batch analysis should match the single-message endpoint in order."""
+        messages = ["hire a contractor", "send 300 usd", "summarize the notes"]
+        response = client.post("/api/v1/votes/analyze-action/batch", json={"messages": messages})
+
+        assert response.status_code == 200
+        singles = [
+            client.post("/api/v1/votes/analyze-action", json={"message": m}).json()
+            for m in messages
+        ]
+        assert response.json() == singles
+
+
+class TestAutoProposalDedup:
+    """Tests for deduplication of auto-generated proposals."""
+
+    @pytest.fixture(autouse=True)
+    def no_background_votes(self):
+        """Count vote collections instead of running them."""
+        with patch("src.api.routers.votes._collect_votes", new=AsyncMock()) as collect:
+            self.collect = collect
+            yield
+
+    def _auto(self, client, message, conversation_id="conv-dedup"):
+        return client.post(
+            "/api/v1/votes/auto-proposal",
+            json={"message": message, "conversation_id": conversation_id},
+        ).json()
+
+    def test_repeat_attaches_to_in_flight_proposal(self, client):
+        """A retried request should reuse the pending proposal without a new vote."""
+        first = self._auto(client, "Please buy a new laptop for the design team")
+        repeat = self._auto(client, "  please BUY a new laptop for the design team. ")
+
+        assert first["proposal_created"] is True
+        assert repeat["proposal_created"] is False
+        assert repeat["duplicate_of"] == first["proposal_id"]
+        assert self.collect.await_count == 1
+        assert _votes._proposals[first["proposal_id"]]["context"]["duplicate_requests"] == 1
+
+    def test_distinct_conversation_or_text_creates_new(self, client):
+        """Different conversations and different requests should not be merged."""
+        first = self._auto(client, "Deploy the staging service", conversation_id="conv-a")
+        other_conv = self._auto(client, "Deploy the staging service", conversation_id="conv-b")
+        other_text = self._auto(client, "Deploy the staging service for $500", conversation_id="conv-a")
+
+        ids = {first["proposal_id"], other_conv["proposal_id"], other_text["proposal_id"]}
+        assert len(ids) == 3
+
+    async def test_only_same_fingerprint_requests_are_serialized(self):
+        """Creating one auto-proposal must not block unrelated ones."""
+        import asyncio
+        from fastapi import BackgroundTasks
+
+        release = asyncio.Event()
+        entered = []
+
+        async def slow_create(message, conversation_id, analysis, background_tasks, current_user):
+            entered.append(message)
+            proposal_id = f"lock-test-{len(entered)}"
+            await release.wait()
+            _votes._proposals[proposal_id] = {
+                "id": proposal_id, "status": "pending", "resolved_at": None, "context": {}}
+            return {"proposal_created": True, "proposal_id": proposal_id}
+
+        def request(message):
+            return _votes.create_auto_proposal(
+                _votes.AutoProposalRequest(message=message, conversation_id="conv-lock"),
+                BackgroundTasks(), None)
+
+        with patch.object(_votes, "_create_auto_proposal", side_effect=slow_create):
+            tasks = [asyncio.create_task(request(m)) for m in (
+                "Buy a server rack for $400", "Buy a server rack for $400", "Renew the office lease for $900")]
+            for _ in range(20):
+                await asyncio.sleep(0)
+            # The repeat waits for the first; the unrelated request proceeds
+            assert sorted(entered) == ["Buy a server rack for $400", "Renew the office lease for $900"]
+            release.set()
+            first, repeat, other = await asyncio.gather(*tasks)
+
+        for result in (first, other):
+            _votes._proposals.pop(result["proposal_id"])
+        assert len(entered) == 2
+        assert repeat["duplicate_of"] == first["proposal_id"]
+        assert other["proposal_created"] is True
+        assert not _votes._auto_proposal_locks
+
+    def test_resolved_proposal_expires_after_window(self, client):
+        """Repeats after the window of a resolved proposal should start a new vote."""
+        first = self._auto(client, "Migrate the analytics database")
+        client.post(f"/api/v1/votes/proposals/{first['proposal_id']}/resolve")
+
+        recent = self._auto(client, "Migrate the analytics database")
+        assert recent["duplicate_of"] == first["proposal_id"]
+
+        resolved = _votes._proposals[first["proposal_id"]]
+        resolved["resolved_at"] -= timedelta(seconds=_votes.AUTO_PROPOSAL_DEDUP_WINDOW_SECONDS + 1)
+        later = self._auto(client, "Migrate the analytics database")
+        assert later["proposal_created"] is True
+        assert later["proposal_id"] != first["proposal_id"]
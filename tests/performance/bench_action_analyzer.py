@@ -0,0 +1,110 @@
+"""
+Microbenchmark for the Pentarchy action analyzer.
+
+Compares the precompiled classify_action against the previous
+per-call implementation (kept here as a reference) and checks that both
+produce identical results on the benchmark corpus.
+
+Run with: python -m tests.performance.bench_action_analyzer [--messages N]
+"""
+import argparse
+import random
+import re
+import time
+
+from src.api.routers.votes import ActionAnalysis, classify_action
+from src.core.governance import AUTO_APPROVE_LIMIT, HUMAN_REVIEW_LIMIT
+
+
+def legacy_analyze(message: str) -> ActionAnalysis:
+    """The analyzer as it was before precompilation (reference only)."""
+    cost_keywords = {
+        "purchase": 75.0, "buy": 75.0, "subscribe": 60.0, "deploy": 80.0,
+        "provision": 100.0, "scale": 70.0, "upgrade": 85.0, "migrate": 150.0,
+        "delete": 50.0, "remove": 40.0, "transfer": 90.0, "payment": 100.0,
+        "invoice": 50.0, "hire": 200.0, "contract": 150.0,
+    }
+    security_keywords = ["security", "access", "permission", "credential", "secret", "key", "password"]
+    legal_keywords = ["legal", "compliance", "gdpr", "contract", "agreement", "terms"]
+    message_lower = message.lower()
+    cost_patterns = [
+        r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',
+        r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:dollars?|usd)',
+        r'cost(?:s|ing)?\s*(?:about|around|approximately)?\s*\$?(\d+)',
+    ]
+    detected_cost = 0.0
+    for pattern in cost_patterns:
+        for match in re.findall(pattern, message_lower):
+            detected_cost = max(detected_cost, float(match.replace(",", "")))
+    action_type = "general"
+    estimated_cost = detected_cost
+    for keyword, default_cost in cost_keywords.items():
+        if keyword in message_lower:
+            action_type = keyword
+            if estimated_cost == 0:
+                estimated_cost = default_cost
+            break
+    if any(kw in message_lower for kw in security_keywords):
+        action_type = "security"
+        estimated_cost = max(estimated_cost, 100.0)
+    elif any(kw in message_lower for kw in legal_keywords):
+        action_type = "legal"
+        estimated_cost = max(estimated_cost, 100.0)
+    if estimated_cost >= HUMAN_REVIEW_LIMIT:
+        risk_level = "high"
+    elif estimated_cost >= AUTO_APPROVE_LIMIT:
+        risk_level = "medium"
+    else:
+        risk_level = "low"
+    return ActionAnalysis(
+        requires_voting=estimated_cost >= AUTO_APPROVE_LIMIT,
+        estimated_cost=estimated_cost,
+        risk_level=risk_level,
+        action_type=action_type,
+        description=f"Action '{action_type}' with estimated cost ${estimated_cost:.2f}"
+    )
+
+
+FRAGMENTS = [
+    "please", "summarize the meeting notes", "buy", "a new laptop", "for $1,250.00",
+    "deploy the service", "it costs about 80", "send 300 usd", "rotate the api key",
+    "review the gdpr terms", "scale up", "hire a contractor", "what is the weather",
+    "migrate the database", "cost $45", "remove old logs", "12 dollars", "escalate",
+]
+
+
+def make_corpus(size: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(FRAGMENTS, k=rng.randint(2, 8))) for _ in range(size)]
+
+
+def bench(fn, corpus: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in corpus:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages)
+    for message in corpus:
+        assert classify_action(message) == legacy_analyze(message), message
+
+    legacy = bench(legacy_analyze, corpus, args.repeat)
+    current = bench(classify_action, corpus, args.repeat)
+    for name, elapsed in (("legacy", legacy), ("precompiled", current)):
+        print(f"{name:>12}: {elapsed * 1e6 / len(corpus):7.2f} us/message "
+              f"({len(corpus) / elapsed:,.0f} messages/s)")
+    print(f"{'speedup':>12}: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark for CacheService value codecs.
+
+Reports stored bytes and encode/decode time per serializer and compression
+for a small dict, a long LLM answer and a conversation snapshot, next to the
+legacy json.dumps text format. Codecs whose optional library is missing are
+skipped.
+
+Run with: python -m tests.performance.bench_cache_codec [--iterations N]
+"""
+import argparse
+import json
+import time
+
+from src.services.cache_codec import CacheCodec, available_compressions
+
+
+def sample_values() -> dict:
+    answer = " ".join(
+        f"Point {i}: the proposal affects budget line {i * 7} and needs review by Athena and Hermes."
+        for i in range(80)
+    )
+    conversation = [
+        {"role": "user" if i % 2 else "assistant", "content": f"Message {i} about the governance vote. " * 6,
+         "agent": ["zeus", "athena", "hermes"][i % 3], "tokens": 40 + i}
+        for i in range(50)
+    ]
+    return {
+        "small": {"user_id": "u-123", "allowed": True, "remaining": 42},
+        "llm_answer": {"content": answer, "model": "gpt-4", "usage": {"prompt": 512, "completion": 900}},
+        "conversation": {"conversation_id": "conv-42", "messages": conversation},
+    }
+
+
+def bench(fn, arg, iterations: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations
+
+
+def codecs() -> list[tuple[str, object, object]]:
+    """(name, encode, decode) for every codec usable here."""
+    rows = [("legacy json.dumps", lambda v: json.dumps(v).encode(), json.loads)]
+    serializers = ["json"]
+    try:
+        import msgpack  # noqa: F401
+        serializers.append("msgpack")
+    except ImportError:
+        pass
+    for serializer in serializers:
+        for compression in available_compressions():
+            codec = CacheCodec(serializer, compression)
+            rows.append((f"{serializer}+{compression}", codec.encode, codec.decode))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    for label, value in sample_values().items():
+        print(f"\n{label}")
+        print(f"{'codec':>20}  {'bytes':>7}  {'encode us':>10}  {'decode us':>10}")
+        for name, encode, decode in codecs():
+            encoded = encode(value)
+            assert decode(encoded) == value
+            print(f"{name:>20}  {len(encoded):7d}  "
+                  f"{bench(encode, value, args.iterations) * 1e6:10.2f}  "
+                  f"{bench(decode, encoded, args.iterations) * 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
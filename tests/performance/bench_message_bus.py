@@ -0,0 +1,340 @@
+"""
+Throughput, latency and memory benchmark for the message bus backends.
+
+Drives publishers and consumers created through create_message_bus against
+the memory, redis and nats backends and reports throughput, delivery latency
+percentiles (publish to handler start) and memory. Redis uses REDIS_URL when
+it is reachable and an in-process fakeredis server otherwise; NATS uses
+NATS_URL when reachable, else a throwaway nats-server from PATH, else it is
+reported as skipped.
+
+A fixed message count is sent by default. With --duration the run becomes a
+soak test: publishers send at --rate messages per second each and memory is
+sampled every --sample-interval seconds, so growth over time shows up.
+
+Results are printed as a table and, with --output, written as JSON for
+regression tracking.
+
+Run with:
+    python -m tests.performance.bench_message_bus [--backends memory redis nats]
+        [--publishers N] [--consumers N] [--messages N] [--payload-bytes N]
+        [--handler-ms MS] [--duration S --rate N] [--output results/bus.json]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+from src.agents.message_bus import AgentMessage, MessageType, create_message_bus
+
+BACKENDS = ("memory", "redis", "nats")
+
+
+class BackendUnavailable(Exception):
+    """The backend cannot be reached or started here."""
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def rss_kb() -> int | None:
+    """Current resident set size, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def reachable(host: str, port: int) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=0.5)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+def _host_port(url: str, default_port: int) -> tuple[str, int]:
+    host_port = url.split("://", 1)[-1].split("/", 1)[0].rsplit("@", 1)[-1]
+    host, _, port = host_port.partition(":")
+    return host or "localhost", int(port or default_port)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def backend_factory(backend: str):
+    """Yield (endpoint description, async factory creating connected buses)."""
+    if backend == "memory":
+        async def make(agent_id):
+            return await create_message_bus(agent_id, "memory")
+        yield "in-process", make
+
+    elif backend == "redis":
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        if await reachable(*_host_port(redis_url, 6379)):
+            async def make(agent_id):
+                return await create_message_bus(agent_id, "redis", redis_url=redis_url)
+            yield redis_url, make
+        else:
+            try:
+                import fakeredis
+            except ImportError:
+                raise BackendUnavailable(f"{redis_url} unreachable and fakeredis not installed")
+            server = fakeredis.FakeServer()
+
+            async def make(agent_id):
+                with patch("redis.asyncio.from_url", return_value=fakeredis.FakeAsyncRedis(server=server)):
+                    return await create_message_bus(agent_id, "redis")
+            yield "fakeredis (in-process)", make
+
+    elif backend == "nats":
+        try:
+            import nats  # noqa: F401
+        except ImportError:
+            raise BackendUnavailable("nats-py not installed")
+
+        nats_url = os.getenv("NATS_URL", "nats://localhost:4222")
+        process = None
+        if not await reachable(*_host_port(nats_url, 4222)):
+            binary = shutil.which("nats-server")
+            if binary is None:
+                raise BackendUnavailable(f"{nats_url} unreachable and no nats-server on PATH")
+            port = _free_port()
+            store = tempfile.mkdtemp(prefix="bench-nats-")
+            process = subprocess.Popen(
+                [binary, "-js", "-p", str(port), "-sd", store],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            nats_url = f"nats://127.0.0.1:{port}"
+            for _ in range(50):
+                if await reachable("127.0.0.1", port):
+                    break
+                await asyncio.sleep(0.1)
+            else:
+                process.terminate()
+                raise BackendUnavailable("embedded nats-server did not start")
+        try:
+            async def make(agent_id):
+                return await create_message_bus(agent_id, "nats", nats_url=nats_url)
+            yield nats_url if process is None else f"embedded nats-server ({nats_url})", make
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=5)
+                shutil.rmtree(store, ignore_errors=True)
+
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+
+async def run_backend(backend: str, args) -> dict:
+    """Run one benchmark against a backend and return its result record."""
+    result = {"backend": backend, "status": "ok"}
+    run_id = uuid4().hex[:6]
+    latencies: list[float] = []
+    delivered = 0
+    all_delivered = asyncio.Event()
+    expected = None if args.duration else args.messages
+    samples = []
+
+    async def handler(message: AgentMessage) -> None:
+        nonlocal delivered
+        latencies.append((time.perf_counter() - message.payload["sent"]) * 1000)
+        delivered += 1
+        if expected is not None and delivered >= expected:
+            all_delivered.set()
+        if args.handler_ms:
+            await asyncio.sleep(args.handler_ms / 1000)
+
+    try:
+        async with backend_factory(backend) as (endpoint, make):
+            result["endpoint"] = endpoint
+            consumers = []
+            for i in range(args.consumers):
+                bus = await make(f"bench-{run_id}-con-{i}")
+                bus.register_handler("bench.*", handler)
+                await bus.subscribe("bench.*")
+                consumers.append(bus)
+            publishers = [await make(f"bench-{run_id}-pub-{i}") for i in range(args.publishers)]
+
+            payload = "x" * args.payload_bytes
+            published = 0
+
+            def make_message(source: str, n: int) -> AgentMessage:
+                return AgentMessage(
+                    type=MessageType.EVENT, source=source,
+                    target=f"bench-{run_id}-con-{n % args.consumers}",
+                    subject="bench.message", payload={"data": payload, "sent": time.perf_counter()},
+                )
+
+            async def publish_fixed(bus, count: int) -> None:
+                nonlocal published
+                for start in range(0, count, args.batch):
+                    batch = [make_message(bus.agent_id, published + n) for n in range(min(args.batch, count - start))]
+                    if len(batch) == 1:
+                        await bus.publish(batch[0])
+                    else:
+                        await bus.publish_many(batch)
+                    published += len(batch)
+
+            async def publish_paced(bus, deadline: float) -> None:
+                nonlocal published
+                interval = 1.0 / args.rate
+                next_send = time.perf_counter()
+                while time.perf_counter() < deadline:
+                    await bus.publish(make_message(bus.agent_id, published))
+                    published += 1
+                    next_send += interval
+                    await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+
+            async def sample_memory(start: float) -> None:
+                while True:
+                    await asyncio.sleep(args.sample_interval)
+                    samples.append({
+                        "elapsed_s": round(time.perf_counter() - start, 3),
+                        "published": published,
+                        "delivered": delivered,
+                        "rss_kb": rss_kb(),
+                        "tracemalloc_kb": tracemalloc.get_traced_memory()[0] // 1024
+                        if tracemalloc.is_tracing() else None,
+                    })
+
+            if args.trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            sampler = asyncio.create_task(sample_memory(start))
+            try:
+                if args.duration:
+                    deadline = start + args.duration
+                    await asyncio.gather(*(publish_paced(bus, deadline) for bus in publishers))
+                    expected = published
+                    if delivered >= expected:
+                        all_delivered.set()
+                else:
+                    share, extra = divmod(args.messages, args.publishers)
+                    await asyncio.gather(*(
+                        publish_fixed(bus, share + (1 if i < extra else 0))
+                        for i, bus in enumerate(publishers)
+                    ))
+                publish_elapsed = time.perf_counter() - start
+                try:
+                    await asyncio.wait_for(all_delivered.wait(), timeout=args.timeout)
+                except asyncio.TimeoutError:
+                    result["status"] = "timeout"
+                elapsed = time.perf_counter() - start
+            finally:
+                sampler.cancel()
+                if tracemalloc.is_tracing():
+                    result["tracemalloc_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+                    tracemalloc.stop()
+
+            for bus in publishers + consumers:
+                await bus.disconnect()
+    except BackendUnavailable as e:
+        return {"backend": backend, "status": "skipped", "reason": str(e)}
+
+    result.update({
+        "published": published,
+        "delivered": delivered,
+        "publish_elapsed_s": round(publish_elapsed, 4),
+        "elapsed_s": round(elapsed, 4),
+        "publish_rate_msg_s": round(published / publish_elapsed, 1) if publish_elapsed else None,
+        "throughput_msg_s": round(delivered / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            name: None if value is None else round(value, 3)
+            for name, value in (
+                ("p50", percentile(latencies, 50)),
+                ("p90", percentile(latencies, 90)),
+                ("p99", percentile(latencies, 99)),
+                ("max", max(latencies, default=None)),
+            )
+        },
+        "rss_kb": rss_kb(),
+        "peak_rss_kb": peak_rss_kb(),
+        "samples": samples,
+    })
+    return result
+
+
+def print_table(results: list[dict]) -> None:
+    print(f"{'backend':>8}  {'status':>8}  {'msg/s':>10}  {'p50 ms':>8}  {'p99 ms':>8}  {'rss MB':>7}  endpoint")
+    for r in results:
+        if r["status"] == "skipped":
+            print(f"{r['backend']:>8}  {'skipped':>8}  {r['reason']}")
+            continue
+        latency = r["latency_ms"]
+
+        def fmt(value):
+            return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+        rss = f"{r['rss_kb'] / 1024:7.1f}" if r["rss_kb"] else f"{'-':>7}"
+        print(f"{r['backend']:>8}  {r['status']:>8}  {r['throughput_msg_s'] or 0:10,.0f}  "
+              f"{fmt(latency['p50'])}  {fmt(latency['p99'])}  {rss}  {r['endpoint']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--publishers", type=int, default=2)
+    parser.add_argument("--consumers", type=int, default=2)
+    parser.add_argument("--messages", type=int, default=5000, help="messages per run (ignored with --duration)")
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=1, help="publish_many batch size")
+    parser.add_argument("--handler-ms", type=float, default=0.0, help="simulated handler latency")
+    parser.add_argument("--duration", type=float, default=0.0, help="soak for this many seconds")
+    parser.add_argument("--rate", type=float, default=500.0, help="messages/s per publisher when soaking")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for deliveries")
+    parser.add_argument("--trace-memory", action="store_true", help="track Python heap with tracemalloc (slower)")
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # Per-agent connect/disconnect logs drown the table
+    results = [asyncio.run(run_backend(backend, args)) for backend in args.backends]
+    print_table(results)
+
+    if args.output:
+        report = {
+            "benchmark": "message_bus",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {k: v for k, v in vars(args).items() if k != "output"},
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Microbenchmark for AgentMessage wire formats.
+
+Compares AgentMessage.to_json / from_json with the compact codec's
+encode_message / decode_message and header-only peek_header, and reports
+encoded sizes.
+
+Run with: python -m tests.performance.bench_message_codec [--payload-keys N]
+"""
+import argparse
+import time
+
+from src.agents.message_bus import AgentMessage, MessageType
+from src.agents.message_codec import decode_message, encode_message, peek_header
+
+
+def make_message(payload_keys: int) -> AgentMessage:
+    return AgentMessage(
+        type=MessageType.REQUEST, source="zeus", target="athena", subject="research.query",
+        correlation_id="conversation-42",
+        payload={f"field_{i}": {"text": "lorem ipsum " * 3, "score": i * 0.5} for i in range(payload_keys)},
+    )
+
+
+def bench(fn, arg, iterations: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payload-keys", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    message = make_message(args.payload_keys)
+    as_json = message.to_json()
+    as_compact = encode_message(message)
+    assert decode_message(as_compact).model_dump() == message.model_dump()
+
+    rows = [
+        ("json encode", bench(AgentMessage.to_json, message, args.iterations)),
+        ("compact encode", bench(encode_message, message, args.iterations)),
+        ("json decode", bench(AgentMessage.from_json, as_json, args.iterations)),
+        ("compact decode", bench(decode_message, as_compact, args.iterations)),
+        ("compact peek", bench(peek_header, as_compact, args.iterations)),
+    ]
+    print(f"size: json {len(as_json.encode())} bytes, compact {len(as_compact)} bytes")
+    for name, seconds in rows:
+        print(f"{name:>15}: {seconds * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
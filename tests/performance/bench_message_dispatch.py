@@ -0,0 +1,77 @@
+"""
+Microbenchmark for handler lookup during message dispatch.
+
+Compares the linear MessageHandler.matches scan with the bus's subject
+routing index for a growing number of registered handlers.
+
+Run with: python -m tests.performance.bench_message_dispatch [--handlers N ...]
+"""
+import argparse
+import random
+import time
+
+from src.agents.message_bus import AgentMessage, MessageHandler, MessageType, _HandlerIndex
+
+
+async def _noop(message):
+    return None
+
+
+def make_handlers(count: int) -> list[MessageHandler]:
+    handlers = [MessageHandler("*", _noop, [MessageType.BROADCAST])]
+    for i in range(count - 1):
+        if i % 2:
+            handlers.append(MessageHandler(f"domain{i}.*", _noop))
+        else:
+            handlers.append(MessageHandler(f"domain{i}.action", _noop, [MessageType.REQUEST]))
+    return handlers
+
+
+def make_messages(count: int, handlers: int) -> list[AgentMessage]:
+    rng = random.Random(7)
+    return [
+        AgentMessage(
+            type=rng.choice(list(MessageType)), source="bench",
+            subject=f"domain{rng.randrange(handlers)}.{rng.choice(['action', 'other'])}",
+        )
+        for _ in range(count)
+    ]
+
+
+def bench(fn, messages, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            fn(message)
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--handlers", type=int, nargs="+", default=[4, 32, 256])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    for count in args.handlers:
+        handlers = make_handlers(count)
+        index = _HandlerIndex()
+        for handler in handlers:
+            index.add(handler)
+        messages = make_messages(args.messages, count)
+
+        def linear(message):
+            return [h for h in handlers if h.matches(message)]
+
+        def indexed(message):
+            return index.match(message.subject, message.type)
+
+        assert all(linear(m) == indexed(m) for m in messages[:1000])
+        scan, lookup = bench(linear, messages), bench(indexed, messages)
+        print(f"{count:>5} handlers: linear {scan * 1e6:7.2f} us, "
+              f"indexed {lookup * 1e6:7.2f} us ({scan / lookup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
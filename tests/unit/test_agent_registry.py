@@ -0,0 +1,70 @@
+"""
+Unit tests for the process-wide agent instance registry.
+"""
+import pytest
+
+from src.core import agent_registry
+
+
+class DummyAgent:
+    """Cheap stand-in for an agent class."""
+
+    created = 0
+
+    def __init__(self):
+        DummyAgent.created += 1
+        self.shut_down = False
+
+    async def shutdown(self):
+        self.shut_down = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Point the registry at the dummy agent with a clean instance cache."""
+    monkeypatch.setattr(agent_registry, "AGENT_CLASSES", {
+        "athena": f"{__name__}:DummyAgent",
+        "nur_prometheus": f"{__name__}:DummyAgent",
+        "broken": "src.agents.does_not_exist.main:BrokenAgent",
+    })
+    monkeypatch.setattr(agent_registry, "_agent_instances", {})
+    DummyAgent.created = 0
+    return agent_registry
+
+
+class TestAgentInstanceRegistry:
+    """Tests for lazy, shared agent construction."""
+
+    def test_instance_is_built_once(self, registry):
+        """Repeated lookups should reuse the same instance."""
+        first = registry.get_agent_instance("athena")
+        second = registry.get_agent_instance("athena")
+
+        assert first is second
+        assert DummyAgent.created == 1
+
+    def test_alias_resolves_to_canonical_agent(self, registry):
+        """The 'prometheus' alias should share the nur_prometheus instance."""
+        assert registry.get_agent_instance("prometheus") is registry.get_agent_instance(
+            "nur_prometheus")
+
+    def test_unknown_agent_raises(self, registry):
+        """Unknown agents should raise ValueError."""
+        with pytest.raises(ValueError):
+            registry.get_agent_instance("nobody")
+
+    def test_warm_up_reports_failures(self, registry):
+        """Warm-up should build what it can and report the rest."""
+        results = registry.warm_up_agents()
+
+        assert results == {"athena": True, "nur_prometheus": True, "broken": False}
+        assert DummyAgent.created == 2
+
+    async def test_shutdown_clears_instances(self, registry):
+        """Shutdown should call agent shutdown hooks and drop instances."""
+        agent = registry.get_agent_instance("athena")
+
+        await registry.shutdown_agents()
+
+        assert agent.shut_down
+        assert registry.get_agent_instance("athena") is not agent
@@ -146,3 +146,81 @@ class TestMiddlewareIntegration:
         
         assert LoggingMiddleware is not None
         assert MetricsMiddleware is not None
+
+
+class TestVoteEvents:
+    """Tests for live voting progress events."""
+
+    @pytest.fixture
+    def hub(self):
+        """Fresh event hub with local delivery only."""
+        from src.api.routers.websocket import ConnectionManager, VoteEventHub
+        return VoteEventHub(ConnectionManager())
+
+    async def test_local_delivery_by_topic(self, hub):
+        """Events should reach proposal and all-proposal subscribers only."""
+        from src.api.routers.websocket import ALL_PROPOSALS_TOPIC, proposal_topic
+
+        mine = hub.subscribe(proposal_topic("p-1"))
+        other = hub.subscribe(proposal_topic("p-2"))
+        everything = hub.subscribe(ALL_PROPOSALS_TOPIC)
+
+        await hub.publish({"type": "vote_cast", "proposal_id": "p-1"})
+
+        assert mine.get_nowait()["type"] == "vote_cast"
+        assert everything.qsize() == 1
+        assert other.empty()
+
+    async def test_redis_fanout(self):
+        """Events published on one replica should reach another via Redis."""
+        fakeredis = pytest.importorskip("fakeredis")
+        import asyncio
+        from src.api.routers.websocket import (
+            ConnectionManager, VoteEventHub, ALL_PROPOSALS_TOPIC,
+        )
+
+        server = fakeredis.FakeServer()
+        replicas = [VoteEventHub(ConnectionManager()) for _ in range(2)]
+        with patch("redis.asyncio.from_url", side_effect=lambda *a, **k: fakeredis.FakeAsyncRedis(
+                server=server, decode_responses=True)):
+            for replica in replicas:
+                await replica.start()
+        try:
+            received = replicas[1].subscribe(ALL_PROPOSALS_TOPIC)
+            await replicas[0].publish({"type": "proposal_resolved", "proposal_id": "p-9"})
+            event = await asyncio.wait_for(received.get(), timeout=2.0)
+            assert event["proposal_id"] == "p-9"
+        finally:
+            for replica in replicas:
+                await replica.stop()
+
+    async def test_votes_publish_progress(self):
+        """Casting votes and resolving should emit events without full proposals."""
+        from datetime import datetime
+        from src.api.routers import votes
+        from src.api.routers.websocket import proposal_topic, vote_events
+
+        proposal = {
+            "id": "p-events", "title": "t", "description": "d" * 20, "cost": 10.0,
+            "risk_level": "low", "status": "pending", "votes": [], "final_score": None,
+            "threshold": 1.5, "context": {}, "auto_execute": False,
+            "created_at": datetime.utcnow(), "resolved_at": None,
+        }
+        votes._proposals[proposal["id"]] = proposal
+        votes._track_new_proposal(proposal)
+        queue = vote_events.subscribe(proposal_topic(proposal["id"]))
+        try:
+            await votes._add_vote(proposal, {
+                "agent": "athena", "vote": "APPROVE", "score": 2.5,
+                "reasoning": [], "timestamp": datetime.utcnow(),
+            })
+            await votes._resolve_proposal(proposal["id"])
+
+            cast, resolved = queue.get_nowait(), queue.get_nowait()
+            assert cast["type"] == "vote_cast"
+            assert cast["votes_collected"] == 1
+            assert "description" not in cast
+            assert resolved["type"] == "proposal_resolved"
+            assert resolved["status"] == "approved"
+        finally:
+            vote_events.unsubscribe(proposal_topic(proposal["id"]), queue)
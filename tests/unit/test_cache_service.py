@@ -107,3 +107,877 @@ class TestCacheTTL:
         session_ttl = 1800  # 30 minutes
         assert session_ttl > 0
         assert session_ttl < 86400
+
+
+@pytest.fixture
+async def cache():
+    """CacheService backed by an in-process fakeredis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from src.services.cache_service import CacheService
+
+    service = CacheService()
+    service._client = fakeredis.FakeAsyncRedis()
+    yield service
+    await service.disconnect()
+
+
+class TestMultiKeyOperations:
+    """Tests for get_many, set_many, delete_many and pipelines."""
+
+    async def test_set_many_and_get_many(self, cache):
+        assert await cache.set_many({"a": 1, "b": {"nested": [1, 2]}, "c": "text"})
+        assert await cache.get_many(["a", "b", "missing", "c"]) == {
+            "a": 1, "b": {"nested": [1, 2]}, "c": "text",
+        }
+        assert await cache.get_many([]) == {}
+
+    async def test_set_many_per_key_ttl(self, cache):
+        await cache.set_many({"short": 1, "long": 2, "default": 3}, ttl={"short": 10, "long": 500})
+        assert 0 < await cache._client.ttl("short") <= 10
+        assert 10 < await cache._client.ttl("long") <= 500
+        assert await cache._client.ttl("default") > 500
+
+    async def test_delete_many(self, cache):
+        await cache.set_many({"a": 1, "b": 2})
+        assert await cache.delete_many(["a", "b", "missing"]) == 2
+        assert await cache.get_many(["a", "b"]) == {}
+
+    async def test_pipeline(self, cache):
+        await cache.set("existing", {"v": 1})
+        async with cache.pipeline() as pipe:
+            pipe.get("existing").set("new", [1], ttl=60).get("missing").delete("existing")
+        assert pipe.results == [{"v": 1}, True, None, True]
+        assert await cache.get("new") == [1]
+        assert await cache.get("existing") is None
+
+    async def test_pipeline_not_sent_when_block_raises(self, cache):
+        with pytest.raises(RuntimeError):
+            async with cache.pipeline() as pipe:
+                pipe.set("never", 1)
+                raise RuntimeError("boom")
+        assert await cache.get("never") is None
+
+    async def test_multi_key_without_redis(self):
+        from src.services.cache_service import CacheService
+
+        service = CacheService()
+        assert await service.get_many(["a"]) == {}
+        assert await service.set_many({"a": 1}) is False
+        assert await service.delete_many(["a"]) == 0
+        async with service.pipeline() as pipe:
+            pipe.get("a").set("b", 1)
+        assert pipe.results == [None, False]
+
+
+class TestGetOrCompute:
+    """Tests for stale-while-revalidate get_or_compute."""
+
+    def _source(self, values):
+        """Async source returning successive values and counting its calls."""
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            return values[min(len(calls), len(values)) - 1]
+        return fn, calls
+
+    async def test_concurrent_misses_compute_once(self, cache):
+        import asyncio
+
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            started.set()
+            await release.wait()
+            return {"answer": 42}
+
+        callers = [asyncio.create_task(cache.get_or_compute("k", slow, soft_ttl=60)) for _ in range(5)]
+        await started.wait()
+        release.set()
+        assert await asyncio.gather(*callers) == [{"answer": 42}] * 5
+        assert len(calls) == 1
+
+    async def test_fresh_entry_is_served_without_compute(self, cache):
+        fn, calls = self._source(["v1", "v2"])
+        assert await cache.get_or_compute("k", fn, soft_ttl=60, beta=0) == "v1"
+        assert await cache.get_or_compute("k", fn, soft_ttl=60, beta=0) == "v1"
+        assert len(calls) == 1
+
+    async def test_stale_entry_served_while_one_refresh_runs(self, cache):
+        import asyncio
+
+        release = asyncio.Event()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            if len(calls) > 1:
+                await release.wait()
+            return f"v{len(calls)}"
+
+        await cache.get_or_compute("k", fn, soft_ttl=60, hard_ttl=600)
+        with patch("src.services.cache_service.time.time", return_value=time_after(61)):
+            results = await asyncio.gather(*(
+                cache.get_or_compute("k", fn, soft_ttl=60, hard_ttl=600) for _ in range(5)))
+            assert results == ["v1"] * 5
+            release.set()
+            await asyncio.gather(*list(cache._refresh_tasks.values()))
+        assert len(calls) == 2
+        assert await cache.get_or_compute("k", fn, soft_ttl=60, beta=0) == "v2"
+
+    async def test_refresh_skipped_when_another_process_holds_lock(self, cache):
+        import asyncio
+
+        fn, calls = self._source(["v1", "v2"])
+        await cache.get_or_compute("k", fn, soft_ttl=60)
+        await cache._client.set("k:refresh", "1", ex=30)
+        with patch("src.services.cache_service.time.time", return_value=time_after(61)):
+            assert await cache.get_or_compute("k", fn, soft_ttl=60) == "v1"
+        await asyncio.gather(*list(cache._refresh_tasks.values()))
+        assert len(calls) == 1
+
+    async def test_xfetch_refreshes_early(self, cache):
+        import asyncio
+
+        fn, calls = self._source(["v1", "v2"])
+        await cache.get_or_compute("k", fn, soft_ttl=60)
+        raw = cache.codec.decode(await cache._client.get("k"))
+        raw["delta"] = 10.0  # Recomputing is slow relative to the time left
+        await cache._client.set("k", cache.codec.encode(raw))
+
+        with patch("src.services.cache_service.time.time", return_value=raw["soft"] - 5), \
+                patch("src.services.cache_service.random.random", return_value=0.9):
+            # -10 * ln(0.1) ~ 23s ahead of now, past the soft expiry 5s away
+            assert await cache.get_or_compute("k", fn, soft_ttl=60) == "v1"
+        await asyncio.gather(*list(cache._refresh_tasks.values()))
+        assert len(calls) == 2
+
+        with patch("src.services.cache_service.random.random", return_value=0.9):
+            await cache.get_or_compute("k", fn, soft_ttl=60)
+        assert not cache._refresh_tasks
+
+    async def test_failed_refresh_keeps_stale_value(self, cache):
+        import asyncio
+
+        async def failing():
+            raise RuntimeError("source down")
+
+        fn, _ = self._source(["v1"])
+        await cache.get_or_compute("k", fn, soft_ttl=60)
+        with patch("src.services.cache_service.time.time", return_value=time_after(61)):
+            assert await cache.get_or_compute("k", failing, soft_ttl=60) == "v1"
+        await asyncio.gather(*list(cache._refresh_tasks.values()))
+        assert await cache._client.get("k:refresh") is None
+
+    async def test_cancelled_computation_does_not_strand_waiters(self, cache):
+        import asyncio
+
+        started = asyncio.Event()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                await asyncio.sleep(3600)
+            return "v"
+
+        first = asyncio.create_task(cache.get_or_compute("k", fn, soft_ttl=60))
+        await started.wait()
+        second = asyncio.create_task(cache.get_or_compute("k", fn, soft_ttl=60))
+        await asyncio.sleep(0.05)  # let it miss and start waiting on the first
+        first.cancel()
+
+        assert await asyncio.wait_for(second, timeout=2) == "v"
+        assert first.cancelled()
+        assert len(calls) == 2
+        assert not cache._computing
+
+    async def test_expired_refresh_lock_is_not_released_by_its_old_holder(self, cache):
+        import asyncio
+
+        fn_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fn():
+            fn_started.set()
+            await release.wait()
+            return "v2"
+
+        await cache.get_or_compute("k", lambda: "v1", soft_ttl=60)
+        with patch("src.services.cache_service.time.time", return_value=time_after(61)):
+            assert await cache.get_or_compute("k", fn, soft_ttl=60) == "v1"
+            await fn_started.wait()
+            # The lock expired mid-refresh and another process took it
+            await cache._client.set("k:refresh", "other-process", ex=30)
+            release.set()
+            await asyncio.gather(*list(cache._refresh_tasks.values()))
+        assert await cache._client.get("k:refresh") == b"other-process"
+
+    async def test_miss_errors_propagate(self, cache):
+        async def failing():
+            raise RuntimeError("source down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("k", failing)
+        assert not cache._computing
+
+    async def test_without_redis_computes_every_time(self):
+        from src.services.cache_service import CacheService
+
+        service = CacheService()
+        fn, calls = self._source(["v1", "v2"])
+        assert await service.get_or_compute("k", fn) == "v1"
+        assert await service.get_or_compute("k", fn) == "v2"
+
+
+def time_after(seconds):
+    import time
+    return time.time() + seconds
+
+
+def _stub_compression_import(name):
+    """_import replacement providing a zlib-backed stand-in for zstandard or lz4.frame."""
+    import types
+    import zlib
+    from src.services import cache_codec
+
+    real_import = cache_codec._import
+    if name == "lz4":
+        module = types.SimpleNamespace(compress=zlib.compress, decompress=lambda data: zlib.decompress(bytes(data)))
+    else:
+        compressor = types.SimpleNamespace(compress=zlib.compress)
+        decompressor = types.SimpleNamespace(decompress=lambda data: zlib.decompress(bytes(data)))
+        module = types.SimpleNamespace(
+            ZstdCompressor=lambda level=3: compressor, ZstdDecompressor=lambda: decompressor)
+
+    def stub(requested):
+        return module if requested == name else real_import(requested)
+    return stub
+
+
+class TestCacheCodec:
+    """Tests for cache value codecs."""
+
+    LARGE = {"response": "The Pentarchy reviewed the proposal. " * 200, "tokens": list(range(50))}
+
+    @pytest.mark.parametrize("serializer", ["json", "msgpack"])
+    @pytest.mark.parametrize("compression", ["none", "zlib", "auto"])
+    def test_round_trip(self, serializer, compression):
+        from src.services.cache_codec import CacheCodec
+
+        if serializer == "msgpack":
+            pytest.importorskip("msgpack")
+        codec = CacheCodec(serializer, compression)
+        for value in [self.LARGE, {"small": 1}, [1, "two", None], "text", 3.5, None]:
+            assert codec.decode(codec.encode(value)) == value
+
+    @pytest.mark.parametrize("serializer", ["json", "msgpack"])
+    @pytest.mark.parametrize("compression", ["zstd", "lz4"])
+    def test_round_trip_optional_compressions(self, serializer, compression):
+        """zstd and lz4 headers must not be mistaken for legacy JSON text."""
+        from src.services import cache_codec
+
+        if serializer == "msgpack":
+            pytest.importorskip("msgpack")
+        with patch.object(cache_codec, "_import", _stub_compression_import(compression)):
+            codec = cache_codec.CacheCodec(serializer, compression, compress_min_bytes=64)
+            assert codec.compression == compression
+            encoded = codec.encode(self.LARGE)
+            assert encoded[0] < 0x20
+            assert encoded[0] >> 2 == cache_codec.COMPRESSIONS[compression]
+            for value in [self.LARGE, {"small": 1}, "text", None]:
+                assert codec.decode(codec.encode(value)) == value
+            assert cache_codec.CacheCodec("json", "none").decode(encoded) == self.LARGE
+
+    def test_every_header_is_below_printable_range(self):
+        from src.services.cache_codec import COMPRESSIONS, SERIALIZERS
+
+        for compression in COMPRESSIONS.values():
+            for serializer in SERIALIZERS.values():
+                assert compression << 2 | serializer < 0x20
+
+    def test_large_values_are_compressed(self):
+        from src.services.cache_codec import CacheCodec
+
+        codec = CacheCodec("json", "zlib", compress_min_bytes=1024)
+        encoded = codec.encode(self.LARGE)
+        assert encoded[0] >> 2 == 1
+        assert len(encoded) < len(json.dumps(self.LARGE)) / 5
+        assert codec.encode({"small": 1})[0] == 0x01
+
+    def test_legacy_json_entries_still_decode(self):
+        from src.services.cache_codec import CacheCodec
+
+        codec = CacheCodec()
+        for value in [{"a": [1, 2]}, [1], "text", 42, -1, True, None]:
+            legacy = json.dumps(value)
+            assert codec.decode(legacy.encode()) == value
+            assert codec.decode(legacy) == value
+
+    def test_other_codecs_entries_decode(self):
+        """Readers decode whatever codec the writer was configured with."""
+        from src.services.cache_codec import CacheCodec
+
+        writer = CacheCodec("json", "zlib", compress_min_bytes=0)
+        assert CacheCodec("json", "none").decode(writer.encode(self.LARGE)) == self.LARGE
+
+    def test_unknown_names_are_rejected(self):
+        from src.services.cache_codec import CacheCodec
+
+        with pytest.raises(ValueError):
+            CacheCodec(serializer="pickle")
+        with pytest.raises(ValueError):
+            CacheCodec(compression="brotli")
+
+    def test_missing_library_falls_back(self):
+        from src.services import cache_codec
+
+        with patch.object(cache_codec, "_import", return_value=None):
+            codec = cache_codec.CacheCodec("msgpack", "zstd")
+        assert (codec.serializer, codec.compression) == ("json", "zlib")
+
+    async def test_service_stores_encoded_values(self, cache):
+        from src.services.cache_codec import CacheCodec
+
+        cache.codec = CacheCodec("json", "zlib", compress_min_bytes=64)
+        await cache.set("big", self.LARGE)
+        raw = await cache._client.get("big")
+        assert raw[0] >> 2 == 1
+        assert await cache.get("big") == self.LARGE
+
+        await cache._client.set("legacy", json.dumps({"old": True}))
+        assert await cache.get("legacy") == {"old": True}
+
+
+class TestInvalidation:
+    """Tests for generation and tag based invalidation."""
+
+    async def test_namespace_generation_bump_invalidates(self, cache):
+        key = await cache.namespaced_key("llm", "chat:abc")
+        assert key == "llm:g0:chat:abc"
+        await cache.set(key, "answer")
+        assert await cache.get(await cache.namespaced_key("llm", "chat:abc")) == "answer"
+
+        assert await cache.invalidate_namespace("llm") == 1
+        assert await cache.namespaced_key("llm", "chat:abc") == "llm:g1:chat:abc"
+        assert await cache.get(await cache.namespaced_key("llm", "chat:abc")) is None
+        # Other namespaces are untouched
+        assert await cache.namespaced_key("votes", "x") == "votes:g0:x"
+
+    async def test_generation_is_reused_locally(self, cache):
+        """Lookups within CACHE_GENERATION_TTL must not re-read the generation."""
+        cache.generation_ttl = 60
+        assert await cache.namespaced_key("llm", "k") == "llm:g0:k"
+        # Another process bumps the generation: seen only once the copy expires
+        await cache._client.incr("cache:gen:llm")
+        assert await cache.namespaced_key("llm", "k") == "llm:g0:k"
+
+        cache._generations["llm"] = (0, 0.0)
+        assert await cache.namespaced_key("llm", "k") == "llm:g1:k"
+        # A local bump is seen at once
+        assert await cache.invalidate_namespace("llm") == 2
+        assert await cache.namespaced_key("llm", "k") == "llm:g2:k"
+
+    async def test_invalidate_tags_deletes_only_tagged_entries(self, cache):
+        await cache.set("a", 1, tags=["model:gpt-4"])
+        await cache.set("b", 2, tags=["model:gpt-4", "user:1"])
+        await cache.set("c", 3, tags=["model:claude"])
+        await cache.set("d", 4)
+
+        assert await cache.invalidate_tags("model:gpt-4") == 2
+        assert await cache.get_many(["a", "b", "c", "d"]) == {"c": 3, "d": 4}
+        assert not await cache._client.exists("cache:tag:model:gpt-4")
+        assert await cache.invalidate_tags("user:1") == 0
+
+    async def test_tag_set_outlives_its_longest_entry(self, cache):
+        await cache.set("long", 1, ttl=900, tags=["t"])
+        await cache.set("short", 2, ttl=60, tags=["t"])
+        assert 60 < await cache._client.ttl("cache:tag:t") <= 900
+
+    async def test_writes_prune_expired_tag_members(self, cache):
+        await cache._client.zadd("cache:tag:t", {"expired": 1})
+        await cache.set("fresh", 1, tags=["t"])
+        assert await cache._client.zrange("cache:tag:t", 0, -1) == [b"fresh"]
+
+    async def test_invalidate_tags_skips_expired_members(self, cache):
+        """A key whose tagged entry expired and was re-set untagged must survive."""
+        await cache.set("live", 1, tags=["t"])
+        await cache._client.zadd("cache:tag:t", {"reused": 1})
+        await cache.set("reused", 2)
+
+        assert await cache.invalidate_tags("t") == 1
+        assert await cache.get_many(["live", "reused"]) == {"reused": 2}
+        assert not await cache._client.exists("cache:tag:t")
+
+    async def test_invalidation_without_redis(self):
+        from src.services.cache_service import CacheService
+
+        service = CacheService()
+        assert await service.namespaced_key("llm", "k") == "llm:g0:k"
+        assert await service.invalidate_namespace("llm") == 0
+        assert await service.invalidate_tags("t") == 0
+
+
+class TestConnectionHealing:
+    """Tests for background reconnection and health reporting."""
+
+    def _unreachable(self):
+        from redis.exceptions import ConnectionError
+
+        client = MagicMock()
+        client.ping = AsyncMock(side_effect=ConnectionError("connection refused"))
+        client.close = AsyncMock()
+        return client
+
+    async def test_failed_connect_recovers_in_background(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from src.api.metrics import REDIS_RECONNECTS, REDIS_UP
+        from src.services.cache_service import CacheService
+
+        service = CacheService()
+        service.reconnect_min_delay = 0.01
+        before = REDIS_RECONNECTS.labels(outcome="success")._value.get()
+        clients = [self._unreachable(), self._unreachable(), fakeredis.FakeAsyncRedis()]
+        with patch("src.services.cache_service.redis.from_url", side_effect=clients):
+            await service.connect()
+            assert not service.available
+            assert service.health()["status"] == "reconnecting"
+            assert await service.set("k", 1) is False
+
+            await _wait_until(lambda: service.available)
+        try:
+            assert service.health()["status"] == "connected"
+            assert await service.set("k", 1) is True
+            assert REDIS_RECONNECTS.labels(outcome="success")._value.get() == before + 1
+            assert REDIS_UP._value.get() == 1
+        finally:
+            await service.disconnect()
+        assert service.health()["status"] == "disconnected"
+
+    async def test_connection_errors_trigger_reconnect(self, cache):
+        from redis.exceptions import ConnectionError
+
+        cache.reconnect_min_delay = 0.01
+        real_get = cache._client.get
+        cache._client.get = AsyncMock(side_effect=ConnectionError("reset by peer"))
+        cache._start_monitor()
+
+        assert await cache.get("k") is None
+        assert not cache.available
+        assert "reset by peer" in cache.health()["last_error"]
+
+        cache._client.get = real_get
+        await _wait_until(lambda: cache.available)
+        assert cache.health()["reconnects"] == 1
+
+    async def test_other_errors_do_not_mark_unhealthy(self, cache):
+        cache._client.get = AsyncMock(side_effect=ValueError("bad reply"))
+        assert await cache.get("k") is None
+        assert cache.available
+
+    def test_pool_configuration(self, monkeypatch):
+        from src.services.cache_service import CacheService
+
+        monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("REDIS_SOCKET_TIMEOUT", "0.5")
+        service = CacheService()
+        assert (service.max_connections, service.socket_timeout) == (7, 0.5)
+        assert service.pool_stats() == {"in_use": 0, "idle": 0, "max": 7}
+
+    async def test_llm_service_uses_cache_once_it_recovers(self, cache):
+        from src.services.llm_service import LLMService
+
+        llm = LLMService()
+        with patch("src.services.cache_service.get_cache_service", AsyncMock(return_value=cache)):
+            cache._healthy = False
+            assert await llm._get_cache() is None
+            cache._healthy = True
+            assert await llm._get_cache() is cache
+
+
+class TestNearCache:
+    """Tests for the tracking-invalidated near-cache."""
+
+    def _near(self, max_entries=3):
+        from src.services.near_cache import NearCache
+
+        near = NearCache("redis://localhost:6379", ["user:"], max_entries=max_entries)
+        near.active = True
+        return near
+
+    @pytest.fixture
+    async def near_service(self, cache):
+        from src.services.near_cache import NearCache
+
+        cache.near_cache = NearCache(cache.redis_url, ["user:"])
+        cache.near_cache.active = True  # as if tracking were established
+        cache._client.get = _counting(cache._client.get)
+        yield cache
+
+    def test_requires_prefixes(self):
+        from src.services.near_cache import NearCache
+
+        with pytest.raises(ValueError):
+            NearCache("redis://localhost:6379", [])
+
+    def test_lru_is_bounded(self):
+        near = self._near(max_entries=2)
+        for key in ("user:a", "user:b"):
+            near.put(key, b"1", near.sequence)
+        near.get("user:a")
+        near.put("user:c", b"1", near.sequence)
+
+        assert len(near) == 2
+        assert near.get("user:b") == (False, None)
+        assert near.get("user:a") == (True, b"1")
+
+    def test_read_racing_an_invalidation_is_not_stored(self):
+        near = self._near()
+        sequence = near.sequence
+        near.invalidate([b"user:a"])
+        near.put("user:a", b"stale", sequence)
+        assert near.get("user:a") == (False, None)
+
+    def test_invalidate_keys_and_flush(self):
+        from src.api.metrics import NEAR_CACHE_ENTRIES
+
+        near = self._near()
+        for key in ("user:a", "user:b", "user:c"):
+            near.put(key, b"1", near.sequence)
+        near.invalidate([b"user:a", "user:missing"])
+        assert len(near) == 2
+        assert NEAR_CACHE_ENTRIES._value.get() == 2
+
+        near.invalidate(None)
+        assert len(near) == 0
+
+    def test_inactive_near_cache_stores_nothing(self):
+        near = self._near()
+        near.active = False
+        near.put("user:a", b"1", near.sequence)
+        assert len(near) == 0
+
+    def test_hit_rate(self):
+        from src.api.metrics import NEAR_CACHE_LOOKUPS
+
+        near = self._near()
+        before = NEAR_CACHE_LOOKUPS.labels(result="hit")._value.get()
+        near.put("user:a", b"1", near.sequence)
+        near.get("user:a")
+        near.get("user:b")
+
+        assert near.stats()["hit_rate"] == 0.5
+        assert NEAR_CACHE_LOOKUPS.labels(result="hit")._value.get() == before + 1
+
+    async def test_repeated_get_skips_redis(self, near_service):
+        await near_service.set("user:1", {"name": "a"})
+        assert await near_service.get("user:1") == {"name": "a"}
+        assert await near_service.get("user:1") == {"name": "a"}
+        assert near_service._client.get.await_count == 1
+
+    async def test_untracked_keys_always_go_to_redis(self, near_service):
+        await near_service.set("other:1", 1)
+        await near_service.get("other:1")
+        await near_service.get("other:1")
+        assert near_service._client.get.await_count == 2
+
+    async def test_absent_keys_are_cached(self, near_service):
+        assert await near_service.get("user:missing") is None
+        assert await near_service.get("user:missing") is None
+        assert near_service._client.get.await_count == 1
+
+    async def test_local_writes_invalidate(self, near_service):
+        await near_service.set("user:1", 1)
+        await near_service.get("user:1")
+        await near_service.set("user:1", 2)
+        assert await near_service.get("user:1") == 2
+
+        await near_service.delete("user:1")
+        assert await near_service.get("user:1") is None
+
+        await near_service.set_many({"user:1": 3, "user:2": 4})
+        assert await near_service.get_many(["user:1", "user:2"]) == {"user:1": 3, "user:2": 4}
+        async with near_service.pipeline() as pipe:
+            pipe.set("user:2", 5)
+        assert await near_service.get_many(["user:1", "user:2"]) == {"user:1": 3, "user:2": 5}
+
+    async def test_get_many_mixes_local_and_remote(self, near_service):
+        await near_service.set_many({"user:1": 1, "user:2": 2})
+        await near_service.get("user:1")
+        near_service._client.mget = _counting(near_service._client.mget)
+
+        assert await near_service.get_many(["user:1", "user:2", "user:3"]) == {"user:1": 1, "user:2": 2}
+        near_service._client.mget.assert_awaited_once_with(["user:2", "user:3"])
+
+    async def test_service_without_tracking_falls_back_to_redis(self, cache):
+        from src.services.near_cache import NearCache
+
+        near = NearCache(cache.redis_url, ["user:"])
+        near._track = AsyncMock(side_effect=ConnectionError("tracking unsupported"))
+        cache.near_cache = near
+        near.start()
+        await _wait_until(lambda: near._track.await_count > 0)
+
+        assert not near.active
+        await cache.set("user:1", 1)
+        assert await cache.get("user:1") == 1
+        assert len(near) == 0
+        assert cache.health()["near_cache"]["active"] is False
+
+
+class _FakePubSub:
+    """Pub/sub stand-in fed invalidation messages through a queue."""
+
+    def __init__(self):
+        import asyncio
+
+        self.messages = asyncio.Queue()
+        self.channels = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+        self.messages.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def get_message(self, timeout=None):
+        import asyncio
+
+        # asyncio.timeout rather than wait_for, which on 3.11 can swallow the
+        # cancellation from NearCache.stop() and leave the test hanging
+        try:
+            async with asyncio.timeout(timeout):
+                return await self.messages.get()
+        except TimeoutError:
+            return None
+
+    async def ping(self):
+        pass
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestNearCacheTracking:
+    """Tests for establishing tracking and applying invalidation messages."""
+
+    @pytest.fixture
+    def redis_fakes(self):
+        """Patch the near-cache's connections: a listener with a pubsub, and a tracker."""
+        fakes = {"pubsub": _FakePubSub(), "listener_id": 7}
+
+        def from_url(url, client_name=None, single_connection_client=False):
+            client = MagicMock()
+            client.aclose = AsyncMock()
+            if client_name is not None:
+                fakes["name"] = client_name
+                fakes["listener"] = client
+                client.pubsub.return_value = fakes["pubsub"]
+            else:
+                fakes["tracker"] = client
+                client.client_list = AsyncMock(side_effect=lambda: [{"id": "3", "name": ""}] + (
+                    [{"id": str(fakes["listener_id"]), "name": fakes["name"]}]
+                    if fakes["listener_id"] is not None else []))
+                client.execute_command = AsyncMock(return_value=b"OK")
+                client.ping = AsyncMock(return_value=True)
+            return client
+
+        with patch("src.services.near_cache.redis.from_url", side_effect=from_url):
+            yield fakes
+
+    def _near(self):
+        from src.services.near_cache import NearCache
+
+        return NearCache("redis://localhost:6379", ["user:", "llm:"], ping_interval=0.05)
+
+    async def test_tracking_redirects_to_listener(self, redis_fakes):
+        from src.services.near_cache import INVALIDATE_CHANNEL
+
+        near = self._near()
+        near.start()
+        try:
+            await _wait_until(lambda: near.active)
+            assert redis_fakes["pubsub"].channels == [INVALIDATE_CHANNEL]
+            redis_fakes["tracker"].execute_command.assert_awaited_once_with(
+                "CLIENT", "TRACKING", "ON", "REDIRECT", "7", "BCAST", "PREFIX", "user:", "PREFIX", "llm:")
+        finally:
+            await near.stop()
+
+    async def test_invalidation_messages_drop_keys_and_flush_clears(self, redis_fakes):
+        near = self._near()
+        near.start()
+        try:
+            await _wait_until(lambda: near.active)
+            for key in ("user:1", "user:2", "llm:1"):
+                near.put(key, b"v", near.sequence)
+
+            messages = redis_fakes["pubsub"].messages
+            messages.put_nowait({"type": "message", "channel": b"__redis__:invalidate", "data": [b"user:1"]})
+            await _wait_until(lambda: len(near) == 2)
+            assert near.get("user:1") == (False, None)
+            assert near.get("user:2") == (True, b"v")
+
+            # FLUSHDB/FLUSHALL arrive with no key list
+            messages.put_nowait({"type": "message", "channel": b"__redis__:invalidate", "data": None})
+            await _wait_until(lambda: len(near) == 0)
+            assert near.active
+        finally:
+            await near.stop()
+
+    async def test_idle_connections_are_pinged(self, redis_fakes):
+        near = self._near()
+        near.start()
+        try:
+            await _wait_until(lambda: near.active)
+            await _wait_until(lambda: redis_fakes["tracker"].ping.await_count >= 2)
+            assert near.active
+        finally:
+            await near.stop()
+
+    async def test_lost_tracker_connection_clears_and_tears_down(self, redis_fakes):
+        from redis.exceptions import ConnectionError
+
+        near = self._near()
+        near.start()
+        try:
+            await _wait_until(lambda: near.active)
+            near.put("user:1", b"v", near.sequence)
+            redis_fakes["tracker"].ping.side_effect = ConnectionError("connection reset")
+
+            await _wait_until(lambda: not near.active)
+            assert len(near) == 0
+            near.put("user:1", b"v", near.sequence)
+            assert len(near) == 0
+            await _wait_until(lambda: redis_fakes["pubsub"].closed)
+            redis_fakes["tracker"].aclose.assert_awaited()
+            redis_fakes["listener"].aclose.assert_awaited()
+        finally:
+            await near.stop()
+
+    async def test_unlisted_listener_fails_tracking(self, redis_fakes):
+        redis_fakes["listener_id"] = None  # CLIENT LIST does not show the listener
+        near = self._near()
+        with pytest.raises(RuntimeError):
+            await near._track()
+        assert not near.active
+        assert redis_fakes["pubsub"].closed
+        redis_fakes["tracker"].execute_command.assert_not_awaited()
+
+
+class TestInstrumentation:
+    """Tests for per-namespace cache metrics."""
+
+    def _count(self, operation, namespace, result):
+        from src.api.metrics import REDIS_OPERATIONS
+
+        return REDIS_OPERATIONS.labels(operation=operation, namespace=namespace, result=result)._value.get()
+
+    async def test_get_and_set_are_counted_per_namespace(self, cache):
+        hits = self._count("get", "user", "hit")
+        misses = self._count("get", "user", "miss")
+
+        await cache.set("user:1", {"name": "a"}, ttl=120)
+        await cache.get("user:1")
+        await cache.get("user:2")
+        await cache.get("session:1")
+
+        assert self._count("get", "user", "hit") == hits + 1
+        assert self._count("get", "user", "miss") == misses + 1
+        stats = cache.stats()
+        assert set(stats) == {"user", "session"}
+        assert stats["user"]["hit_rate"] == 0.5
+        assert stats["user"]["writes"] == 1
+        assert stats["user"]["avg_ttl_seconds"] == 120
+        assert stats["user"]["avg_write_bytes"] == stats["user"]["avg_read_bytes"] > 0
+        assert stats["session"]["hit_rate"] == 0.0
+
+    async def test_errors_are_counted(self, cache):
+        from redis.exceptions import ResponseError
+
+        cache._client.get = AsyncMock(side_effect=ResponseError("WRONGTYPE"))
+        assert await cache.get("user:1") is None
+        assert cache.stats()["user"]["errors"] == 1
+        assert cache.stats()["user"]["hit_rate"] is None
+
+    async def test_batches_split_by_namespace(self, cache):
+        await cache.set_many({"user:1": 1, "chat:1": 2}, ttl={"user:1": 60})
+        await cache.get_many(["user:1", "user:2", "chat:1"])
+        async with cache.pipeline() as pipe:
+            pipe.get("chat:1").set("chat:2", 3, ttl=30).delete("chat:3")
+
+        stats = cache.stats()
+        assert stats["user"]["hits"] == 1
+        assert stats["user"]["misses"] == 1
+        assert stats["chat"]["hits"] == 2
+        assert stats["chat"]["writes"] == 2
+        assert stats["chat"]["avg_ttl_seconds"] == round((cache.default_ttl + 30) / 2)
+        assert stats["user"]["avg_ttl_seconds"] == 60
+
+    async def test_keys_without_namespace_and_namespace_cap(self, cache):
+        cache.max_namespaces = 2
+        await cache.get("plain")
+        await cache.get("a:1")
+        await cache.get("b:1")
+        await cache.get("a:2")
+
+        assert set(cache.stats()) == {"default", "a", "other"}
+        assert cache.stats()["a"]["misses"] == 2
+
+    async def test_disabled_instrumentation_records_nothing(self, cache):
+        cache.instrument = False
+        await cache.set("user:1", 1)
+        await cache.get("user:1")
+        assert cache.stats() == {}
+
+    async def test_cache_summary_endpoint(self, cache):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from src.api.metrics import metrics_router
+
+        await cache.get("user:1")
+        app = FastAPI()
+        app.include_router(metrics_router)
+        with patch("src.services.cache_service._cache_service", cache):
+            body = TestClient(app).get("/metrics/cache").json()
+        assert body["available"] is True
+        assert body["namespaces"]["user"]["misses"] == 1
+
+        with patch("src.services.cache_service._cache_service", None):
+            assert TestClient(app).get("/metrics/cache").json()["namespaces"] == {}
+
+    async def test_llm_cache_hits_are_counted(self, cache):
+        from src.api.metrics import LLM_CACHE_HITS
+        from src.services.llm_service import LLMService, Message
+
+        llm = LLMService()
+        messages = [Message(role="user", content="hi")]
+        key = await cache.namespaced_key("llm", llm._generate_cache_key(messages, "", llm.config.model))
+        await cache.set(key, {"content": "hello", "model": llm.config.model, "usage": {}, "finish_reason": "stop"})
+        provider = llm.config.provider.value
+        before = LLM_CACHE_HITS.labels(provider=provider)._value.get()
+
+        with patch.object(llm, "_get_cache", AsyncMock(return_value=cache)):
+            response = await llm.chat(messages, temperature=0.1)
+
+        assert response.cached
+        assert LLM_CACHE_HITS.labels(provider=provider)._value.get() == before + 1
+        assert cache.stats()["llm"]["hits"] == 1
+
+
+def _counting(method):
+    """AsyncMock that records calls and awaits the real coroutine method."""
+    async def call(*args, **kwargs):
+        return await method(*args, **kwargs)
+    return AsyncMock(side_effect=call)
+
+
+async def _wait_until(predicate, timeout=3.0):
+    import asyncio
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
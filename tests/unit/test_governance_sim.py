@@ -0,0 +1,104 @@
+"""
+Unit tests for the vectorized governance engine.
+Checks parity with calculate_vote_outcome and threshold replays.
+"""
+import itertools
+
+import pytest
+
+from src.core.governance import (
+    PENTARCHY_AGENTS,
+    RiskLevel,
+    calculate_vote_outcome,
+    get_risk_level,
+)
+
+np = pytest.importorskip("numpy")
+
+# governance_sim imports numpy at module level, so it must follow the skip
+from src.core.governance_sim import (  # noqa: E402
+    RISK_LEVELS,
+    GovernancePolicy,
+    encode_risk_levels,
+    encode_votes,
+    evaluate,
+    proposals_to_arrays,
+    replay,
+    risk_levels_for_costs,
+    synthetic_history,
+)
+
+
+ALL_VOTE_COMBINATIONS = [
+    dict(zip(PENTARCHY_AGENTS, combo))
+    for combo in itertools.product(["APPROVE", "REJECT", "ABSTAIN"], repeat=len(PENTARCHY_AGENTS))
+]
+
+
+class TestEvaluateParity:
+    """The vectorized engine should match calculate_vote_outcome exactly."""
+
+    @pytest.mark.parametrize("risk", list(RiskLevel))
+    def test_all_vote_combinations(self, risk):
+        votes = encode_votes(ALL_VOTE_COMBINATIONS)
+        risks = encode_risk_levels([risk.value] * len(ALL_VOTE_COMBINATIONS))
+
+        result = evaluate(votes, risks)
+
+        expected = [calculate_vote_outcome(v, risk) for v in ALL_VOTE_COMBINATIONS]
+        assert result.outcome_names() == expected
+
+    def test_scores_and_margins(self):
+        votes = encode_votes([{"athena": "APPROVE", "aegis": "APPROVE", "hermes": "REJECT"}])
+        result = evaluate(votes, encode_risk_levels(["high"]))
+
+        assert result.scores.tolist() == [1.0]
+        assert result.thresholds.tolist() == [2.5]
+        assert result.margins.tolist() == [-1.5]
+
+    def test_unknown_agents_and_risk_levels(self):
+        """Unknown agents abstain and unknown risk levels fall back to MEDIUM."""
+        votes = encode_votes([{"zeus": "APPROVE", "athena": "APPROVE"}])
+        risks = encode_risk_levels(["unknown"])
+
+        assert votes.tolist() == [[1, 0, 0, 0, 0]]
+        assert RISK_LEVELS[risks[0]] == RiskLevel.MEDIUM
+
+    def test_risk_levels_for_costs_matches_get_risk_level(self):
+        costs = [0, 49.99, 50, 75, 99.99, 100, 999.99, 1000, 1e6]
+        codes = risk_levels_for_costs(np.array(costs))
+        assert [RISK_LEVELS[c] for c in codes] == [get_risk_level(c) for c in costs]
+
+
+class TestReplay:
+    """Tests for replaying proposals under alternative policies."""
+
+    def test_same_policy_changes_nothing(self):
+        votes, costs = synthetic_history(10_000, seed=3)
+        report = replay(votes, costs, GovernancePolicy())
+
+        assert report.total == 10_000
+        assert report.changed == 0
+        assert report.baseline == report.candidate
+
+    def test_lower_threshold_and_auto_approve_limit(self):
+        proposals = [
+            {"cost": 150.0, "votes": [
+                {"agent": "athena", "vote": "APPROVE"},
+                {"agent": "aegis", "vote": "APPROVE"},
+            ]},
+            {"cost": 60.0, "votes": {"athena": "REJECT"}},
+            {"cost": 10.0, "votes": []},
+        ]
+        votes, costs = proposals_to_arrays(proposals)
+        candidate = GovernancePolicy(auto_approve_limit=75.0)
+        candidate.thresholds[RiskLevel.HIGH] = 2.0
+
+        report = replay(votes, costs, candidate)
+
+        assert report.baseline == {"APPROVED_WITH_REVIEW": 1, "REJECTED": 1, "AUTO_APPROVED": 1}
+        assert report.transitions == {
+            ("APPROVED_WITH_REVIEW", "APPROVED"): 1,
+            ("REJECTED", "AUTO_APPROVED"): 1,
+        }
+        assert report.changed == 2
@@ -0,0 +1,169 @@
+"""
+Unit tests for the background job queue and worker pool.
+"""
+import asyncio
+
+import pytest
+
+from src.services.job_queue import (
+    InMemoryJobQueue,
+    Job,
+    JobWorkerPool,
+    RedisJobQueue,
+    instance_key_prefix,
+)
+from src.services.retry import RetryConfig
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def queue(request):
+    """Run each queue test against both backends (Redis via fakeredis + Lua)."""
+    if request.param == "memory":
+        yield InMemoryJobQueue()
+        return
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    queue = RedisJobQueue(key_prefix="test:jobs:", poll_interval=0.01)
+    queue._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    await queue.connect()
+    yield queue
+    await queue.disconnect()
+
+
+class TestJobQueue:
+    """Tests for queue semantics shared by all backends."""
+
+    async def test_round_robin_between_tenants(self, queue):
+        """A busy tenant should not starve other tenants."""
+        for i in range(3):
+            await queue.enqueue(Job(name="noop", payload={"i": i}, tenant="busy"))
+        await queue.enqueue(Job(name="noop", tenant="quiet"))
+
+        tenants = [(await queue.dequeue(timeout=0)).tenant for _ in range(4)]
+
+        assert tenants[:2] in (["busy", "quiet"], ["quiet", "busy"])
+        assert tenants.count("busy") == 3
+
+    async def test_retry_is_delayed(self, queue):
+        """Retried jobs should only reappear after their backoff delay."""
+        await queue.enqueue(Job(name="noop"))
+        job = await queue.dequeue(timeout=0)
+        job.attempts = 1
+
+        await queue.retry(job, delay=0.05)
+        assert await queue.dequeue(timeout=0) is None
+
+        again = await queue.dequeue(timeout=1.0)
+        assert again.id == job.id
+        assert again.attempts == 1
+
+    async def test_expired_lease_is_redelivered(self, queue):
+        """Jobs leased by a crashed worker should be handed out again."""
+        queue.visibility_timeout = 0.01
+        await queue.enqueue(Job(name="noop"))
+        job = await queue.dequeue(timeout=0)
+
+        await asyncio.sleep(0.02)
+        assert (await queue.dequeue(timeout=0)).id == job.id
+
+    async def test_stats_report_depth_and_age(self, queue):
+        """Stats should expose depth per state and the oldest job age."""
+        await queue.enqueue(Job(name="noop", tenant="a", enqueued_at=0))
+        await queue.enqueue(Job(name="noop", tenant="b"))
+        job = await queue.dequeue(timeout=0)
+        await queue.ack(job)
+
+        stats = await queue.stats()
+        assert stats["ready"] == 1
+        assert stats["in_flight"] == 0
+        assert sum(stats["by_tenant"].values()) == 1
+
+        job = await queue.dequeue(timeout=0)
+        await queue.dead_letter(job)
+        stats = await queue.stats()
+        assert stats["ready"] == 0
+        assert stats["dead"] == 1
+
+
+class TestJobWorkerPool:
+    """Tests for job execution, retries and dead-lettering."""
+
+    async def _drain(self, pool, condition, timeout=2.0):
+        await pool.start()
+        try:
+            deadline = asyncio.get_running_loop().time() + timeout
+            while not condition() and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+
+    async def test_job_runs_with_payload(self):
+        """Handlers should receive the job payload as keyword arguments."""
+        seen = []
+
+        async def handler(proposal_id):
+            seen.append(proposal_id)
+
+        pool = JobWorkerPool(InMemoryJobQueue(), concurrency=2)
+        pool.register("collect_votes", handler)
+        await pool.submit("collect_votes", {"proposal_id": "p-1"}, tenant="t")
+
+        await self._drain(pool, lambda: seen)
+
+        assert seen == ["p-1"]
+        assert (await pool.queue.stats())["in_flight"] == 0
+
+    async def test_failed_job_retries_then_dead_letters(self):
+        """Jobs failing past max_retries should land in the dead-letter list."""
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        pool = JobWorkerPool(
+            InMemoryJobQueue(),
+            concurrency=1,
+            retry_config=RetryConfig(max_retries=2, initial_delay=0.01, max_delay=0.01),
+        )
+        pool.register("flaky", flaky)
+        await pool.submit("flaky")
+
+        await self._drain(pool, lambda: pool.queue._dead)
+
+        assert len(calls) == 3
+        assert pool.queue._dead[0].last_error == "boom"
+
+    async def test_dead_letter_handler_receives_job(self):
+        """The registered dead-letter hook should run once retries are exhausted."""
+        dead = []
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def on_dead_letter(job):
+            dead.append(job)
+            raise RuntimeError("hook errors are logged, not raised")
+
+        pool = JobWorkerPool(InMemoryJobQueue(), concurrency=1, retry_config=RetryConfig(max_retries=0))
+        pool.register("failing", failing, on_dead_letter=on_dead_letter)
+        job = await pool.submit("failing")
+
+        await self._drain(pool, lambda: dead)
+
+        assert [j.id for j in dead] == [job.id]
+        assert dead[0].last_error == "boom"
+
+    def test_instance_key_prefix(self, monkeypatch):
+        """Each API instance should get its own Redis queue keys."""
+        monkeypatch.setenv("JOB_QUEUE_INSTANCE", "api-0")
+        assert instance_key_prefix() == "kosmos:jobs:api-0:"
+        monkeypatch.delenv("JOB_QUEUE_INSTANCE")
+        assert instance_key_prefix().startswith("kosmos:jobs:")
+
+    async def test_submit_unknown_job_raises(self):
+        """Submitting a job without a handler should fail fast."""
+        pool = JobWorkerPool(InMemoryJobQueue())
+        with pytest.raises(ValueError):
+            await pool.submit("missing")
@@ -190,3 +190,696 @@ class TestPentarchyVoting:
         }
         
         assert vote_result["outcome"] in ["APPROVED", "REJECTED", "APPROVED_WITH_REVIEW"]
+
+
+@pytest.fixture
+async def redis_buses():
+    """Factory for RedisMessageBus instances sharing one fakeredis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from src.agents.message_bus import RedisMessageBus
+
+    server = fakeredis.FakeServer()
+    buses = []
+
+    async def make(agent_id, **kwargs):
+        bus = RedisMessageBus(agent_id, **kwargs)
+        with patch("redis.asyncio.from_url", return_value=fakeredis.FakeAsyncRedis(server=server)):
+            await bus.connect()
+        buses.append(bus)
+        return bus
+
+    yield make
+    for bus in buses:
+        await bus.disconnect()
+
+
+async def _wait_for_acks(bus, stream, timeout=3.0):
+    """Wait until Redis shows nothing pending for the bus's group on a stream."""
+    import asyncio
+    deadline = asyncio.get_running_loop().time() + timeout
+    while (await bus._redis.xpending(stream, bus._consumer_group))["pending"]:
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("entries still pending")
+        await asyncio.sleep(0.01)
+
+
+async def _wait_for(predicate, timeout=3.0):
+    import asyncio
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestRedisPartitioning:
+    """Tests for subject-partitioned Redis Streams."""
+
+    def test_stream_for_message(self):
+        from src.agents.message_bus import AgentMessage, MessageType, RedisMessageBus
+
+        bus = RedisMessageBus("zeus")
+        direct = AgentMessage(type=MessageType.REQUEST, source="zeus", target="athena", subject="research.query")
+        broadcast = AgentMessage(type=MessageType.BROADCAST, source="zeus", subject="system.shutdown")
+        event = AgentMessage(type=MessageType.EVENT, source="zeus", subject="pentarchy.vote.p1")
+
+        assert bus.stream_for(direct) == "kosmos:agents:agent:athena"
+        assert bus.stream_for(broadcast) == "kosmos:agents:broadcast"
+        assert bus.stream_for(event) == "kosmos:agents:subject:pentarchy"
+
+    async def test_agents_only_receive_their_partitions(self, redis_buses):
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        received = {"athena": [], "hermes": []}
+        zeus = await redis_buses("zeus")
+        buses = {}
+        for name, seen in received.items():
+            buses[name] = await redis_buses(name)
+            buses[name].register_handler(
+                "*", AsyncMock(side_effect=lambda m, seen=seen: seen.append(m.subject)))
+        await buses["athena"].subscribe("pentarchy.*")
+
+        await zeus.publish(AgentMessage(
+            type=MessageType.REQUEST, source="zeus", target="hermes", subject="mail.send"))
+        await zeus.publish(AgentMessage(
+            type=MessageType.EVENT, source="zeus", subject="pentarchy.vote.p1"))
+        await zeus.publish(AgentMessage(
+            type=MessageType.BROADCAST, source="zeus", subject="system.ping"))
+
+        await _wait_for(lambda: len(received["athena"]) == 2 and len(received["hermes"]) == 2)
+        assert sorted(received["athena"]) == ["pentarchy.vote.p1", "system.ping"]
+        assert sorted(received["hermes"]) == ["mail.send", "system.ping"]
+
+    async def test_direct_messages_wait_for_offline_agent(self, redis_buses):
+        """Messages sent before an agent connects should be delivered to it."""
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        zeus = await redis_buses("zeus")
+        await zeus.publish(AgentMessage(
+            type=MessageType.REQUEST, source="zeus", target="aegis", subject="audit.run"))
+
+        seen = []
+        aegis = await redis_buses("aegis")
+        aegis.register_handler("audit.*", AsyncMock(side_effect=lambda m: seen.append(m.id)))
+
+        await _wait_for(lambda: len(seen) == 1)
+
+
+class TestHandlerIndex:
+    """Tests for the subject routing index used by dispatch."""
+
+    def test_index_agrees_with_linear_matching(self):
+        import itertools
+        from src.agents.message_bus import AgentMessage, MessageHandler, MessageType, _HandlerIndex
+
+        patterns = ["*", "research.*", "research.query", "res.*", "pentarchy.vote.*", ".*", "task.run"]
+        type_sets = [None, [MessageType.REQUEST], [MessageType.EVENT, MessageType.BROADCAST]]
+        index = _HandlerIndex()
+        handlers = []
+        for pattern, types in itertools.product(patterns, type_sets):
+            handler = MessageHandler(pattern, AsyncMock(), types)
+            index.add(handler)
+            handlers.append(handler)
+
+        subjects = ["research.query", "research", "researchers.x", "pentarchy.vote.p1", "task.run", "", "other"]
+        for subject, message_type in itertools.product(subjects, MessageType):
+            message = AgentMessage(type=message_type, source="x", subject=subject)
+            expected = [h for h in handlers if h.matches(message)]
+            assert index.match(subject, message_type) == expected, (subject, message_type)
+
+    async def test_dispatch_uses_registration_order(self):
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        bus = InMemoryMessageBus("index-test")
+        calls = []
+        for name, pattern in [("all", "*"), ("exact", "task.run"), ("prefix", "task.*")]:
+            bus.register_handler(pattern, AsyncMock(side_effect=lambda m, name=name: calls.append(name)))
+
+        await bus._dispatch_message(AgentMessage(type=MessageType.EVENT, source="x", subject="task.run"))
+        assert calls == ["all", "exact", "prefix"]
+        await bus.disconnect()
+
+
+class TestConcurrentDispatch:
+    """Tests for bounded concurrent dispatch and batched acknowledgement."""
+
+    async def test_handlers_for_one_message_run_concurrently(self):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        bus = InMemoryMessageBus("dispatch-test")
+        both_started = asyncio.Event()
+        started = []
+
+        async def handler(message):
+            started.append(message.id)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1.0)
+
+        bus.register_handler("*", handler)
+        bus.register_handler("task.*", handler)
+        await bus._dispatch_message(AgentMessage(type=MessageType.EVENT, source="x", subject="task.run"))
+        assert len(started) == 2
+        await bus.disconnect()
+
+    async def test_slow_handler_does_not_block_inbox(self, redis_buses):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        release = asyncio.Event()
+        done = []
+
+        async def handler(message):
+            if message.subject == "work.slow":
+                await release.wait()
+            done.append(message.subject)
+
+        zeus = await redis_buses("zeus")
+        athena = await redis_buses("athena")
+        athena.register_handler("work.*", handler)
+
+        for subject in ("work.slow", "work.fast"):
+            await zeus.publish(AgentMessage(
+                type=MessageType.REQUEST, source="zeus", target="athena", subject=subject))
+
+        await _wait_for(lambda: done == ["work.fast"])
+        release.set()
+        await _wait_for(lambda: done == ["work.fast", "work.slow"])
+
+    async def test_in_flight_is_bounded_and_acks_are_batched(self, redis_buses):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        active = {"now": 0, "peak": 0, "done": 0}
+
+        async def handler(message):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            active["done"] += 1
+
+        zeus = await redis_buses("zeus")
+        athena = await redis_buses("athena", max_in_flight=4, ack_batch_size=10)
+        athena.register_handler("*", handler)
+        real_xack = athena._redis.xack
+        ack_calls = []
+
+        async def xack(stream, group, *ids):
+            ack_calls.append(len(ids))
+            return await real_xack(stream, group, *ids)
+
+        athena._redis.xack = xack
+
+        for i in range(40):
+            await zeus.publish(AgentMessage(
+                type=MessageType.REQUEST, source="zeus", target="athena", subject=f"job.{i}"))
+
+        await _wait_for(lambda: active["done"] == 40)
+        await _wait_for_acks(athena, athena.agent_stream("athena"))
+        assert active["peak"] <= 4
+        assert sum(ack_calls) == 40
+        assert len(ack_calls) < 40
+
+    async def test_correlated_messages_keep_order(self, redis_buses):
+        import asyncio
+        import random
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        seen = []
+
+        async def handler(message):
+            await asyncio.sleep(random.uniform(0, 0.01))
+            seen.append((message.correlation_id, message.payload["n"]))
+
+        zeus = await redis_buses("zeus")
+        athena = await redis_buses("athena", ordered_by_correlation=True)
+        athena.register_handler("*", handler)
+
+        for n in range(10):
+            for conversation in ("a", "b"):
+                await zeus.publish(AgentMessage(
+                    type=MessageType.EVENT, source="zeus", target="athena", subject="chat.turn",
+                    correlation_id=conversation, payload={"n": n}))
+
+        await _wait_for(lambda: len(seen) == 20)
+        for conversation in ("a", "b"):
+            assert [n for c, n in seen if c == conversation] == list(range(10))
+
+
+class TestBatchPublish:
+    """Tests for publish_many and publish coalescing."""
+
+    async def test_publish_many_pipelines_to_partitions(self, redis_buses):
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        seen = []
+        zeus = await redis_buses("zeus")
+        hermes = await redis_buses("hermes")
+        hermes.register_handler("*", AsyncMock(side_effect=lambda m: seen.append(m.payload["n"])))
+
+        await zeus.publish_many([
+            AgentMessage(type=MessageType.REQUEST, source="zeus", target="hermes",
+                         subject="mail.send", payload={"n": n})
+            for n in range(25)
+        ])
+
+        await _wait_for(lambda: len(seen) == 25)
+        assert await zeus._redis.xlen(zeus.agent_stream("hermes")) == 25
+
+    async def test_coalesced_publishes_share_one_batch(self, redis_buses):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        zeus = await redis_buses("zeus", coalesce_ms=5)
+        batches = []
+        real_publish_many = zeus.publish_many
+
+        async def publish_many(messages):
+            batches.append(len(messages))
+            await real_publish_many(messages)
+
+        zeus._coalescer._flush_batch = publish_many
+
+        await asyncio.gather(*(
+            zeus.publish(AgentMessage(type=MessageType.EVENT, source="zeus", subject="metrics.tick"))
+            for _ in range(20)
+        ))
+
+        assert batches == [20]
+        assert await zeus._redis.xlen(zeus.subject_stream("metrics.tick")) == 20
+
+    async def test_coalesced_publish_propagates_errors(self):
+        from src.agents.message_bus import AgentMessage, MessageType, _PublishCoalescer
+
+        coalescer = _PublishCoalescer(AsyncMock(side_effect=ConnectionError("down")), 0.001, 10)
+        with pytest.raises(ConnectionError):
+            await coalescer.submit(AgentMessage(type=MessageType.EVENT, source="x", subject="y"))
+
+    async def test_cancelled_flusher_does_not_strand_batch(self):
+        """Cancelling the publisher that fills the batch must not hang the others."""
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessageType, _PublishCoalescer
+
+        sent = []
+
+        async def slow_flush(messages):
+            await asyncio.sleep(0.05)
+            sent.extend(messages)
+
+        coalescer = _PublishCoalescer(slow_flush, 10.0, 2)
+        first = asyncio.create_task(
+            coalescer.submit(AgentMessage(type=MessageType.EVENT, source="x", subject="a")))
+        await asyncio.sleep(0)
+        flusher = asyncio.create_task(
+            coalescer.submit(AgentMessage(type=MessageType.EVENT, source="x", subject="b")))
+        await asyncio.sleep(0.01)
+        flusher.cancel()
+
+        await asyncio.wait_for(first, timeout=1)
+        assert [m.subject for m in sent] == ["a", "b"]
+        with pytest.raises(asyncio.CancelledError):
+            await flusher
+
+
+class TestRequestReply:
+    """Tests for bus.request() request/response calls."""
+
+    @staticmethod
+    def _echo_handler(source):
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        async def handler(message):
+            return AgentMessage(
+                type=MessageType.RESPONSE, source=source, subject=message.subject,
+                payload={"echo": message.payload["n"]})
+        return handler
+
+    async def test_in_memory_request(self):
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        zeus, athena = InMemoryMessageBus("rpc-zeus"), InMemoryMessageBus("rpc-athena")
+        athena.register_handler("research.*", self._echo_handler("rpc-athena"))
+        try:
+            reply = await zeus.request(AgentMessage(
+                type=MessageType.REQUEST, source="rpc-zeus", target="rpc-athena",
+                subject="research.query", payload={"n": 7}), timeout=1.0)
+            assert reply.payload == {"echo": 7}
+            assert not zeus._reply_futures
+        finally:
+            await zeus.disconnect()
+            await athena.disconnect()
+
+    async def test_redis_reply_reaches_requesting_replica(self, redis_buses):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        replicas = [await redis_buses("zeus"), await redis_buses("zeus")]
+        athena = await redis_buses("athena")
+        athena.register_handler("research.*", self._echo_handler("athena"))
+
+        replies = await asyncio.gather(*(
+            bus.request(AgentMessage(
+                type=MessageType.REQUEST, source="zeus", target="athena",
+                subject="research.query", payload={"n": n}), timeout=3.0)
+            for n, bus in enumerate(replicas * 3)
+        ))
+        assert [r.payload["echo"] for r in replies] == list(range(6))
+
+    async def test_request_timeout_and_validation(self):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        zeus = InMemoryMessageBus("rpc-lonely")
+        try:
+            with pytest.raises(ValueError):
+                await zeus.request(AgentMessage(type=MessageType.REQUEST, source="rpc-lonely", subject="x"))
+            with pytest.raises(asyncio.TimeoutError):
+                await zeus.request(AgentMessage(
+                    type=MessageType.REQUEST, source="rpc-lonely", target="nobody", subject="x"),
+                    timeout=0.05)
+            assert not zeus._reply_futures
+        finally:
+            await zeus.disconnect()
+
+
+class TestInMemoryBus:
+    """Tests for the queue-based in-process bus."""
+
+    async def test_publish_does_not_wait_for_handlers(self):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        zeus, athena = InMemoryMessageBus("mem-zeus"), InMemoryMessageBus("mem-athena")
+        release = asyncio.Event()
+        done = []
+
+        async def slow(message):
+            await release.wait()
+            done.append(message.id)
+
+        athena.register_handler("*", slow)
+        try:
+            message = AgentMessage(type=MessageType.EVENT, source="mem-zeus", subject="task.run")
+            await asyncio.wait_for(zeus.publish(message), timeout=0.5)
+            assert done == []
+            release.set()
+            await _wait_for(lambda: done == [message.id])
+        finally:
+            await zeus.disconnect()
+            await athena.disconnect()
+
+    async def test_full_inbox_applies_backpressure(self):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        zeus = InMemoryMessageBus("mem-producer")
+        athena = InMemoryMessageBus("mem-consumer", inbox_size=2, max_in_flight=1)
+        release = asyncio.Event()
+
+        async def blocked(message):
+            await release.wait()
+
+        athena.register_handler("*", blocked)
+        try:
+            messages = [
+                AgentMessage(type=MessageType.EVENT, source="mem-producer", subject=f"task.{i}")
+                for i in range(5)
+            ]
+            publishing = asyncio.create_task(zeus.publish_many(messages))
+            await asyncio.sleep(0.05)
+            # One message is being handled, two fill the inbox, the publisher waits
+            assert not publishing.done()
+            assert athena.backlog == 2
+
+            release.set()
+            await asyncio.wait_for(publishing, timeout=1.0)
+        finally:
+            await zeus.disconnect()
+            await athena.disconnect()
+
+    async def test_inbox_dispatches_by_priority(self):
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessagePriority, MessageType
+
+        zeus = InMemoryMessageBus("mem-prio-zeus")
+        athena = InMemoryMessageBus("mem-prio-athena", max_in_flight=1)
+        seen = []
+        athena.register_handler("*", AsyncMock(side_effect=lambda m: seen.append(m.subject)))
+        try:
+            # Queue everything before the consumer gets a chance to run
+            for subject, priority in [("low", MessagePriority.LOW), ("normal", MessagePriority.NORMAL),
+                                      ("critical", MessagePriority.CRITICAL), ("normal2", MessagePriority.NORMAL)]:
+                await athena._inbox.put((-priority, next(athena._sequence), AgentMessage(
+                    type=MessageType.EVENT, source="mem-prio-zeus", subject=subject, priority=priority)))
+            await athena.connect()
+            await _wait_for(lambda: len(seen) == 4)
+            assert seen == ["critical", "normal", "normal2", "low"]
+        finally:
+            await zeus.disconnect()
+            await athena.disconnect()
+
+    async def test_retention_is_capped(self):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        zeus = InMemoryMessageBus("mem-retention")
+        try:
+            InMemoryMessageBus.configure_retention(max_messages=3)
+            for i in range(5):
+                await zeus.publish(AgentMessage(type=MessageType.EVENT, source="mem-retention", subject=f"t.{i}"))
+            assert [m.subject for m in InMemoryMessageBus.recent_messages()] == ["t.2", "t.3", "t.4"]
+
+            InMemoryMessageBus.configure_retention(max_age_seconds=0.01)
+            await asyncio.sleep(0.02)
+            assert InMemoryMessageBus.recent_messages() == []
+
+            InMemoryMessageBus.configure_retention()
+            await zeus.publish(AgentMessage(type=MessageType.EVENT, source="mem-retention", subject="t.5"))
+            assert InMemoryMessageBus.recent_messages() == []
+        finally:
+            InMemoryMessageBus.configure_retention()
+            await zeus.disconnect()
+
+    async def test_disconnect_drains_inbox(self):
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+
+        zeus, athena = InMemoryMessageBus("mem-drain-zeus"), InMemoryMessageBus("mem-drain-athena")
+        seen = []
+        athena.register_handler("*", AsyncMock(side_effect=lambda m: seen.append(m.id)))
+        await zeus.publish_many([
+            AgentMessage(type=MessageType.EVENT, source="mem-drain-zeus", subject="task.run")
+            for _ in range(50)
+        ])
+        await athena.disconnect()
+        await zeus.disconnect()
+        assert len(seen) == 50
+
+
+class TestNATSPullConsumer:
+    """Tests for the NATS pull consumer, using a fake subscription."""
+
+    def test_subject_filters_are_consolidated(self):
+        from src.agents.message_bus import consolidate_subject_filters, nats_subject_filter
+
+        assert nats_subject_filter("*") == ">"
+        assert nats_subject_filter("pentarchy.*") == "pentarchy.>"
+        assert nats_subject_filter("task.run") == "task.run"
+        assert consolidate_subject_filters(
+            ["k.pentarchy.>", "k.pentarchy.vote.>", "k.pentarchy.tally", "k.task.run", "k.task.run"]
+        ) == ["k.pentarchy.>", "k.task.run"]
+        assert consolidate_subject_filters(["k.a", ">", "k.b.>"]) == [">"]
+
+    def _msg(self, message, target="*"):
+        msg = MagicMock()
+        msg.data = message.to_json().encode()
+        msg.headers = {"target": target, "priority": str(message.priority.value)}
+        msg.ack = AsyncMock()
+        return msg
+
+    async def test_fetched_batches_dispatch_by_priority_and_ack_together(self):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessagePriority, MessageType, NATSMessageBus
+
+        bus = NATSMessageBus("athena", max_in_flight=1, ack_batch_size=100, ack_interval=3600)
+        seen = []
+        bus.register_handler("*", AsyncMock(side_effect=lambda m: seen.append(m.subject)))
+
+        batch = [
+            self._msg(AgentMessage(type=MessageType.EVENT, source="zeus", subject="normal")),
+            self._msg(AgentMessage(type=MessageType.EVENT, source="zeus", subject="other"), target="hermes"),
+            self._msg(AgentMessage(type=MessageType.EVENT, source="zeus", subject="critical",
+                                   priority=MessagePriority.CRITICAL)),
+        ]
+        fetched = asyncio.Event()
+
+        async def fetch(count, timeout):
+            if not fetched.is_set():
+                fetched.set()
+                return list(batch)
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError
+
+        bus._pull_sub = MagicMock(fetch=fetch)
+        bus._running = True
+        bus._fetch_task = asyncio.create_task(bus._fetch_messages())
+        try:
+            await _wait_for(lambda: len(bus._pending_acks) == 3)
+            assert seen == ["critical", "normal"]
+            assert not any(msg.ack.called for msg in batch)
+        finally:
+            await bus.disconnect()
+        assert all(msg.ack.await_count == 1 for msg in batch)
+
+    async def test_failed_messages_are_not_acked(self):
+        from src.agents.message_bus import NATSMessageBus
+
+        bus = NATSMessageBus("athena")
+        msg = MagicMock(data=b"not json", headers=None, ack=AsyncMock())
+        await bus._slots.acquire()
+        await bus._process_msg(msg)
+        await bus._flush_acks()
+        msg.ack.assert_not_called()
+
+
+class TestPendingSweeper:
+    """Tests for reclaiming and dead-lettering stuck stream entries."""
+
+    async def _strand_entry(self, redis, fields, deliveries=1):
+        """Deliver an entry to a consumer that never acknowledges it."""
+        stream, group = "kosmos:agents:agent:athena", "agent:athena"
+        await redis.xgroup_create(stream, group, id="0", mkstream=True)
+        await redis.xadd(stream, fields)
+        await redis.xreadgroup(group, "athena:crashed", {stream: ">"})
+        for _ in range(deliveries - 1):
+            await redis.xclaim(stream, group, "athena:crashed", 0, [
+                e["message_id"] for e in await redis.xpending_range(stream, group, "-", "+", 10)])
+        return stream, group
+
+    async def test_idle_entries_are_reclaimed(self, redis_buses):
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        zeus = await redis_buses("zeus")
+        message = AgentMessage(type=MessageType.REQUEST, source="zeus", target="athena", subject="task.run")
+        stream, group = await self._strand_entry(zeus._redis, zeus._entry_fields(message))
+
+        seen = []
+        athena = await redis_buses("athena", claim_idle_ms=0, sweep_interval=3600)
+        athena.register_handler("*", AsyncMock(side_effect=lambda m: seen.append(m.id)))
+
+        totals = await athena.sweep_pending()
+
+        assert totals == {"reclaimed": 1, "dead_lettered": 0}
+        await _wait_for(lambda: seen == [message.id])
+        await _wait_for_acks(athena, stream)
+
+    async def test_entries_still_being_handled_are_not_reclaimed(self, redis_buses):
+        import asyncio
+        from src.agents.message_bus import AgentMessage, MessageType
+
+        zeus = await redis_buses("zeus")
+        athena = await redis_buses("athena", claim_idle_ms=0, max_deliveries=1, sweep_interval=3600)
+        started, release = asyncio.Event(), asyncio.Event()
+        calls = []
+
+        async def slow(message):
+            calls.append(message.id)
+            started.set()
+            await release.wait()
+
+        athena.register_handler("*", slow)
+        await zeus.publish(AgentMessage(
+            type=MessageType.REQUEST, source="zeus", target="athena", subject="task.run"))
+        await started.wait()
+        stream = athena.agent_stream("athena")
+
+        # The handler has outrun claim_idle_ms, and max_deliveries is already reached
+        for _ in range(2):
+            assert await athena.sweep_pending() == {"reclaimed": 0, "dead_lettered": 0}
+        release.set()
+        await _wait_for_acks(athena, stream)
+
+        assert len(calls) == 1
+        assert await zeus._redis.xlen(athena.dead_letter_stream) == 0
+        await _wait_for(lambda: not athena._active_entries)
+
+    async def test_poison_entries_are_dead_lettered(self, redis_buses):
+        from src.api.metrics import MESSAGE_BUS_PENDING
+
+        zeus = await redis_buses("zeus")
+        stream, group = await self._strand_entry(zeus._redis, {"message": "not json"}, deliveries=3)
+
+        athena = await redis_buses("athena", claim_idle_ms=0, max_deliveries=3, sweep_interval=3600)
+        totals = await athena.sweep_pending()
+
+        assert totals["dead_lettered"] == 1
+        dead = await zeus._redis.xrange(athena.dead_letter_stream)
+        assert dead[0][1][b"message"] == b"not json"
+        assert dead[0][1][b"dead_letter_stream"] == stream.encode()
+        assert (await zeus._redis.xpending(stream, group))["pending"] == 0
+        assert MESSAGE_BUS_PENDING.labels(stream=stream, group=group)._value.get() == 0
+
+
+class TestPriorityLanes:
+    """Tests for priority lanes and TTL-based message expiry."""
+
+    def test_priority_lane(self):
+        from src.agents.message_bus import MessagePriority, priority_lane
+
+        assert priority_lane(MessagePriority.CRITICAL) == "critical"
+        assert priority_lane(MessagePriority.HIGH) == "high"
+        assert priority_lane(MessagePriority.NORMAL) == "normal"
+        assert priority_lane(MessagePriority.LOW) == "low"
+
+    def test_weighted_lanes_do_not_starve_low(self):
+        from src.agents.message_bus import DEFAULT_LANE_WEIGHTS, _WeightedLanes
+
+        schedule = _WeightedLanes(DEFAULT_LANE_WEIGHTS)
+        first = [schedule.order()[0] for _ in range(70)]
+
+        assert first.count("high") == 40
+        assert first.count("normal") == 20
+        assert first.count("low") == 10
+        assert "low" in first[:7]
+
+    async def test_critical_lane_overtakes_normal_backlog(self, redis_buses):
+        from src.agents.message_bus import AgentMessage, MessagePriority, MessageType
+
+        zeus = await redis_buses("zeus")
+        await zeus.publish_many([
+            AgentMessage(type=MessageType.REQUEST, source="zeus", target="aegis", subject=f"task.{i}")
+            for i in range(20)
+        ])
+        await zeus.publish(AgentMessage(
+            type=MessageType.REQUEST, source="zeus", target="aegis", subject="alert.breach",
+            priority=MessagePriority.CRITICAL))
+
+        seen = []
+        aegis = await redis_buses("aegis", max_in_flight=1, min_read_batch=1, max_read_batch=1)
+        aegis.register_handler("*", AsyncMock(side_effect=lambda m: seen.append(m.subject)))
+
+        await _wait_for(lambda: len(seen) == 21)
+        assert seen[0] == "alert.breach"
+
+    async def test_expired_messages_are_dropped(self):
+        from datetime import datetime, timedelta
+        from src.agents.message_bus import AgentMessage, InMemoryMessageBus, MessageType
+        from src.api.metrics import MESSAGE_BUS_EXPIRED
+
+        bus = InMemoryMessageBus("ttl-test")
+        handler = AsyncMock(return_value=None)
+        bus.register_handler("*", handler)
+        before = MESSAGE_BUS_EXPIRED.labels(lane="normal")._value.get()
+
+        stale = AgentMessage(
+            type=MessageType.EVENT, source="x", subject="task.run", ttl_seconds=5,
+            timestamp=datetime.utcnow() - timedelta(seconds=10))
+        await bus._dispatch_message(stale)
+        handler.assert_not_called()
+        assert MESSAGE_BUS_EXPIRED.labels(lane="normal")._value.get() == before + 1
+
+        await bus._dispatch_message(AgentMessage(
+            type=MessageType.EVENT, source="x", subject="task.run", ttl_seconds=0,
+            timestamp=datetime.utcnow() - timedelta(days=1)))
+        handler.assert_called_once()
+        await bus.disconnect()
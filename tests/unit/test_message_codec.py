@@ -0,0 +1,116 @@
+"""
+Unit tests for the compact AgentMessage wire format.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.agents.message_bus import AgentMessage, MessagePriority, MessageType
+from src.agents.message_codec import (
+    CODEC_VERSION,
+    decode_message,
+    encode_message,
+    is_compact,
+    peek_header,
+)
+
+
+def _message(**overrides):
+    fields = dict(
+        type=MessageType.REQUEST, source="zeus", target="athena", subject="research.query",
+        payload={"query": "état", "filters": [1, 2.5, None, {"nested": True}]},
+        priority=MessagePriority.HIGH, correlation_id="conv-1", ttl_seconds=30,
+    )
+    fields.update(overrides)
+    return AgentMessage(**fields)
+
+
+class TestCompactCodec:
+    """Tests for encoding, decoding and header peeking."""
+
+    def test_round_trip(self):
+        message = _message(reply_to="kosmos:agents:reply:zeus:1")
+        data = encode_message(message)
+
+        assert data[0] == CODEC_VERSION
+        assert is_compact(data)
+        assert decode_message(data).model_dump() == message.model_dump()
+        assert len(data) < len(message.to_json())
+
+    def test_optional_fields_and_aware_timestamps(self):
+        stamp = datetime(2025, 6, 1, 12, 0, 0, 123456, tzinfo=timezone(timedelta(hours=2)))
+        message = _message(target=None, correlation_id=None, type=MessageType.BROADCAST, timestamp=stamp)
+
+        decoded = decode_message(encode_message(message))
+
+        assert decoded.target is None and decoded.correlation_id is None
+        assert decoded.timestamp == datetime(2025, 6, 1, 10, 0, 0, 123456)
+
+    def test_peek_header_reads_routing_fields(self):
+        message = _message()
+        header = peek_header(encode_message(message))
+
+        assert (header.type, header.subject, header.target, header.priority) == (
+            MessageType.REQUEST, "research.query", "athena", MessagePriority.HIGH)
+        assert header.id == message.id
+
+    def test_json_messages_still_decode(self):
+        message = _message()
+        assert not is_compact(message.to_json().encode())
+        assert decode_message(message.to_json()) == message
+        assert decode_message(message.to_json().encode()) == message
+
+    def test_unknown_version_is_rejected(self):
+        data = bytearray(encode_message(_message()))
+        data[0] = 99
+        with pytest.raises(ValueError):
+            decode_message(bytes(data))
+
+
+class TestCompactCodecOnRedis:
+    """Mixed-codec agents should interoperate on the Redis bus."""
+
+    async def test_json_and_compact_publishers_reach_one_consumer(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        import asyncio
+        from src.agents.message_bus import RedisMessageBus
+
+        server = fakeredis.FakeServer()
+        buses = [
+            RedisMessageBus("athena"),
+            RedisMessageBus("zeus-new", codec="compact"),
+            RedisMessageBus("zeus-old"),
+        ]
+        for bus in buses:
+            with patch("redis.asyncio.from_url", return_value=fakeredis.FakeAsyncRedis(server=server)):
+                await bus.connect()
+        athena, compact, legacy = buses
+        seen = []
+        athena.register_handler("research.*", AsyncMock(side_effect=lambda m: seen.append(m.source)))
+        try:
+            for publisher in (compact, legacy):
+                await publisher.publish(_message(source=publisher.agent_id))
+            # No handler matches this one; it is acked from the header alone
+            await compact.publish(_message(source="zeus-new", subject="billing.charge"))
+
+            for _ in range(300):
+                if len(seen) == 2 and athena._pending_ack_count == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert sorted(seen) == ["zeus-new", "zeus-old"]
+            # HIGH priority messages land in the stream's high lane
+            stream = athena.lane_stream(athena.agent_stream("athena"), "high")
+            entry = (await athena._redis.xrange(stream, count=1))[0][1]
+            assert list(entry) == [b"message"]
+            pending = await athena._redis.xpending(stream, athena._consumer_group)
+            assert pending["pending"] == 0
+        finally:
+            for bus in buses:
+                await bus.disconnect()
+
+    def test_unknown_codec_is_rejected(self):
+        from src.agents.message_bus import RedisMessageBus
+
+        with pytest.raises(ValueError):
+            RedisMessageBus("zeus", codec="xml")